@@ -2,6 +2,7 @@
 
 # import standard modules
 from contextlib import asynccontextmanager
+import time
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, RedirectResponse, JSONResponse, Response
@@ -23,9 +24,26 @@ from backend.routes.backup import router as backup_router
 from backend.routes.logs import router as logs_router
 from backend.routes.settings import router as settings_router
 from backend.routes.localization import router as localization_router
+from backend.routes.regeneration import router as regeneration_router
+from backend.routes.apply import router as apply_router
+from backend.routes.changes import router as changes_router
+from backend.routes.queries import router as queries_router
+from backend.routes.search import router as search_router
+
+# Import Background Workers
+from backend.regeneration import start_worker, stop_worker
+from backend.db.db import close_db, start_online_migrations
+from backend.db.aio import start_writer, stop_writer
+from backend.db.changes import start_compaction, stop_compaction
+from backend.db.maintenance import start_maintenance, stop_maintenance
+from backend.passwords import shutdown_pool
+from backend.server import is_primary_worker, on_promotion
+from backend.db.settings import get_config, refresh_config, refresh_config_async
+from backend.db.snapshot import get_snapshot
+from backend.settings.localization import load_language
 
 # Import Security
-from backend.security import is_logged_in, apply_session
+from backend.security import get_session, renew_session
 
 # Import Settings
 from backend.settings.settings import settings
@@ -98,6 +116,15 @@ STATIC_PREFIXES = (
 
 STATIC_SUFFIXES = (".js", ".css", ".png", ".jpg", ".jpeg", ".ico", ".svg", ".map")
 
+# ------------------------------------------------------------------------------
+# Config middleware: pick up config changes committed by other workers
+# ------------------------------------------------------------------------------
+async def config_middleware(request: Request, call_next):
+    path = request.url.path
+    if not (path.startswith(STATIC_PREFIXES) or path.endswith(STATIC_SUFFIXES)):
+        await refresh_config_async()
+    return await call_next(request)
+
 # ------------------------------------------------------------------------------
 # Session / Auth middleware
 # ------------------------------------------------------------------------------
@@ -117,15 +144,12 @@ async def session_middleware(request: Request, call_next):
     if path.startswith(STATIC_PREFIXES) or path.endswith(STATIC_SUFFIXES):
         return await call_next(request)
 
-    # 4) Read session token from cookie (adjust name if different)
-    token = request.cookies.get("session")
+    # 4) Verify the session cookie once (request.state.session / .user for the handlers)
+    session = await get_session(request)
 
-    # 5) Check authentication (your function should validate the cookie/session)
-    authenticated = is_logged_in(request)
-
-    # 6) Protect JSON APIs
+    # 5) Protect JSON APIs
     if path.startswith("/api"):
-        if not authenticated:
+        if session is None:
             logger.warning("API access denied - not logged in: %s %s", method, path)
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -140,28 +164,25 @@ async def session_middleware(request: Request, call_next):
                 },
             )
 
-        # Optionally attach user info to request.state for downstream handlers
-        # request.state.user = <current_user>
-
         # Call the downstream route/handler
         response = await call_next(request)
 
-        # Apply sliding expiration only on successful responses (2xx) and if a token exists
-        if token and 200 <= response.status_code < 300:
-            apply_session(response, username=None, token=token)
+        # Sliding expiration on successful responses (2xx), once the session nears its end
+        if 200 <= response.status_code < 300:
+            await renew_session(response, session)
         return response
 
-    # 7) Protect HTML pages (non-API): redirect unauthenticated users to login
-    if not authenticated:
+    # 6) Protect HTML pages (non-API): redirect unauthenticated users to login
+    if session is None:
         # 303 See Other avoids reusing POST/other methods
         return RedirectResponse("/login", status_code=status.HTTP_303_SEE_OTHER)
 
-    # 8) Authenticated HTML request ? proceed
+    # 7) Authenticated HTML request ? proceed
     response = await call_next(request)
 
-    # 9) Apply sliding expiration only on successful responses (2xx)
-    if token and 200 <= response.status_code < 300:
-        apply_session(response, username=None, token=token)
+    # 8) Sliding expiration on successful responses (2xx), once the session nears its end
+    if 200 <= response.status_code < 300:
+        await renew_session(response, session)
 
     return response
 
@@ -204,6 +225,52 @@ def services_js(request: Request):
 def favicon_icon(request: Request):
     return FileResponse(settings.FRONTEND_PATH / "favicon.ico")
 
+# ------------------------------------------------------------------------------
+# Warm-up: fill the caches before the first request
+# ------------------------------------------------------------------------------
+def warm_up():
+    start_ns = time.monotonic_ns()
+    try:
+        refresh_config()
+        get_snapshot()
+        load_language(get_config("LANGUAGE"))
+    except Exception as err:
+        # A cold cache only slows the first requests down
+        logger.warning("Warm-up failed: %s", str(err).strip())
+        return
+    logger.info("Caches warmed up in %.1f ms", (time.monotonic_ns() - start_ns) / 1_000_000)
+
+# ------------------------------------------------------------------------------
+# Database jobs: one process is enough (and avoids N writers competing)
+# ------------------------------------------------------------------------------
+def start_db_jobs():
+    start_online_migrations()
+    start_compaction()
+    start_maintenance()
+
+# ------------------------------------------------------------------------------
+# Lifespan: start/stop background workers
+# ------------------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_writer()
+    start_worker()
+    if is_primary_worker():
+        start_db_jobs()
+    else:
+        on_promotion(start_db_jobs)
+    # The server accepts connections once the lifespan started
+    warm_up()
+    try:
+        yield
+    finally:
+        await stop_writer()
+        stop_worker()
+        stop_compaction()
+        stop_maintenance()
+        shutdown_pool()
+        close_db()
+
 # ------------------------------------------------------------------------------
 # Creates and configures the FastAPI app
 # ------------------------------------------------------------------------------
@@ -213,6 +280,7 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
+        lifespan=lifespan,
     )
 
     # Routers
@@ -229,6 +297,11 @@ def create_app() -> FastAPI:
     app.include_router(logs_router)
     app.include_router(settings_router)
     app.include_router(localization_router)
+    app.include_router(regeneration_router)
+    app.include_router(apply_router)
+    app.include_router(changes_router)
+    app.include_router(queries_router)
+    app.include_router(search_router)
 
     # CORS
     cors_origins = [
@@ -251,6 +324,9 @@ def create_app() -> FastAPI:
     # Session/Auth middleware (funzionale)
     app.middleware("http")(session_middleware)
 
+    # Config version check (once per request)
+    app.middleware("http")(config_middleware)
+
     # Trusted Host Middleware
     app.add_middleware(
         TrustedHostMiddleware,
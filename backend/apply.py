@@ -0,0 +1,357 @@
+# backend/apply.py
+
+# import standard modules
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import re
+import secrets
+import shutil
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Import local modules
+from backend.db.aliases import iter_aliases
+from backend.db.db import read_snapshot
+from backend.db.hosts import iter_hosts, iter_reservations
+from backend.dns import dns_outputs, dns_stage_external, dns_stage_internal
+from backend.dhcp import (
+    dhcp4_outputs,
+    dhcp4_push,
+    dhcp4_stage,
+    dhcp6_stage,
+    iter_fragment_entries,
+    kea_previous,
+    kea_sync,
+    manifest_path,
+    read_kea_state,
+    read_manifest_digests,
+    read_manifest_shards,
+)
+from backend.kea import read_reservations
+from backend.utils import StagedFile, file_sha256
+
+# Import Config
+from backend.db.settings import get_config
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Outputs handled by the pipeline
+TARGETS = ("dns", "dhcp")
+
+# Suffix of the previous generation kept next to each output
+PREVIOUS_SUFFIX = ".prev"
+
+# Record line of the generated zone fragments
+DNS_LINE_RE = re.compile(r"^\S+\s+IN\s+(A|PTR|CNAME)\s+\S+$")
+
+class ApplyValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+# ---------------------------------------------------------
+# Previous generation of an output (<file>.prev)
+# ---------------------------------------------------------
+def previous_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + PREVIOUS_SUFFIX)
+
+# ---------------------------------------------------------
+# Internal: atomically make dst a copy of src (hard link when possible)
+# ---------------------------------------------------------
+def _link_replace(src: Path, dst: Path) -> None:
+    # Already the same file (rename() between two links of a file is a no-op)
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+# ---------------------------------------------------------
+# Internal: keep the live file as previous generation
+# ---------------------------------------------------------
+def _keep_previous(path: Path) -> None:
+    prev = previous_path(path)
+    if path.exists():
+        _link_replace(path, prev)
+    else:
+        # No previous generation: a rollback removes the file
+        prev.unlink(missing_ok=True)
+
+# ---------------------------------------------------------
+# Internal: put the previous generation back in place
+# ---------------------------------------------------------
+def _restore_previous(path: Path) -> None:
+    prev = previous_path(path)
+    if prev.exists():
+        _link_replace(prev, path)
+    else:
+        path.unlink(missing_ok=True)
+
+# ---------------------------------------------------------
+# Internal: swap live file and previous generation (rollback twice = redo)
+# ---------------------------------------------------------
+def _swap_previous(path: Path) -> bool:
+    prev = previous_path(path)
+    if not prev.exists():
+        return False
+    if path.exists() and os.path.samefile(path, prev):
+        return False
+
+    keep = None
+    if path.exists():
+        keep = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+        os.link(path, keep)
+    try:
+        os.replace(prev, path)
+    except BaseException:
+        if keep is not None:
+            keep.unlink(missing_ok=True)
+        raise
+    if keep is not None:
+        os.replace(keep, prev)
+    return True
+
+# ---------------------------------------------------------
+# Internal: run a stage function, returning its result and duration
+# ---------------------------------------------------------
+def _timed(func: Callable, *args) -> Tuple[Any, float]:
+    start_ns = time.monotonic_ns()
+    result = func(*args)
+    return result, (time.monotonic_ns() - start_ns) / 1_000_000
+
+# ---------------------------------------------------------
+# Internal: check a staged file before it goes live
+# ---------------------------------------------------------
+def _validate(f: StagedFile) -> Optional[str]:
+    try:
+        # Read back entry by entry / line by line (constant memory)
+        if f.kind == "kea":
+            if sum(1 for _ in iter_fragment_entries(f.tmp)) != f.count:
+                return f"{f.path.name}: expected {f.count} reservations"
+
+        elif f.kind == "json":
+            json.loads(f.tmp.read_text(encoding="utf-8"))
+
+        elif f.kind == "dns":
+            with open(f.tmp, "r", encoding="utf-8") as text:
+                for n, line in enumerate(text, start=1):
+                    if not DNS_LINE_RE.match(line.rstrip("\n")):
+                        return f"{f.path.name}:{n}: invalid record '{line.strip()}'"
+
+    except (OSError, ValueError) as err:
+        return f"{f.path.name}: {err}"
+
+    return None
+
+# ---------------------------------------------------------
+# Internal: commit the staged files (ordered renames, all or nothing)
+# ---------------------------------------------------------
+def _commit(files: List[StagedFile]) -> None:
+
+    # Keep the live generation of every output for the rollback
+    for f in files:
+        _keep_previous(f.path)
+
+    committed: List[StagedFile] = []
+    try:
+        for f in files:
+            if f.changed:
+                f.commit()
+                committed.append(f)
+            else:
+                f.discard()
+
+    except BaseException:
+        # Put the already renamed outputs back to the previous generation
+        for f in files:
+            if f not in committed:
+                f.discard()
+        for f in reversed(committed):
+            try:
+                _restore_previous(f.path)
+            except OSError as err:
+                logger.error("Apply: unable to restore %s - %s", f.path, err)
+        raise
+
+# ---------------------------------------------------------
+# Render, validate and commit DNS and DHCP outputs from one DB snapshot
+# ---------------------------------------------------------
+def apply_outputs(targets: Iterable[str] = TARGETS) -> Dict[str, Any]:
+
+    # Initialization
+    start_ns = time.monotonic_ns()
+    targets = tuple(t for t in TARGETS if t in set(targets))
+    timings: Dict[str, float] = {}
+    render_ms: Dict[str, float] = {}
+    staged: Dict[str, Any] = {}
+
+    def staged_files() -> List[StagedFile]:
+        # Commit order: DHCP include files (shards before their manifest), then DNS
+        files: List[StagedFile] = []
+        if "dhcp6" in staged:
+            files.append(staged["dhcp6"])
+        if "dhcp4" in staged:
+            files.extend(staged["dhcp4"]["files"])
+        for name in ("dns_internal", "dns_external"):
+            files.extend(staged.get(name, []))
+        return files
+
+    try:
+        # Render every output concurrently into temp files, streaming the rows
+        # of one read transaction (consistent hosts + aliases, constant memory)
+        step_ns = time.monotonic_ns()
+        jobs = {}
+        with read_snapshot() as conn, ThreadPoolExecutor(max_workers=4, thread_name_prefix="apply") as pool:
+            if "dns" in targets:
+                jobs["dns_internal"] = pool.submit(_timed, dns_stage_internal, iter_hosts(conn), iter_aliases(conn))
+                jobs["dns_external"] = pool.submit(_timed, dns_stage_external, iter_hosts(conn), iter_aliases(conn))
+            if "dhcp" in targets:
+                jobs["dhcp4"] = pool.submit(_timed, dhcp4_stage, iter_reservations("ipv4", conn))
+                jobs["dhcp6"] = pool.submit(_timed, dhcp6_stage, iter_reservations("ipv6", conn))
+
+            errors = []
+            for name, job in jobs.items():
+                try:
+                    staged[name], render_ms[name] = job.result()
+                except Exception as err:
+                    errors.append(err)
+        if errors:
+            raise errors[0]
+        timings["render_ms"] = (time.monotonic_ns() - step_ns) / 1_000_000
+
+        files = staged_files()
+
+        # Outputs not tracked by a manifest: compare with the live file
+        for f in files:
+            if f.changed is None:
+                f.changed = file_sha256(f.path) != f.sha256
+
+        # Validate the files about to change
+        step_ns = time.monotonic_ns()
+        problems = [p for p in (_validate(f) for f in files if f.changed) if p]
+        if problems:
+            raise ApplyValidationError(problems)
+        timings["validate_ms"] = (time.monotonic_ns() - step_ns) / 1_000_000
+
+        # Commit (nothing is touched when no output changed)
+        step_ns = time.monotonic_ns()
+        changed = [f for f in files if f.changed]
+        if changed:
+            _commit(files)
+        else:
+            for f in files:
+                f.discard()
+        timings["commit_ms"] = (time.monotonic_ns() - step_ns) / 1_000_000
+
+    except BaseException:
+        for f in staged_files():
+            f.discard()
+        raise
+
+    # Live update of the DHCPv4 shards (the committed files stay the durable copy)
+    step_ns = time.monotonic_ns()
+    result: Dict[str, Any] = {"status": "success", "targets": list(targets)}
+    if "dns" in targets:
+        hosts_file, _, aliases_file = staged["dns_internal"]
+        result["dns"] = {"hosts": hosts_file.count, "aliases": aliases_file.count}
+    if "dhcp" in targets:
+        dhcp4 = dhcp4_push(staged["dhcp4"])
+        result["dhcp"] = {
+            "reservations_v4": dhcp4["count"],
+            "reservations_v6": staged["dhcp6"].count,
+            "shards_v4": dhcp4["shards"],
+            "removed_v4": dhcp4["removed"],
+        }
+    timings["push_ms"] = (time.monotonic_ns() - step_ns) / 1_000_000
+
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+    result.update({
+        "files": [
+            {"file": str(f.path), "count": f.count, "changed": f.changed}
+            for f in files
+        ],
+        "changed": [str(f.path) for f in changed],
+        "timings": {**timings, "render": render_ms},
+        "took_ms": took_ms,
+    })
+    logger.info("Apply %s: %d/%d file(s) changed in %.1f ms", "+".join(targets), len(changed), len(files), took_ms)
+    return result
+
+# ---------------------------------------------------------
+# Roll the outputs back to their previous generation
+# ---------------------------------------------------------
+def rollback_outputs(targets: Iterable[str] = TARGETS) -> Dict[str, Any]:
+
+    # Initialization
+    start_ns = time.monotonic_ns()
+    targets = tuple(t for t in TARGETS if t in set(targets))
+    live = bool(get_config("KEA_CONTROL_URL"))
+
+    paths: List[Path] = []
+    shards: List[Tuple[Path, int]] = []
+    if "dhcp" in targets:
+        shards = dhcp4_outputs()
+        base = shards[0][0]
+        manifest = manifest_path(base)
+        # Shards of either generation: a shard removed by the last apply comes back
+        for path, subnet_id in read_manifest_shards(manifest, base) + read_manifest_shards(previous_path(manifest), base):
+            if path not in {p for p, _ in shards}:
+                shards.append((path, subnet_id))
+        paths.append(Path(get_config("DHCP6_HOST_FILE")))
+        paths.extend(path for path, _ in shards)
+        paths.append(manifest)
+    if "dns" in targets:
+        paths.extend(dns_outputs())
+
+    # Reservations the running Kea holds, to bring it back in line after the swap
+    previous = {}
+    if live and shards:
+        digests = read_manifest_digests(base)
+        state = read_kea_state(base)
+        for path, _ in shards:
+            previous[path] = kea_previous(path, digests.get(path.name), state)
+
+    restored = [str(path) for path in paths if _swap_previous(path)]
+
+    kea = []
+    if live and shards:
+        # The manifest was swapped with the shards: it describes the restored files
+        digests = read_manifest_digests(base)
+        synced = kea_sync(base, [
+            {
+                "path": path,
+                "subnet_id": subnet_id,
+                "sha256": digests.get(path.name),
+                "previous": previous[path],
+                "current": lambda path=path: read_reservations(path),
+            }
+            for path, subnet_id in shards if path.exists()
+        ])
+        kea = [
+            {"file": str(path), "subnet_id": subnet_id, "kea": synced[path.name]}
+            for path, subnet_id in shards if path.name in synced
+        ]
+
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+    logger.info("Rollback %s: %d file(s) restored in %.1f ms", "+".join(targets), len(restored), took_ms)
+    return {
+        "status": "success",
+        "targets": list(targets),
+        "restored": restored,
+        "kea": kea,
+        "took_ms": took_ms,
+    }
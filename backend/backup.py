@@ -7,12 +7,13 @@ import json
 from pathlib import Path
 import shutil
 import time
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, TextIO, Union
 import zipfile
 
 # Import local modules
-from backend.db.hosts import get_hosts, add_host, reset_hosts_db
-from backend.db.aliases import get_aliases, add_alias, reset_aliases_db
+from backend.db.db import BulkWriteError, read_snapshot
+from backend.db.hosts import add_hosts, iter_hosts, reset_hosts_db
+from backend.db.aliases import add_aliases, iter_aliases, reset_aliases_db
 
 # Import Settings & Config
 from backend.settings.settings import settings
@@ -201,6 +202,31 @@ def unzip_backup_archive(
         "took_ms": took_ms,
     }
 
+# ---------------------------------------------------------
+# Internal: write {header..., key: [records]} as json.dump(indent=2) would,
+# one record at a time
+# ---------------------------------------------------------
+def _dump_records(f: TextIO, header: Dict[str, Any], key: str, records: Iterable[NamedTuple]) -> None:
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    f.write("{\n")
+    for name, value in header.items():
+        f.write(f"  {json.dumps(name)}: {encode(value)},\n")
+    f.write(f"  {json.dumps(key)}: [")
+
+    # Field prefixes are the same for every record
+    prefixes: Optional[List[str]] = None
+    for record in records:
+        if prefixes is None:
+            prefixes = [f"\n      {json.dumps(field)}: " for field in record._fields]
+            f.write("\n    {")
+        else:
+            f.write(",\n    {")
+        f.write(",".join(p + encode(v) for p, v in zip(prefixes, record)))
+        f.write("\n    }")
+
+    f.write("]\n}" if prefixes is None else "\n  ]\n}")
+
 # ---------------------------------------------------------
 # Save Hosts DB
 # ---------------------------------------------------------
@@ -222,18 +248,11 @@ def store_hosts(
     errors: List[str] = []
 
     try:
-        # Get Hosts List
-        hosts = get_hosts()
-        count_loaded = len(hosts)
-
-        # Backup Hosts DB
-        with open(file, "w", encoding="utf-8") as f:
-            data = {
-                "generated_at": timestamp,
-                "count": count_loaded,
-                "hosts": hosts,
-            }
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Backup Hosts DB (streamed from one read transaction)
+        with read_snapshot() as conn, open(file, "w", encoding="utf-8") as f:
+            count_loaded = conn.execute("SELECT COUNT(*) FROM hosts").fetchone()[0]
+            header = {"generated_at": timestamp, "count": count_loaded}
+            _dump_records(f, header, "hosts", iter_hosts(conn))
 
     except Exception as e:
         logger.exception("store_hosts failed saving records: %s", str(e).strip())
@@ -285,9 +304,12 @@ def restore_hosts(
             hosts = data.get("hosts", [])
             count_loaded = data.get("count", 0)
 
-        for r in hosts:
-            add_host(r)
-            count_restored += 1
+        # One transaction: the backup is restored entirely or not at all
+        count_restored = add_hosts(hosts)["count"]
+
+    except BulkWriteError as e:
+        logger.error("restore_hosts rejected %d record(s)", len(e.errors))
+        errors.extend(f"row {err['row']}: {err['error']}" for err in e.errors)
 
     except Exception as e:
         logger.exception("restore_hosts failed applying records: %s", str(e).strip())
@@ -338,18 +360,11 @@ def store_aliases(
     errors: List[str] = []
 
     try:
-        # Get Aliases List
-        aliases = get_aliases()
-        count_loaded = len(aliases)
-
-        # Backup Aliases DB
-        with open(file, "w", encoding="utf-8") as f:
-            data = {
-                "generated_at": timestamp,
-                "count": count_loaded,
-                "aliases": aliases,
-            }
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Backup Aliases DB (streamed from one read transaction)
+        with read_snapshot() as conn, open(file, "w", encoding="utf-8") as f:
+            count_loaded = conn.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+            header = {"generated_at": timestamp, "count": count_loaded}
+            _dump_records(f, header, "aliases", iter_aliases(conn))
 
     except Exception as e:
         logger.exception("store_aliases failed saving records: %s", str(e).strip())
@@ -402,9 +417,12 @@ def restore_aliases(
             aliases = data.get("aliases", [])
             count_loaded = data.get("count", 0)
 
-        for r in aliases:
-            add_alias(r)
-            count_restored += 1
+        # One transaction: the backup is restored entirely or not at all
+        count_restored = add_aliases(aliases)["count"]
+
+    except BulkWriteError as e:
+        logger.error("restore_aliases rejected %d record(s)", len(e.errors))
+        errors.extend(f"row {err['row']}: {err['error']}" for err in e.errors)
 
     except Exception as e:
         logger.exception("restore_aliases failed applying records: %s", str(e).strip())
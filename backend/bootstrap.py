@@ -9,10 +9,15 @@ import backend.db.settings
 import backend.db.users
 import backend.db.hosts
 import backend.db.aliases
+import backend.db.versions
+import backend.db.changes
+import backend.db.search
+import backend.db.sessions
+import backend.ratelimit
 
 # Import Settings & Config
 from backend.settings.settings import settings
-from backend.db.settings import get_config
+from backend.db.settings import get_config, subscribe_config
 # Import Logging
 from backend.log.log import setup_logging, get_logger
 
@@ -78,6 +83,29 @@ def print_goodbye(logger):
         settings.APP_NAME, settings.APP_VERSION
     )
 
+# ------------------------------------------------------------------------------
+# Logging setup from the current config
+# ------------------------------------------------------------------------------
+def configure_logging(force: bool = False):
+    setup_logging(
+        level=get_config("LOG_LEVEL"),
+        to_file=get_config("LOG_TO_FILE"),
+        log_file=settings.LOG_FILE,
+        log_access_file=settings.LOG_ACCESS_FILE,
+        force=force,
+    )
+
+# ------------------------------------------------------------------------------
+# Config subscriber: reconfigure logging live
+# ------------------------------------------------------------------------------
+@subscribe_config("LOG_LEVEL", "LOG_TO_FILE")
+def _on_logging_change(changes):
+    configure_logging(force=True)
+    get_logger(__name__).info(
+        "Log: level=%s, to_file=%s (applied live)",
+        get_config("LOG_LEVEL"), get_config("LOG_TO_FILE")
+    )
+
 # ------------------------------------------------------------------------------
 # Bootstrap: setup logging, print welcome, create DB, etc.
 # ------------------------------------------------------------------------------
@@ -88,12 +116,7 @@ def bootstrap():
     created = create_db(settings.DB_RESET)
 
     # Log Setup
-    setup_logging(
-        level=get_config("LOG_LEVEL"),
-        to_file=get_config("LOG_TO_FILE"),
-        log_file=settings.LOG_FILE,
-        log_access_file=settings.LOG_ACCESS_FILE
-    )
+    configure_logging()
 
     logger = get_logger(__name__)
 
@@ -103,3 +126,11 @@ def bootstrap():
         logger.info("Database created: %s", settings.DB_FILE)
     else:
         logger.info("Database already exists. Nothing to do.")
+
+# ------------------------------------------------------------------------------
+# Bootstrap of a supervised worker (database already created by the supervisor)
+# ------------------------------------------------------------------------------
+def bootstrap_worker():
+    configure_db(settings.DB_FILE)
+    create_db(False)
+    configure_logging()
@@ -0,0 +1,194 @@
+# backend/db/aio.py
+
+# Import standard modules
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Import local modules
+from backend.db.db import transaction
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Executors: readers (per-thread read connections) and the single writer thread
+_read_executor: Optional[ThreadPoolExecutor] = None
+_write_executor: Optional[ThreadPoolExecutor] = None
+
+# Writer task state (bound to the event loop that started it)
+_queue: Optional[asyncio.Queue] = None
+_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Statistics
+_stats: Dict[str, Any] = {
+    "batches": 0,
+    "writes": 0,
+    "failed": 0,
+    "max_batch": 0,
+    "commit_ms": 0.0,
+}
+
+# -----------------------------
+# Internal: executors (created on first use)
+# -----------------------------
+def _get_read_executor() -> ThreadPoolExecutor:
+    global _read_executor
+    if _read_executor is None:
+        _read_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.DB_READ_WORKERS),
+            thread_name_prefix="db-read",
+        )
+    return _read_executor
+
+def _get_write_executor() -> ThreadPoolExecutor:
+    global _write_executor
+    if _write_executor is None:
+        _write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+    return _write_executor
+
+# -----------------------------
+# Run a read function (backend.db.*) on the read executor
+# -----------------------------
+async def run_read(func: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_read_executor(), functools.partial(func, *args, **kwargs))
+
+# -----------------------------
+# Run a write function (backend.db.*) through the writer task
+# -----------------------------
+async def run_write(func: Callable, *args, **kwargs) -> Any:
+    queue = _ensure_writer()
+    future = asyncio.get_running_loop().create_future()
+    await queue.put((func, args, kwargs, future))
+    return await future
+
+# -----------------------------
+# Internal: execute a batch in one transaction (writer thread)
+# -----------------------------
+def _run_batch(batch: List[tuple]) -> List[Tuple[bool, Any]]:
+    results: List[Tuple[bool, Any]] = []
+    try:
+        with transaction():
+            for func, args, kwargs, _ in batch:
+                try:
+                    # Savepoint: a failing write only undoes itself
+                    with transaction():
+                        results.append((True, func(*args, **kwargs)))
+                except Exception as err:
+                    results.append((False, err))
+
+    except Exception as err:
+        # The commit itself failed: no write of the batch was saved
+        logger.error(f"DB: Group commit of {len(batch)} write(s) failed - {err}")
+        return [(False, err)] * len(batch)
+
+    return results
+
+# -----------------------------
+# Internal: writer loop (group commit)
+# -----------------------------
+async def _writer_loop(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    window = max(0, settings.DB_GROUP_COMMIT_MS) / 1000
+    max_batch = max(1, settings.DB_GROUP_COMMIT_MAX)
+    stop = False
+
+    while not stop:
+        item = await queue.get()
+        if item is None:
+            break
+
+        # Take what queued up meanwhile, then wait up to the window for more
+        batch = [item]
+        deadline = loop.time() + window
+        while len(batch) < max_batch:
+            try:
+                if not queue.empty():
+                    item = queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    item = await asyncio.wait_for(queue.get(), timeout)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+
+        start_ns = time.monotonic_ns()
+        try:
+            results = await loop.run_in_executor(_get_write_executor(), _run_batch, batch)
+        except Exception as err:
+            results = [(False, err)] * len(batch)
+
+        _stats["batches"] += 1
+        _stats["writes"] += len(batch)
+        _stats["failed"] += sum(1 for ok, _ in results if not ok)
+        _stats["max_batch"] = max(_stats["max_batch"], len(batch))
+        _stats["commit_ms"] += (time.monotonic_ns() - start_ns) / 1_000_000
+
+        for (_, _, _, future), (ok, value) in zip(batch, results):
+            if future.cancelled():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+# -----------------------------
+# Internal: writer task of the running loop (started on first write)
+# -----------------------------
+def _ensure_writer() -> asyncio.Queue:
+    global _queue, _task, _loop
+
+    loop = asyncio.get_running_loop()
+    if _task is None or _task.done() or _loop is not loop:
+        _loop = loop
+        _queue = asyncio.Queue()
+        _task = loop.create_task(_writer_loop(_queue), name="db-writer")
+    return _queue
+
+# -----------------------------
+# Start the writer task (app lifespan)
+# -----------------------------
+async def start_writer() -> None:
+    _ensure_writer()
+    logger.debug("DB writer started")
+
+# -----------------------------
+# Stop the writer task (app lifespan), pending writes are committed first
+# -----------------------------
+async def stop_writer() -> None:
+    global _queue, _task, _loop, _read_executor, _write_executor
+
+    if _task is not None and _loop is asyncio.get_running_loop() and not _task.done():
+        await _queue.put(None)
+        await _task
+    _queue = _task = _loop = None
+
+    for executor in (_read_executor, _write_executor):
+        if executor is not None:
+            executor.shutdown(wait=True)
+    _read_executor = _write_executor = None
+    logger.debug("DB writer stopped")
+
+# -----------------------------
+# Writer statistics
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    batches = _stats["batches"]
+    return {
+        **_stats,
+        "avg_batch": (_stats["writes"] / batches) if batches else 0,
+        "queued": _queue.qsize() if _queue is not None else 0,
+    }
@@ -4,10 +4,13 @@
 import ipaddress
 import re
 import sqlite3
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 # Import local modules
-from backend.db.db import get_db, register_init
+from backend.db.db import get_read_db, iter_records, notify_change, register_init, register_migration, transaction, write_many
+from backend.db.changes import max_row_id, record_bulk_write, record_change, record_changes, register_journal
+from backend.db.search import clear_index, index_bulk_write, index_row, unindex_row
+from backend.db.paging import fetch_page, like_pattern
 from backend.utils import normalize
 
 # Import Logging
@@ -16,6 +19,45 @@ from backend.log.log import get_logger
 # Logger initialization
 logger = get_logger(__name__)
 
+class AliasRecord(NamedTuple):
+    """Alias row of the streaming readers (see HostRecord)"""
+    id: int
+    name: str
+    target: str
+    description: Optional[str]
+    ssl_enabled: int
+    visibility: int
+    last_updated: Optional[str]
+
+# Public columns of an alias
+ALIAS_COLUMNS = ", ".join(AliasRecord._fields)
+register_journal("aliases", ALIAS_COLUMNS)
+
+# Sort fields of the paged listing (each one indexed)
+SORT_FIELDS = {
+    "target": "target",
+    "name": "name",
+    "last_updated": "last_updated",
+}
+
+# Exact-match filters of the paged listing
+FILTER_FIELDS = ("name", "target", "visibility", "ssl_enabled")
+
+# Rows fetched per round-trip by the streaming readers
+FETCH_SIZE = 500
+
+# Columns written by the bulk APIs (validate_data keys)
+WRITE_COLUMNS = ("name", "target", "description", "ssl_enabled", "visibility")
+
+# Bulk insert / upsert (a name already present is updated in place)
+INSERT_SQL = f"INSERT INTO aliases ({', '.join(WRITE_COLUMNS)}) VALUES ({', '.join('?' * len(WRITE_COLUMNS))})"
+UPSERT_SQL = INSERT_SQL + """
+    ON CONFLICT(name) DO UPDATE SET
+        target=excluded.target, description=excluded.description,
+        ssl_enabled=excluded.ssl_enabled, visibility=excluded.visibility,
+        last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
+"""
+
 # -----------------------------
 # Check Data Input
 # -----------------------------
@@ -55,17 +97,74 @@ def validate_data(data: Dict[str, Any]) -> Dict[str, Any]:
 # -----------------------------
 # SELECT ALL ALIASES
 # -----------------------------
-def get_aliases() -> List[Dict[str, Any]]:
-    conn = get_db()
+def get_aliases(conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    conn = conn or get_read_db()
     cur = conn.execute("SELECT * FROM aliases ORDER BY target")
     rows = [dict(r) for r in cur.fetchall()]
     return rows
 
+# -----------------------------
+# SELECT A PAGE OF ALIASES (keyset pagination, search, filters)
+# -----------------------------
+def get_aliases_page(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    sort: str = "target",
+    order: str = "asc",
+    q: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Dict[str, Any]:
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort: {sort} (expected {', '.join(SORT_FIELDS)})")
+
+    where: List[str] = []
+    params: List[Any] = []
+
+    # Free text: substring of name, target or description
+    if q and q.strip():
+        pattern = like_pattern(q.strip())
+        where.append("(name LIKE ? ESCAPE '\\' OR target LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+        params.extend([pattern] * 3)
+
+    for field, value in (filters or {}).items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Invalid filter: {field}")
+        if value is None:
+            continue
+        where.append(f"{field} = ?")
+        params.append(value)
+
+    return fetch_page(
+        conn or get_read_db(),
+        "aliases",
+        ALIAS_COLUMNS,
+        sort,
+        SORT_FIELDS[sort],
+        order=order,
+        where=where,
+        params=params,
+        limit=limit,
+        cursor=cursor,
+    )
+
+# -----------------------------
+# STREAM ALL ALIASES ordered as get_aliases() (constant memory)
+# -----------------------------
+def iter_aliases(conn: Optional[sqlite3.Connection] = None) -> Iterator[AliasRecord]:
+    return iter_records(
+        conn or get_read_db(),
+        f"SELECT {ALIAS_COLUMNS} FROM aliases ORDER BY target",
+        (),
+        AliasRecord,
+        FETCH_SIZE,
+    )
+
 # -----------------------------
 # SELECT ALL ALIASES with SSL Certificate
 # -----------------------------
 def get_aliases_certificates() -> List[Dict[str, Any]]:
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.execute("SELECT name FROM aliases WHERE ssl_enabled = 1")
     rows = [dict(r) for r in cur.fetchall()]
     return rows
@@ -74,7 +173,7 @@ def get_aliases_certificates() -> List[Dict[str, Any]]:
 # SELECT SINGLE ALIAS
 # -----------------------------
 def get_alias(alias_id: int) -> Optional[Dict[str, Any]]:
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.execute("SELECT * FROM aliases WHERE id = ?", (alias_id,))
     row = cur.fetchone()
     return dict(row) if row else None
@@ -87,32 +186,74 @@ def add_alias(data: Dict[str, Any]):
     # Validate input
     cleaned = validate_data(data)
 
-    conn = get_db()
     try:
-        cur = conn.execute(
-            """
-            INSERT INTO aliases (name, target, description, ssl_enabled, visibility)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                cleaned["name"],
-                cleaned["target"],
-                cleaned["description"],
-                cleaned["ssl_enabled"],
-                cleaned["visibility"],
-            ),
-        )
-        conn.commit()
+        with transaction() as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO aliases (name, target, description, ssl_enabled, visibility)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    cleaned["name"],
+                    cleaned["target"],
+                    cleaned["description"],
+                    cleaned["ssl_enabled"],
+                    cleaned["visibility"],
+                ),
+            )
+            record_change(conn, "aliases", cur.lastrowid, "insert")
+            index_row(conn, "aliases", cur.lastrowid)
+            notify_change("aliases")
 
     except sqlite3.IntegrityError:
-        conn.rollback()
         raise ValueError("Alias already exists or unique constraint failed")
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"ALIASES DB: Error adding alias - {err}")
         raise
 
+# -----------------------------
+# Internal: validate a batch, collecting per-row errors (rows numbered from 1)
+# -----------------------------
+def _validate_many(rows: Iterable[Dict[str, Any]]) -> Tuple[List[Tuple[int, tuple]], List[Dict[str, Any]]]:
+    valid: List[Tuple[int, tuple]] = []
+    errors: List[Dict[str, Any]] = []
+    for number, data in enumerate(rows, start=1):
+        try:
+            cleaned = validate_data(data)
+        except (TypeError, ValueError) as err:
+            errors.append({"row": number, "name": data.get("name") if isinstance(data, dict) else None, "error": str(err)})
+            continue
+        valid.append((number, tuple(cleaned[c] for c in WRITE_COLUMNS)))
+    return valid, errors
+
+# -----------------------------
+# Internal: bulk write of a batch
+# -----------------------------
+def _write_aliases(sql: str, rows: Iterable[Dict[str, Any]], skip_invalid: bool, dry_run: bool) -> Dict[str, Any]:
+    valid, errors = _validate_many(rows)
+    with transaction() as conn:
+        max_id = max_row_id(conn, "aliases")
+        count = write_many(sql, valid, errors, skip_invalid=skip_invalid, dry_run=dry_run)
+        if count and not dry_run:
+            names = [params[0] for _, params in valid] if sql == UPSERT_SQL else ()
+            record_bulk_write(conn, "aliases", max_id, names)
+            index_bulk_write(conn, "aliases", max_id, names)
+            notify_change("aliases")
+    return {"count": count, "errors": errors}
+
+# -----------------------------
+# ADD ALIASES (one transaction, see hosts.add_hosts)
+# -----------------------------
+def add_aliases(rows: Iterable[Dict[str, Any]], skip_invalid: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    return _write_aliases(INSERT_SQL, rows, skip_invalid, dry_run)
+
+# -----------------------------
+# UPSERT ALIASES (one transaction, matched by name)
+# -----------------------------
+def upsert_aliases(rows: Iterable[Dict[str, Any]], skip_invalid: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    return _write_aliases(UPSERT_SQL, rows, skip_invalid, dry_run)
+
 # -----------------------------
 # UPDATE ALIAS
 # -----------------------------
@@ -121,29 +262,31 @@ def update_alias(alias_id: int, data: Dict[str, Any]) -> bool:
     # Validate input
     cleaned = validate_data(data)
 
-    conn = get_db()
     try:
-        cur = conn.execute(
-            """
-            UPDATE aliases
-            SET name=?, target=?, description=?, ssl_enabled=?, visibility=?,
-                last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
-            WHERE id=?
-            """,
-            (
-                cleaned["name"],
-                cleaned["target"],
-                cleaned["description"],
-                cleaned["ssl_enabled"],
-                cleaned["visibility"],
-                alias_id,
-            ),
-        )
-        conn.commit()
-        return cur.rowcount > 0
+        with transaction() as conn:
+            cur = conn.execute(
+                """
+                UPDATE aliases
+                SET name=?, target=?, description=?, ssl_enabled=?, visibility=?,
+                    last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
+                WHERE id=?
+                """,
+                (
+                    cleaned["name"],
+                    cleaned["target"],
+                    cleaned["description"],
+                    cleaned["ssl_enabled"],
+                    cleaned["visibility"],
+                    alias_id,
+                ),
+            )
+            if cur.rowcount:
+                record_change(conn, "aliases", alias_id, "update")
+                index_row(conn, "aliases", alias_id)
+                notify_change("aliases")
+            return cur.rowcount > 0
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"ALIASES DB: Error updating alias - {err}")
         raise
 
@@ -156,14 +299,16 @@ def delete_alias(alias_id: int) -> bool:
     if alias_id is None:
         raise ValueError("alias_id cannot be None")
 
-    conn = get_db()
     try:
-        cur = conn.execute("DELETE FROM aliases WHERE id = ?", (alias_id,))
-        conn.commit()
-        return cur.rowcount > 0
+        with transaction() as conn:
+            cur = conn.execute("DELETE FROM aliases WHERE id = ?", (alias_id,))
+            if cur.rowcount:
+                record_change(conn, "aliases", alias_id, "delete")
+                unindex_row(conn, "aliases", alias_id)
+                notify_change("aliases")
+            return cur.rowcount > 0
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"ALIASES DB: Error deleting alias - {err}")
         raise
 
@@ -189,17 +334,27 @@ def init_db_aliases_table(cur: sqlite3.Cursor) -> None:
     )
     cur.execute("CREATE INDEX IF NOT EXISTS idx_aliases_name ON aliases(name);")
 
+# -----------------------------
+# Migration: indexes of the paged listing sort fields (built in the background)
+# -----------------------------
+@register_migration("aliases_sort_indexes", online=True)
+def migrate_aliases_sort_indexes(cur: sqlite3.Cursor) -> None:
+    # name and target are NOT NULL: plain indexes (name has idx_aliases_name)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_aliases_target ON aliases(target);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_aliases_last_updated_order ON aliases(last_updated IS NULL, last_updated);")
+
 # -----------------------------
 # Reset Aliases DB Table
 # -----------------------------
 def reset_aliases_db() -> None:
-    conn = get_db()
     try:
-        conn.execute("DELETE FROM aliases;")
-        conn.execute("DELETE FROM sqlite_sequence WHERE name='aliases';")
-        conn.commit()
+        with transaction() as conn:
+            record_changes(conn, "aliases", "delete", "1")
+            conn.execute("DELETE FROM aliases;")
+            clear_index(conn, "aliases")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name='aliases';")
+            notify_change("aliases")
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"ALIASES DB: Error resetting tables - {err}")
         raise
@@ -0,0 +1,318 @@
+# backend/db/changes.py
+
+# Import standard modules
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+# Import local modules
+from backend.db.db import get_read_db, register_migration, transaction
+from backend.db.versions import EPOCH_ROW
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Journaled tables and the columns returned with their changes (register_journal)
+JOURNAL_COLUMNS: Dict[str, str] = {}
+
+# Largest delta returned by one call
+MAX_CHANGES = 5000
+
+# Seconds between two compactions
+COMPACT_INTERVAL_SECONDS = 3600
+
+# Compaction thread
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+_stats: Dict[str, Any] = {"compactions": 0, "last_compaction": None}
+
+# -----------------------------
+# Register a journaled table (columns returned with its changes)
+# -----------------------------
+def register_journal(table: str, columns: str) -> None:
+    JOURNAL_COLUMNS[table] = columns
+
+# -----------------------------
+# Migration: changes journal and its floor
+# -----------------------------
+@register_migration("changes_journal")
+def migrate_changes_journal(cur: sqlite3.Cursor) -> None:
+    # AUTOINCREMENT: a sequence is never reused, also after compaction
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+        );
+        """
+    )
+
+    # Highest sequence dropped by compaction (older cursors need a full resync)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS changes_floor (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            seq INTEGER NOT NULL
+        );
+        """
+    )
+    cur.execute("INSERT OR IGNORE INTO changes_floor (id, seq) VALUES (1, 0);")
+
+# -----------------------------
+# Migration: ISO timestamps in journals created with a CURRENT_TIMESTAMP default
+# -----------------------------
+@register_migration("changes_iso_timestamps", depends_on=["changes_journal"])
+def migrate_changes_iso_timestamps(cur: sqlite3.Cursor) -> None:
+    sql = cur.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'changes'").fetchone()[0]
+    if "CURRENT_TIMESTAMP" not in sql:
+        return
+
+    # SQLite cannot alter a default: rebuild the table, keeping seq and the sequence
+    last_seq = _last_seq(cur.connection)
+    cur.execute(
+        """
+        CREATE TABLE changes_iso (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+        );
+        """
+    )
+    cur.execute(
+        """
+        INSERT INTO changes_iso (seq, table_name, row_id, op, changed_at)
+        SELECT seq, table_name, row_id, op, strftime('%Y-%m-%dT%H:%M:%SZ', changed_at) FROM changes ORDER BY seq
+        """
+    )
+    cur.execute("DROP TABLE changes")
+    cur.execute("ALTER TABLE changes_iso RENAME TO changes")
+    cur.execute("DELETE FROM sqlite_sequence WHERE name = 'changes'")
+    if last_seq:
+        cur.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('changes', ?)", (last_seq,))
+
+# -----------------------------
+# Journal one row change (inside the transaction of the write)
+# -----------------------------
+def record_change(conn: sqlite3.Connection, table: str, row_id: int, op: str) -> None:
+    conn.execute("INSERT INTO changes (table_name, row_id, op) VALUES (?, ?, ?)", (table, row_id, op))
+
+# -----------------------------
+# Journal the rows of a table matching where (one statement, any number of rows)
+# -----------------------------
+def record_changes(conn: sqlite3.Connection, table: str, op: str, where: str, params: Sequence[Any] = ()) -> int:
+    cur = conn.execute(
+        f"INSERT INTO changes (table_name, row_id, op) SELECT ?, id, ? FROM {table} WHERE {where} ORDER BY id",
+        (table, op, *params),
+    )
+    return cur.rowcount
+
+# -----------------------------
+# Journal a bulk insert / upsert: ids above max_id are new, upserted names updated
+# -----------------------------
+def record_bulk_write(conn: sqlite3.Connection, table: str, max_id: int, names: Sequence[str] = ()) -> None:
+    if names:
+        record_changes(conn, table, "update", "id <= ? AND name IN (SELECT value FROM json_each(?))", (max_id, json.dumps(list(names))))
+    record_changes(conn, table, "insert", "id > ?", (max_id,))
+
+# -----------------------------
+# Highest id of a table (the new rows of a bulk write are above it)
+# -----------------------------
+def max_row_id(conn: sqlite3.Connection, table: str) -> int:
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+
+# -----------------------------
+# Internal: highest sequence dropped by compaction
+# -----------------------------
+def _floor(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT seq FROM changes_floor WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+# -----------------------------
+# Internal: last sequence assigned (0 on an empty journal)
+# -----------------------------
+def _last_seq(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+    return row[0] if row else 0
+
+# -----------------------------
+# Last sequence of the journal
+# -----------------------------
+def get_last_seq(conn: Optional[sqlite3.Connection] = None) -> int:
+    return _last_seq(conn or get_read_db())
+
+# -----------------------------
+# Changes after a sequence, with the current rows
+# -----------------------------
+def get_changes(since: Optional[int], limit: int = MAX_CHANGES, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+    """
+    Journal entries with seq > since, oldest first. Each entry carries the
+    current row ("data", None once deleted): insert and update are upserts
+    for a replica, and an entry may be newer than the data it already has.
+    "resync" is set when since is older than the compacted journal (or
+    belongs to another database): the replica must reload everything and
+    continue from last_seq. since None only returns the current last_seq
+    (the starting point of a replica, taken before its full load).
+    """
+    if since is not None and since < 0:
+        raise ValueError(f"Invalid since: {since}")
+    if not 1 <= limit <= MAX_CHANGES:
+        raise ValueError(f"Invalid limit: {limit} (expected 1-{MAX_CHANGES})")
+
+    conn = conn or get_read_db()
+
+    # Journal, floor and rows from the same snapshot
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        epoch = conn.execute("SELECT version FROM data_versions WHERE name = ?", (EPOCH_ROW,)).fetchone()[0]
+        floor = _floor(conn)
+        last_seq = _last_seq(conn)
+        if since is None:
+            since = last_seq
+
+        if since < floor or since > last_seq:
+            return {"epoch": epoch, "since": since, "last_seq": last_seq, "resync": True, "has_more": False, "changes": []}
+
+        rows = conn.execute(
+            "SELECT seq, table_name, row_id, op, changed_at FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+            (since, limit + 1),
+        ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Current rows of the changed ids, one query per table
+        data: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        for table, columns in JOURNAL_COLUMNS.items():
+            ids = sorted({r[2] for r in rows if r[1] == table})
+            data[table] = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                cur = conn.execute(
+                    f"SELECT {columns} FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                data[table].update((r["id"], dict(r)) for r in cur.fetchall())
+    finally:
+        if own_transaction:
+            conn.rollback()
+
+    changes: List[Dict[str, Any]] = [
+        {
+            "seq": seq,
+            "table": table,
+            "id": row_id,
+            "op": op,
+            "changed_at": changed_at,
+            "data": data.get(table, {}).get(row_id),
+        }
+        for seq, table, row_id, op, changed_at in rows
+    ]
+
+    return {
+        "epoch": epoch,
+        "since": since,
+        "last_seq": changes[-1]["seq"] if has_more else last_seq,
+        "resync": False,
+        "has_more": has_more,
+        "changes": changes,
+    }
+
+# -----------------------------
+# Compact the journal
+# -----------------------------
+def compact_changes(retention_days: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Keep only the latest entry of every row (a replica applies the current
+    row anyway), then drop the entries older than retention_days and raise
+    the floor to the last dropped sequence.
+    """
+    if retention_days is None:
+        retention_days = settings.CHANGES_RETENTION_DAYS
+
+    with transaction() as conn:
+        superseded = conn.execute(
+            """
+            DELETE FROM changes
+            WHERE seq NOT IN (SELECT MAX(seq) FROM changes GROUP BY table_name, row_id)
+            """
+        ).rowcount
+
+        expired = 0
+        if retention_days > 0:
+            # Same ISO format as changed_at: the strings compare in time order
+            cutoff = conn.execute(
+                "SELECT MAX(seq) FROM changes WHERE changed_at < strftime('%Y-%m-%dT%H:%M:%SZ', 'now', ?)",
+                (f"-{retention_days} days",),
+            ).fetchone()[0]
+            if cutoff is not None:
+                expired = conn.execute("DELETE FROM changes WHERE seq <= ?", (cutoff,)).rowcount
+                conn.execute("UPDATE changes_floor SET seq = MAX(seq, ?) WHERE id = 1", (cutoff,))
+
+        floor = _floor(conn)
+        remaining = conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+
+    result = {"superseded": superseded, "expired": expired, "remaining": remaining, "floor": floor}
+    _stats["compactions"] += 1
+    _stats["last_compaction"] = result
+    if superseded or expired:
+        logger.info(f"CHANGES: compacted journal - {superseded} superseded, {expired} expired, {remaining} kept")
+    return result
+
+# -----------------------------
+# Internal: compaction loop
+# -----------------------------
+def _compact_loop() -> None:
+    while True:
+        try:
+            compact_changes()
+        except Exception as err:
+            logger.error(f"CHANGES: Error compacting journal - {err}")
+        if _stop.wait(COMPACT_INTERVAL_SECONDS):
+            return
+
+# -----------------------------
+# Start the compaction thread (app lifespan)
+# -----------------------------
+def start_compaction() -> None:
+    global _thread
+
+    if _thread is not None and _thread.is_alive():
+        return
+
+    _stop.clear()
+    _thread = threading.Thread(target=_compact_loop, name="changes-compaction", daemon=True)
+    _thread.start()
+
+# -----------------------------
+# Stop the compaction thread (app lifespan)
+# -----------------------------
+def stop_compaction(timeout: float = 5.0) -> None:
+    global _thread
+
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout)
+        _thread = None
+
+# -----------------------------
+# Journal statistics
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    conn = get_read_db()
+    return {
+        **_stats,
+        "last_seq": _last_seq(conn),
+        "floor": _floor(conn),
+    }
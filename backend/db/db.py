@@ -1,17 +1,51 @@
 # backend/db/db.py
 
 # Import standard modules
+from contextlib import contextmanager
 from pathlib import Path
 import sqlite3
+import threading
+import time
+import weakref
 
+# Import local modules
+from backend.db.querystats import StatsConnection
+from backend.utils import ipv4_to_int, ipv6_to_key
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Writer connection (every write goes through transaction())
 _connection = None
+_write_lock = threading.Lock()
 _db_path: Path | None = None
 INIT_REGISTRY = {}
+MIGRATION_REGISTRY = {}
+CHANGE_LISTENERS = []
+COMMIT_HOOKS = []
+
+# Migrations applied at this startup (name -> timings)
+_migration_report = {"applied": [], "online_pending": [], "online_thread": None}
+
+# Read-only connections, one per thread (WAL: readers never block each other)
+_local = threading.local()
+_readers = weakref.WeakSet()
+_generation = 0
+_readers_lock = threading.Lock()
+
+# Checkpoint connection (a checkpoint never runs inside a writer transaction)
+_checkpoint_connection = None
+_checkpoint_lock = threading.Lock()
 
 # ---------------------------------------------------------
-# Internal: resolve init order based on dependencies
+# Internal: resolve init / migration order based on dependencies
 # ---------------------------------------------------------
-def _resolve_init_order():
+def _resolve_order(registry):
     visited = set()
     visiting = set()
     order = []
@@ -24,8 +58,8 @@ def _resolve_init_order():
 
         visiting.add(name)
 
-        for dep in INIT_REGISTRY[name]["depends_on"]:
-            if dep not in INIT_REGISTRY:
+        for dep in registry[name]["depends_on"]:
+            if dep not in registry:
                 raise RuntimeError(f"Missing dependency: {dep}")
             visit(dep)
 
@@ -33,11 +67,14 @@ def _resolve_init_order():
         visited.add(name)
         order.append(name)
 
-    for name in INIT_REGISTRY:
+    for name in registry:
         visit(name)
 
     return order
 
+def _resolve_init_order():
+    return _resolve_order(INIT_REGISTRY)
+
 # -----------------------------
 # Register DB Init Function
 # -----------------------------
@@ -54,6 +91,80 @@ def register_init(name, depends_on=None):
 
     return decorator
 
+# -----------------------------
+# Register DB Migration Function
+# -----------------------------
+def register_migration(name, depends_on=None, online=False):
+    """
+    Schema change applied once per database and recorded in schema_migrations.
+    Regular migrations run at startup, all pending ones in a single
+    transaction. Online migrations (index builds, backfills of large
+    tables) run afterwards in the background, each in its own
+    transaction, while the application serves requests: code must not
+    depend on their result being present.
+    """
+    if depends_on is None:
+        depends_on = []
+
+    def decorator(func):
+        MIGRATION_REGISTRY[name] = {
+            "func": func,
+            "depends_on": depends_on,
+            "online": online,
+        }
+        return func
+
+    return decorator
+
+# -----------------------------
+# Register Change Listener
+# -----------------------------
+def register_change_listener(func):
+    if func not in CHANGE_LISTENERS:
+        CHANGE_LISTENERS.append(func)
+    return func
+
+# -----------------------------
+# Unregister Change Listener
+# -----------------------------
+def unregister_change_listener(func):
+    if func in CHANGE_LISTENERS:
+        CHANGE_LISTENERS.remove(func)
+
+# -----------------------------
+# Register Commit Hook: func(conn, tables) runs inside the transaction, before COMMIT
+# -----------------------------
+def register_commit_hook(func):
+    if func not in COMMIT_HOOKS:
+        COMMIT_HOOKS.append(func)
+    return func
+
+# -----------------------------
+# Notify data change (deferred to the commit inside a transaction)
+# -----------------------------
+def notify_change(table: str):
+    if getattr(_local, "depth", 0):
+        _local.tables.add(table)
+        return
+
+    # Already committed: the commit hooks still get their own transaction
+    if COMMIT_HOOKS:
+        with transaction():
+            _local.tables.add(table)
+        return
+
+    _notify_listeners(table)
+
+# -----------------------------
+# Internal: call the change listeners (after the commit)
+# -----------------------------
+def _notify_listeners(table: str):
+    for func in list(CHANGE_LISTENERS):
+        try:
+            func(table)
+        except Exception as err:
+            logger.error(f"DB: Change listener failed for {table} - {err}")
+
 # -----------------------------
 # Configure database (path)
 # -----------------------------
@@ -70,30 +181,166 @@ def configure_db(path: Path):
 # Init Database
 # -----------------------------
 def init_db():
-    conn = get_db()
-    cur = conn.cursor()
-
     ordered_names = _resolve_init_order()
 
-    for name in ordered_names:
-        func = INIT_REGISTRY[name]["func"]
-        func(cur)
+    with transaction() as conn:
+        cur = conn.cursor()
+        for name in ordered_names:
+            func = INIT_REGISTRY[name]["func"]
+            func(cur)
+
+# -----------------------------
+# Internal: migrations already applied
+# -----------------------------
+def _applied_migrations(conn) -> set:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ','now')),
+            took_ms REAL
+        );
+        """
+    )
+    return {r[0] for r in conn.execute("SELECT name FROM schema_migrations").fetchall()}
+
+# -----------------------------
+# Internal: apply one migration (inside the current transaction)
+# -----------------------------
+def _apply_migration(conn, name) -> float:
+    start_ns = time.monotonic_ns()
+    MIGRATION_REGISTRY[name]["func"](conn.cursor())
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+    conn.execute("INSERT INTO schema_migrations (name, took_ms) VALUES (?, ?)", (name, took_ms))
+    _migration_report["applied"].append({
+        "name": name,
+        "online": MIGRATION_REGISTRY[name]["online"],
+        "took_ms": took_ms,
+    })
+    logger.info(f"DB: Migration {name} applied in {took_ms:.1f} ms")
+    return took_ms
+
+# -----------------------------
+# Migrate Database (pending regular migrations, one transaction)
+# -----------------------------
+def migrate_db():
+    order = _resolve_order(MIGRATION_REGISTRY)
+
+    # A regular migration can not wait for a background one
+    for name in order:
+        entry = MIGRATION_REGISTRY[name]
+        if not entry["online"]:
+            for dep in entry["depends_on"]:
+                if MIGRATION_REGISTRY[dep]["online"]:
+                    raise RuntimeError(f"Migration {name} depends on online migration {dep}")
+
+    start_ns = time.monotonic_ns()
+    with transaction() as conn:
+        applied = _applied_migrations(conn)
+        pending = [n for n in order if n not in applied and not MIGRATION_REGISTRY[n]["online"]]
+        for name in pending:
+            _apply_migration(conn, name)
+
+    _migration_report["online_pending"] = [
+        n for n in order if n not in applied and MIGRATION_REGISTRY[n]["online"]
+    ]
+
+    if pending:
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        logger.info(f"DB: {len(pending)} migration(s) applied in {took_ms:.1f} ms")
+
+# -----------------------------
+# Run the pending online migrations (each in its own transaction)
+# -----------------------------
+def run_online_migrations():
+    while _migration_report["online_pending"]:
+        name = _migration_report["online_pending"][0]
+        try:
+            with transaction() as conn:
+                if name not in _applied_migrations(conn):
+                    _apply_migration(conn, name)
+        except Exception as err:
+            logger.error(f"DB: Online migration {name} failed, retried at next startup - {err}")
+            # Migrations depending on it have to wait as well
+            _migration_report["online_pending"] = []
+            return
+        _migration_report["online_pending"].pop(0)
+
+# -----------------------------
+# Start the online migrations in the background (app lifespan)
+# -----------------------------
+def start_online_migrations():
+    if not _migration_report["online_pending"]:
+        return
+    thread = threading.Thread(target=run_online_migrations, name="db-migrations", daemon=True)
+    _migration_report["online_thread"] = thread
+    thread.start()
+
+# -----------------------------
+# Migration status (applied at this startup / pending)
+# -----------------------------
+def get_migration_status():
+    thread = _migration_report["online_thread"]
+    return {
+        "applied": list(_migration_report["applied"]),
+        "online_pending": list(_migration_report["online_pending"]),
+        "online_running": bool(thread and thread.is_alive()),
+    }
+
+# -----------------------------
+# Migration helper: add a column if missing
+# -----------------------------
+def add_column(cur, table, column, definition):
+    columns = {r[1] for r in cur.execute(f"PRAGMA table_info({table});").fetchall()}
+    if column not in columns:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition};")
+        return True
+    return False
+
+# -----------------------------
+# Migration helper: update a large table in rowid batches
+# -----------------------------
+def backfill(cur, table, assignments, where="1", batch_size=5000):
+    """UPDATE <table> SET <assignments> WHERE <where>, batch_size rows per statement."""
+    last = cur.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+    updated = 0
+    for start in range(0, last + 1, batch_size):
+        cur.execute(
+            f"UPDATE {table} SET {assignments} WHERE rowid >= ? AND rowid < ? AND ({where})",
+            (start, start + batch_size),
+        )
+        updated += cur.rowcount
+    return updated
 
-    conn.commit()
+# -----------------------------
+# Migration helper: rebuild a table with a new definition
+# -----------------------------
+def rebuild_table(cur, table, create_sql, columns, indexes=()):
+    """
+    Recreate <table> from create_sql (with a {table} placeholder for the
+    name), copying the listed columns, then recreate the indexes. Foreign
+    keys are checked at commit time, after the table got its name back.
+    """
+    new = f"{table}__new"
+    cols = ", ".join(columns)
+    cur.execute("PRAGMA defer_foreign_keys = ON;")
+    cur.execute(create_sql.format(table=new))
+    cur.execute(f"INSERT INTO {new} ({cols}) SELECT {cols} FROM {table};")
+    cur.execute(f"DROP TABLE {table};")
+    cur.execute(f"ALTER TABLE {new} RENAME TO {table};")
+    for sql in indexes:
+        cur.execute(sql)
 
 # -----------------------------
 # Create Database
 # -----------------------------
 def create_db(reset: bool = False):
-    global _connection
 
     if _db_path is None:
         raise RuntimeError("Database not configured. Call configure_db() first.")
 
     if reset:
-        if _connection is not None:
-            _connection.close()
-            _connection = None
+        close_db()
 
         if _db_path.exists():
             _db_path.unlink()
@@ -107,25 +354,302 @@ def create_db(reset: bool = False):
     # ensure schema
     init_db()
 
+    # schema changes of existing databases
+    migrate_db()
+
+    # New database: nothing to wait for, build everything now
+    if not existed_before:
+        run_online_migrations()
+
     return not existed_before
 
 # -----------------------------
-# Connect to the database
+# Pragma profiles (writer / readers)
+# -----------------------------
+def _pragmas(role: str) -> list:
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.DB_BUSY_TIMEOUT_MS)};",
+        # negative value = size in KiB
+        f"PRAGMA cache_size = -{int(settings.DB_CACHE_SIZE_KB)};",
+        f"PRAGMA mmap_size = {int(settings.DB_MMAP_SIZE_MB) * 1024 * 1024};",
+        "PRAGMA temp_store = MEMORY;",
+        "PRAGMA foreign_keys = ON;",
+    ]
+    if role == "writer":
+        pragmas += [
+            # Only applies to a new database (before its first table): free pages
+            # are then returned by the maintenance task (incremental_vacuum)
+            "PRAGMA auto_vacuum = INCREMENTAL;",
+            "PRAGMA journal_mode = WAL;",
+            # NORMAL is durable across application crashes in WAL mode
+            f"PRAGMA synchronous = {settings.DB_SYNCHRONOUS};",
+        ]
+    else:
+        pragmas.append("PRAGMA query_only = ON;")
+    return pragmas
+
+# -----------------------------
+# Internal: open a connection with the profile of its role
+# -----------------------------
+def _connect(role: str) -> sqlite3.Connection:
+    if _db_path is None:
+        raise RuntimeError("Database path not configured")
+
+    # Statement timing only when enabled (plain connections otherwise)
+    factory = StatsConnection if settings.DB_QUERY_STATS else sqlite3.Connection
+
+    if role == "writer":
+        _db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_db_path, check_same_thread=False, isolation_level=None, factory=factory)
+    else:
+        conn = sqlite3.connect(
+            f"{Path(_db_path).resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            factory=factory,
+        )
+    conn.row_factory = sqlite3.Row
+
+    # SQL helpers (e.g. backfill of the numeric address columns)
+    conn.create_function("ipv4_int", 1, ipv4_to_int, deterministic=True)
+    conn.create_function("ipv6_key", 1, ipv6_to_key, deterministic=True)
+
+    for pragma in _pragmas(role):
+        conn.execute(pragma)
+    return conn
+
+# -----------------------------
+# Connect to the database (writer connection)
 # -----------------------------
 def get_db():
     global _connection
 
     if _connection is None:
-        if _db_path is None:
-            raise RuntimeError("Database path not configured")
+        with _readers_lock:
+            if _connection is None:
+                _connection = _connect("writer")
 
-        _db_path.parent.mkdir(parents=True, exist_ok=True)
+    return _connection
+
+# -----------------------------
+# Internal: read connection of a thread, closed when the thread ends
+# -----------------------------
+class _Reader:
+    def __init__(self, conn: sqlite3.Connection, generation: int):
+        self.conn = conn
+        self.generation = generation
+
+    def close(self):
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            conn.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+# -----------------------------
+# Read-only connection of the current thread
+# -----------------------------
+def get_read_db() -> sqlite3.Connection:
+    reader = getattr(_local, "reader", None)
+    if reader is None or reader.conn is None or reader.generation != _generation:
+        # The writer creates the database file (and the WAL) first
+        get_db()
+        reader = _Reader(_connect("reader"), _generation)
+        with _readers_lock:
+            _readers.add(reader)
+        _local.reader = reader
+    return reader.conn
 
-        _connection = sqlite3.connect(_db_path, check_same_thread=False)
-        _connection.row_factory = sqlite3.Row
+# -----------------------------
+# Write transaction (BEGIN IMMEDIATE, nested scopes use savepoints)
+# -----------------------------
+@contextmanager
+def transaction():
+    conn = get_db()
+    depth = getattr(_local, "depth", 0)
+
+    # Nested scope: savepoint inside the transaction of this thread
+    if depth:
+        name = f"sp_{depth}"
+        conn.execute(f"SAVEPOINT {name}")
+        _local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+            raise
+        else:
+            conn.execute(f"RELEASE {name}")
+        finally:
+            _local.depth = depth
+        return
+
+    # Outermost scope: one writer at a time, lock taken at BEGIN
+    with _write_lock:
+        _local.depth = 1
+        _local.tables = set()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                for hook in COMMIT_HOOKS:
+                    if _local.tables:
+                        hook(conn, _local.tables)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            _local.depth = 0
+            tables, _local.tables = _local.tables, set()
+
+    # Change listeners run after the commit, outside the write lock
+    for table in sorted(tables):
+        _notify_listeners(table)
 
-        _connection.execute("PRAGMA foreign_keys = ON;")
-        # opzionale ma consigliato
-        _connection.execute("PRAGMA journal_mode=WAL;")
+# -----------------------------
+# Bulk write: per-row errors of a batch
+# -----------------------------
+class BulkWriteError(ValueError):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} row(s) rejected")
+        self.errors = errors
 
-    return _connection
+# -----------------------------
+# Bulk write: one executemany, row by row only to locate conflicts
+# -----------------------------
+def write_many(sql, rows, errors, skip_invalid=False, dry_run=False):
+    """
+    Execute sql for every (row_number, params) of rows in one transaction.
+    errors holds the validation errors of the batch ({"row", "error"}) and
+    receives the rows refused by the database. Without skip_invalid any
+    error rolls the whole batch back (BulkWriteError); with it the valid
+    rows are written. dry_run reports the same outcome and rolls back.
+    Returns the number of rows written.
+    """
+    if errors and not skip_invalid:
+        raise BulkWriteError(errors)
+    if not rows:
+        return 0
+
+    def execute(conn):
+        try:
+            with transaction():
+                conn.executemany(sql, [params for _, params in rows])
+            return len(rows)
+
+        except sqlite3.IntegrityError:
+            pass
+
+        # Constraint violation: find the offending rows
+        written = 0
+        for number, params in rows:
+            try:
+                with transaction():
+                    conn.execute(sql, params)
+                written += 1
+            except sqlite3.IntegrityError as err:
+                errors.append({"row": number, "error": str(err)})
+
+        errors.sort(key=lambda e: e["row"])
+        if not skip_invalid:
+            raise BulkWriteError(errors)
+        return written
+
+    written = 0
+    try:
+        with transaction() as conn:
+            written = execute(conn)
+            if dry_run:
+                raise _DryRun()
+    except _DryRun:
+        pass
+    return written
+
+class _DryRun(Exception):
+    pass
+
+# -----------------------------
+# Streaming read: rows of a query as records, fetch_size rows at a time
+# -----------------------------
+def iter_records(conn, sql, params, record, fetch_size=500):
+    cur = conn.cursor()
+    # Plain tuples, turned into the record type (no sqlite3.Row / dict per row)
+    cur.row_factory = None
+    cur.execute(sql, params)
+    try:
+        while True:
+            rows = cur.fetchmany(fetch_size)
+            if not rows:
+                break
+            yield from map(record._make, rows)
+    finally:
+        cur.close()
+
+# -----------------------------
+# WAL checkpoint (busy, WAL frames, frames checkpointed)
+# -----------------------------
+def wal_checkpoint(mode: str = "PASSIVE", busy_timeout_ms: int = 0):
+    """
+    PASSIVE copies what it can without waiting for anyone; RESTART and
+    TRUNCATE also wait (up to busy_timeout_ms, holding off writers) for
+    the readers to leave the WAL, then start it over.
+    """
+    global _checkpoint_connection
+
+    # The writer creates the database file (and the WAL) first
+    get_db()
+    with _checkpoint_lock:
+        if _checkpoint_connection is None:
+            _checkpoint_connection = _connect("writer")
+        conn = _checkpoint_connection
+        conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)};")
+        return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone())
+
+# -----------------------------
+# Close every connection (writer and readers)
+# -----------------------------
+def close_db():
+    global _connection, _checkpoint_connection, _generation
+
+    with _readers_lock:
+        _generation += 1
+        for reader in list(_readers):
+            try:
+                reader.close()
+            except sqlite3.Error as err:
+                logger.error(f"DB: Error closing read connection - {err}")
+        _readers.clear()
+
+        with _checkpoint_lock:
+            if _checkpoint_connection is not None:
+                _checkpoint_connection.close()
+                _checkpoint_connection = None
+
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+# -----------------------------
+# Read snapshot (dedicated read-only connection, one read transaction)
+# -----------------------------
+@contextmanager
+def read_snapshot():
+    # Make sure the database (and its WAL files) exist
+    get_db()
+
+    conn = _connect("reader")
+    try:
+        # Every query of the block sees the same database state (WAL snapshot),
+        # also from several threads sharing the connection
+        conn.execute("BEGIN")
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
@@ -4,11 +4,24 @@
 import ipaddress
 import re
 import sqlite3
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 # Import local modules
-from backend.db.db import get_db, register_init
-from backend.utils import normalize
+from backend.db.db import (
+    add_column,
+    backfill,
+    get_read_db,
+    iter_records,
+    notify_change,
+    register_init,
+    register_migration,
+    transaction,
+    write_many,
+)
+from backend.db.changes import max_row_id, record_bulk_write, record_change, record_changes, register_journal
+from backend.db.search import clear_index, index_bulk_write, index_row, unindex_row
+from backend.db.paging import fetch_page, like_pattern
+from backend.utils import ipv4_to_int, ipv6_to_key, normalize
 
 # Import Logging
 from backend.log.log import get_logger
@@ -19,6 +32,61 @@ logger = get_logger(__name__)
 # Regex for MAC check
 MAC_RE = re.compile(r"^([0-9A-Fa-f]{2}([:\-])){5}([0-9A-Fa-f]{2})$")
 
+class HostRecord(NamedTuple):
+    """
+    Host row of the streaming readers: a tuple with named fields, less
+    than half the memory of the equivalent dict (_asdict() when needed).
+    """
+    id: int
+    name: str
+    ipv4: Optional[str]
+    ipv6: Optional[str]
+    mac: Optional[str]
+    description: Optional[str]
+    ssl_enabled: int
+    visibility: int
+    last_updated: Optional[str]
+
+class ReservationRecord(NamedTuple):
+    name: str
+    ip: str
+    mac: str
+
+# Public columns of a host (ipv4_int / ipv6_key are internal sort keys)
+HOST_COLUMNS = ", ".join(HostRecord._fields)
+register_journal("hosts", HOST_COLUMNS)
+
+# SQL ordering by address (no ip at the end), served by idx_hosts_ipv4_order
+IPV4_ORDER_BY = "ipv4_int IS NULL, ipv4_int, id"
+
+# Rows fetched per round-trip by the streaming readers
+FETCH_SIZE = 500
+
+# Sort fields of the paged listing -> sort expression (each one indexed)
+SORT_FIELDS = {
+    "ipv4": "ipv4_int",
+    "name": "name",
+    "ipv6": "ipv6_key",
+    "mac": "mac",
+    "last_updated": "last_updated",
+}
+
+# Exact-match filters of the paged listing
+FILTER_FIELDS = ("name", "ipv4", "ipv6", "mac", "visibility", "ssl_enabled")
+
+# Columns written by the bulk APIs (validate_data keys)
+WRITE_COLUMNS = ("name", "ipv4", "ipv6", "mac", "description", "ssl_enabled", "visibility", "ipv4_int", "ipv6_key")
+
+# Bulk insert / upsert (a name already present is updated in place)
+INSERT_SQL = f"INSERT INTO hosts ({', '.join(WRITE_COLUMNS)}) VALUES ({', '.join('?' * len(WRITE_COLUMNS))})"
+UPSERT_SQL = INSERT_SQL + """
+    ON CONFLICT(name) DO UPDATE SET
+        ipv4=excluded.ipv4, ipv6=excluded.ipv6, mac=excluded.mac, description=excluded.description,
+        ssl_enabled=excluded.ssl_enabled, visibility=excluded.visibility,
+        ipv4_int=excluded.ipv4_int, ipv6_key=excluded.ipv6_key,
+        last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
+"""
+
 # -----------------------------
 # Check Data Input
 # -----------------------------
@@ -71,30 +139,19 @@ def validate_data(data: Dict[str, Any]) -> Dict[str, Any]:
         "description": normalize(description),
         "ssl_enabled": ssl_enabled,
         "visibility": visibility,
+        "ipv4_int": ipv4_to_int(ipv4),
+        "ipv6_key": ipv6_to_key(ipv6),
     }
 
-# -----------------------------
-# Sorting hosts
-# -----------------------------
-def ipv4_sort_key(h: Dict[str, Any]):
-    v = (h.get("ipv4") or "").strip()
-    if not v:
-        # no ip at the end
-        return (1, 0)
-    try:
-        return (0, int(ipaddress.IPv4Address(v)))
-    except ValueError:
-        return (0, float("inf"))
-
 # -----------------------------
 # SELECT ALL HOSTS
 # -----------------------------
-def get_hosts(filter_devices: bool = False) -> List[Dict[str, Any]]:
-    conn = get_db()
+def get_hosts(filter_devices: bool = False, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    conn = conn or get_read_db()
     query = (
-        "SELECT * FROM hosts"
+        f"SELECT {HOST_COLUMNS} FROM hosts ORDER BY {IPV4_ORDER_BY}"
         if not filter_devices
-        else "SELECT id, ipv4, mac, name, description FROM hosts WHERE ipv4 IS NOT NULL"
+        else f"SELECT id, ipv4, mac, name, description FROM hosts WHERE ipv4 IS NOT NULL ORDER BY {IPV4_ORDER_BY}"
     )
     cur = conn.execute(query)
 
@@ -104,14 +161,124 @@ def get_hosts(filter_devices: bool = False) -> List[Dict[str, Any]]:
         if filter_devices:
             item["id"] = f"s-{item['id']}"  # Frontend requires this format
         rows.append(item)
-    rows.sort(key=ipv4_sort_key)
     return rows
 
+# -----------------------------
+# SELECT HOSTS IN AN IPv4 NETWORK (e.g. 10.0.4.0/22)
+# -----------------------------
+def get_hosts_in_network(network: str, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    try:
+        net = ipaddress.IPv4Network(network.strip(), strict=False)
+    except ValueError:
+        raise ValueError(f"Invalid IPv4 network: {network}")
+
+    conn = conn or get_read_db()
+    cur = conn.execute(
+        f"""
+        SELECT {HOST_COLUMNS} FROM hosts
+        WHERE (ipv4_int IS NULL) = 0 AND ipv4_int BETWEEN ? AND ?
+        ORDER BY ipv4_int, id
+        """,
+        (int(net.network_address), int(net.broadcast_address)),
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+# -----------------------------
+# SELECT A PAGE OF HOSTS (keyset pagination, search, filters)
+# -----------------------------
+def get_hosts_page(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    sort: str = "ipv4",
+    order: str = "asc",
+    q: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    network: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Dict[str, Any]:
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort: {sort} (expected {', '.join(SORT_FIELDS)})")
+
+    where: List[str] = []
+    params: List[Any] = []
+
+    # Free text: substring of name, addresses, MAC or description
+    if q and q.strip():
+        pattern = like_pattern(q.strip())
+        where.append(
+            "(name LIKE ? ESCAPE '\\' OR ipv4 LIKE ? ESCAPE '\\' OR ipv6 LIKE ? ESCAPE '\\' "
+            "OR mac LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')"
+        )
+        params.extend([pattern] * 5)
+
+    for field, value in (filters or {}).items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Invalid filter: {field}")
+        if value is None:
+            continue
+        if field == "mac":
+            value = str(value).strip().lower()
+        where.append(f"{field} = ?")
+        params.append(value)
+
+    if network:
+        try:
+            net = ipaddress.IPv4Network(network.strip(), strict=False)
+        except ValueError:
+            raise ValueError(f"Invalid IPv4 network: {network}")
+        where.append("ipv4_int BETWEEN ? AND ?")
+        params.extend([int(net.network_address), int(net.broadcast_address)])
+
+    return fetch_page(
+        conn or get_read_db(),
+        "hosts",
+        HOST_COLUMNS,
+        sort,
+        SORT_FIELDS[sort],
+        order=order,
+        where=where,
+        params=params,
+        limit=limit,
+        cursor=cursor,
+    )
+
+# -----------------------------
+# STREAM ALL HOSTS ordered as get_hosts() (constant memory)
+# -----------------------------
+def iter_hosts(conn: Optional[sqlite3.Connection] = None) -> Iterator[HostRecord]:
+    return iter_records(
+        conn or get_read_db(),
+        f"SELECT {HOST_COLUMNS} FROM hosts ORDER BY {IPV4_ORDER_BY}",
+        (),
+        HostRecord,
+        FETCH_SIZE,
+    )
+
+# -----------------------------
+# STREAM DHCP RESERVATIONS (name, ip, mac) ordered as get_hosts()
+# -----------------------------
+def iter_reservations(ip_field: str = "ipv4", conn: Optional[sqlite3.Connection] = None) -> Iterator[ReservationRecord]:
+    if ip_field not in ("ipv4", "ipv6"):
+        raise ValueError(f"Invalid reservation address field: {ip_field}")
+
+    return iter_records(
+        conn or get_read_db(),
+        f"""
+        SELECT name, {ip_field} AS ip, mac FROM hosts
+        WHERE {ip_field} IS NOT NULL AND {ip_field} != ''
+          AND mac IS NOT NULL AND mac != ''
+        ORDER BY {IPV4_ORDER_BY}
+        """,
+        (),
+        ReservationRecord,
+        FETCH_SIZE,
+    )
+
 # -----------------------------
 # SELECT ALL HOSTS with SSL Certificate
 # -----------------------------
 def get_hosts_certificates() -> List[Dict[str, Any]]:
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.execute("SELECT name FROM hosts WHERE ssl_enabled = 1")
     rows = [dict(r) for r in cur.fetchall()]
     return rows
@@ -120,8 +287,8 @@ def get_hosts_certificates() -> List[Dict[str, Any]]:
 # SELECT SINGLE HOST
 # -----------------------------
 def get_host(host_id: int) -> Optional[Dict[str, Any]]:
-    conn = get_db()
-    cur = conn.execute("SELECT * FROM hosts WHERE id = ?", (host_id,))
+    conn = get_read_db()
+    cur = conn.execute(f"SELECT {HOST_COLUMNS} FROM hosts WHERE id = ?", (host_id,))
     row = cur.fetchone()
     return dict(row) if row else None
 
@@ -133,34 +300,85 @@ def add_host(data: Dict[str, Any]):
     # Validate input
     cleaned = validate_data(data)
 
-    conn = get_db()
     try:
-        cur = conn.execute(
-           """
-           INSERT INTO hosts (name, ipv4, ipv6, mac, description, ssl_enabled, visibility)
-           VALUES (?, ?, ?, ?, ?, ?, ?)
-           """,
-            (
-                cleaned["name"],
-                cleaned["ipv4"],
-                cleaned["ipv6"],
-                cleaned["mac"],
-                cleaned["description"],
-                cleaned["ssl_enabled"],
-                cleaned["visibility"],
-            ),
-        )
-        conn.commit()
+        with transaction() as conn:
+            cur = conn.execute(
+               """
+               INSERT INTO hosts (name, ipv4, ipv6, mac, description, ssl_enabled, visibility, ipv4_int, ipv6_key)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               """,
+                (
+                    cleaned["name"],
+                    cleaned["ipv4"],
+                    cleaned["ipv6"],
+                    cleaned["mac"],
+                    cleaned["description"],
+                    cleaned["ssl_enabled"],
+                    cleaned["visibility"],
+                    cleaned["ipv4_int"],
+                    cleaned["ipv6_key"],
+                ),
+            )
+            record_change(conn, "hosts", cur.lastrowid, "insert")
+            index_row(conn, "hosts", cur.lastrowid)
+            notify_change("hosts")
 
     except sqlite3.IntegrityError:
-        conn.rollback()
         raise ValueError("Host already exists or unique constraint failed")
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"HOSTS DB: Error adding host - {err}")
         raise
 
+# -----------------------------
+# Internal: validate a batch, collecting per-row errors (rows numbered from 1)
+# -----------------------------
+def _validate_many(rows: Iterable[Dict[str, Any]]) -> Tuple[List[Tuple[int, tuple]], List[Dict[str, Any]]]:
+    valid: List[Tuple[int, tuple]] = []
+    errors: List[Dict[str, Any]] = []
+    for number, data in enumerate(rows, start=1):
+        try:
+            cleaned = validate_data(data)
+        except (TypeError, ValueError) as err:
+            errors.append({"row": number, "name": data.get("name") if isinstance(data, dict) else None, "error": str(err)})
+            continue
+        valid.append((number, tuple(cleaned[c] for c in WRITE_COLUMNS)))
+    return valid, errors
+
+# -----------------------------
+# Internal: bulk write of a batch
+# -----------------------------
+def _write_hosts(sql: str, rows: Iterable[Dict[str, Any]], skip_invalid: bool, dry_run: bool) -> Dict[str, Any]:
+    valid, errors = _validate_many(rows)
+    with transaction() as conn:
+        max_id = max_row_id(conn, "hosts")
+        count = write_many(sql, valid, errors, skip_invalid=skip_invalid, dry_run=dry_run)
+        if count and not dry_run:
+            names = [params[0] for _, params in valid] if sql == UPSERT_SQL else ()
+            record_bulk_write(conn, "hosts", max_id, names)
+            index_bulk_write(conn, "hosts", max_id, names)
+            notify_change("hosts")
+    return {"count": count, "errors": errors}
+
+# -----------------------------
+# ADD HOSTS (one transaction)
+# -----------------------------
+def add_hosts(rows: Iterable[Dict[str, Any]], skip_invalid: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Insert many hosts with a single executemany. Without skip_invalid one
+    invalid or conflicting row rejects the batch (BulkWriteError, with the
+    per-row errors); with it the other rows are written and the errors
+    returned next to the count. dry_run checks the batch against the
+    database and rolls it back.
+    """
+    return _write_hosts(INSERT_SQL, rows, skip_invalid, dry_run)
+
+# -----------------------------
+# UPSERT HOSTS (one transaction, matched by name)
+# -----------------------------
+def upsert_hosts(rows: Iterable[Dict[str, Any]], skip_invalid: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    return _write_hosts(UPSERT_SQL, rows, skip_invalid, dry_run)
+
 # -----------------------------
 # UPDATE HOST
 # -----------------------------
@@ -169,34 +387,38 @@ def update_host(host_id: int, data: Dict[str, Any]):
     # Validate input
     cleaned = validate_data(data)
 
-    conn = get_db()
     try:
-        cur = conn.execute(
-            """
-            UPDATE hosts
-            SET name=?, ipv4=?, ipv6=?, mac=?, description=?, ssl_enabled=?, visibility=?,
-                last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
-            WHERE id=?
-            """,
-            (
-                cleaned["name"],
-                cleaned["ipv4"],
-                cleaned["ipv6"],
-                cleaned["mac"],
-                cleaned["description"],
-                cleaned["ssl_enabled"],
-                cleaned["visibility"],
-                host_id,
-            ),
-        )
-
-        if cur.rowcount == 0:
-            raise ValueError(f"Host {host_id} not found")
-
-        conn.commit()
+        with transaction() as conn:
+            cur = conn.execute(
+                """
+                UPDATE hosts
+                SET name=?, ipv4=?, ipv6=?, mac=?, description=?, ssl_enabled=?, visibility=?,
+                    ipv4_int=?, ipv6_key=?,
+                    last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
+                WHERE id=?
+                """,
+                (
+                    cleaned["name"],
+                    cleaned["ipv4"],
+                    cleaned["ipv6"],
+                    cleaned["mac"],
+                    cleaned["description"],
+                    cleaned["ssl_enabled"],
+                    cleaned["visibility"],
+                    cleaned["ipv4_int"],
+                    cleaned["ipv6_key"],
+                    host_id,
+                ),
+            )
+
+            if cur.rowcount == 0:
+                raise ValueError(f"Host {host_id} not found")
+
+            record_change(conn, "hosts", host_id, "update")
+            index_row(conn, "hosts", host_id)
+            notify_change("hosts")
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"HOSTS DB: Error updating host - {err}")
         raise
 
@@ -209,17 +431,18 @@ def delete_host(host_id: int):
     if host_id is None:
         raise ValueError("host_id cannot be None")
 
-    conn = get_db()
     try:
-        cur = conn.execute("DELETE FROM hosts WHERE id = ?", (host_id,))
+        with transaction() as conn:
+            cur = conn.execute("DELETE FROM hosts WHERE id = ?", (host_id,))
 
-        if cur.rowcount == 0:
-            raise ValueError(f"Host {host_id} not found")
+            if cur.rowcount == 0:
+                raise ValueError(f"Host {host_id} not found")
 
-        conn.commit()
+            record_change(conn, "hosts", host_id, "delete")
+            unindex_row(conn, "hosts", host_id)
+            notify_change("hosts")
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"HOSTS DB: Error deleting host - {err}")
         raise
 
@@ -241,7 +464,9 @@ def init_db_hosts_table(cur: sqlite3.Cursor) -> None:
             description TEXT,
             ssl_enabled INTEGER NOT NULL DEFAULT 0,
             visibility INTEGER NOT NULL DEFAULT 0,
-            last_updated TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ','now'))
+            last_updated TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ','now')),
+            ipv4_int INTEGER,
+            ipv6_key TEXT
         );
         """
     )
@@ -262,17 +487,69 @@ def init_db_hosts_table(cur: sqlite3.Cursor) -> None:
     )
     cur.execute("CREATE INDEX IF NOT EXISTS idx_txt_host ON txt_records(host_id);")
 
+# -----------------------------
+# Migration: numeric address columns
+# -----------------------------
+@register_migration("hosts_ip_columns")
+def migrate_hosts_ip_columns(cur: sqlite3.Cursor) -> None:
+
+    # Columns (already present in tables created by this version)
+    add_column(cur, "hosts", "ipv4_int", "INTEGER")
+    add_column(cur, "hosts", "ipv6_key", "TEXT")
+
+    # Backfill
+    backfill(cur, "hosts", "ipv4_int = ipv4_int(ipv4), ipv6_key = ipv6_key(ipv6)")
+
+# -----------------------------
+# Migration: address indexes (built in the background)
+# -----------------------------
+@register_migration("hosts_ip_indexes", depends_on=["hosts_ip_columns"], online=True)
+def migrate_hosts_ip_indexes(cur: sqlite3.Cursor) -> None:
+
+    # Ordering and range queries
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_hosts_ipv4_order ON hosts(ipv4_int IS NULL, ipv4_int);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_hosts_ipv6_key ON hosts(ipv6_key);")
+
+    # Duplicate detection (existing duplicates keep a plain index until fixed)
+    for column in ("ipv4", "mac"):
+        try:
+            cur.execute("SAVEPOINT ux_hosts;")
+            cur.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS ux_hosts_{column} ON hosts({column}) "
+                f"WHERE {column} IS NOT NULL AND {column} != '';"
+            )
+            cur.execute("RELEASE ux_hosts;")
+        except sqlite3.IntegrityError:
+            cur.execute("ROLLBACK TO ux_hosts;")
+            cur.execute("RELEASE ux_hosts;")
+            logger.warning(f"HOSTS DB: Duplicate {column} values found, unique index not created")
+            cur.execute(f"CREATE INDEX IF NOT EXISTS idx_hosts_{column} ON hosts({column});")
+
+# -----------------------------
+# Migration: indexes of the paged listing sort fields (built in the background)
+# -----------------------------
+@register_migration("hosts_sort_indexes", depends_on=["hosts_ip_indexes"], online=True)
+def migrate_hosts_sort_indexes(cur: sqlite3.Cursor) -> None:
+    # name is NOT NULL (idx_hosts_name), ipv4 has idx_hosts_ipv4_order
+    for field in ("ipv6", "mac", "last_updated"):
+        expr = SORT_FIELDS[field]
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_hosts_{field}_order ON hosts({expr} IS NULL, {expr});")
+
+    # Replaced by idx_hosts_ipv6_order
+    cur.execute("DROP INDEX IF EXISTS idx_hosts_ipv6_key;")
+
 # -----------------------------
 # Reset Hosts DB Table
 # -----------------------------
 def reset_hosts_db() -> None:
-    conn = get_db()
     try:
-        conn.execute("DELETE FROM hosts;")
-        conn.execute("DELETE FROM sqlite_sequence WHERE name='hosts';")
-        conn.commit()
+        with transaction() as conn:
+            record_changes(conn, "hosts", "delete", "1")
+            conn.execute("DELETE FROM hosts;")
+            clear_index(conn, "hosts")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name='hosts';")
+            notify_change("hosts")
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"HOSTS DB: Error resetting tables - {err}")
         raise
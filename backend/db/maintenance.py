@@ -0,0 +1,237 @@
+# backend/db/maintenance.py
+
+# Import standard modules
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Import local modules
+from backend.db.db import get_db, get_read_db, transaction, wal_checkpoint
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Rows sampled per index by ANALYZE (bounds its duration on large tables)
+ANALYSIS_LIMIT = 400
+
+# Pages freed by the first incremental vacuum step (then adapted to DB_MAINTENANCE_STEP_MS)
+VACUUM_STEP_PAGES = 128
+MIN_VACUUM_STEP_PAGES = 8
+MAX_VACUUM_STEP_PAGES = 8192
+
+# Share of a pass spent on vacuum steps (the rest is left to the writers between steps)
+VACUUM_STEPS_PER_PASS = 20
+
+# Maintenance thread
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+# Writes seen by the passes (total_changes of the writer connection)
+_seen: Dict[str, Any] = {"conn": None, "total_changes": 0, "analyzed_at": 0, "write_at": time.monotonic()}
+
+_stats: Dict[str, Any] = {
+    "passes": 0,
+    "checkpoints": 0,
+    "wal_truncations": 0,
+    "analyzes": 0,
+    "vacuum_steps": 0,
+    "vacuumed_pages": 0,
+    "max_step_ms": 0.0,
+    "last_pass": None,
+    "last_error": None,
+}
+
+# -----------------------------
+# Internal: size of the write-ahead log (bytes)
+# -----------------------------
+def _wal_bytes() -> int:
+    try:
+        return os.path.getsize(f"{settings.DB_FILE}-wal")
+    except OSError:
+        return 0
+
+# -----------------------------
+# Internal: time a step holding the write lock
+# -----------------------------
+def _step_done(start_ns: int) -> float:
+    ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+    if ms > _stats["max_step_ms"]:
+        _stats["max_step_ms"] = round(ms, 3)
+    return ms
+
+# -----------------------------
+# Internal: checkpoint the WAL and start it over once it is too large
+# -----------------------------
+def _checkpoint(actions: Dict[str, Any]) -> None:
+    wal_bytes = _wal_bytes()
+    if wal_bytes < settings.DB_WAL_CHECKPOINT_MB * 1024 * 1024:
+        return
+
+    # Copy the frames to the database without holding anyone off
+    busy, frames, copied = wal_checkpoint("PASSIVE")
+    _stats["checkpoints"] += 1
+    actions["checkpoint"] = {"wal_mb": round(wal_bytes / (1024 * 1024), 2), "frames": frames, "copied": copied}
+
+    # Everything copied: truncating only waits for the readers still in the WAL
+    if frames >= 0 and copied == frames:
+        start_ns = time.perf_counter_ns()
+        busy, _, _ = wal_checkpoint("TRUNCATE", busy_timeout_ms=settings.DB_MAINTENANCE_STEP_MS)
+        _step_done(start_ns)
+        if not busy:
+            _stats["wal_truncations"] += 1
+        actions["checkpoint"]["truncated"] = not busy
+
+# -----------------------------
+# Internal: refresh the planner statistics after enough written rows
+# -----------------------------
+def _analyze(actions: Dict[str, Any], total_changes: int) -> None:
+    written = total_changes - _seen["analyzed_at"]
+    if written < settings.DB_ANALYZE_ROWS:
+        return
+
+    start_ns = time.perf_counter_ns()
+    with transaction() as conn:
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT};")
+        conn.execute("ANALYZE;")
+        conn.execute("PRAGMA optimize;")
+    ms = _step_done(start_ns)
+
+    _seen["analyzed_at"] = total_changes
+    _stats["analyzes"] += 1
+    actions["analyze"] = {"rows_written": written, "took_ms": round(ms, 3)}
+
+# -----------------------------
+# Internal: return free pages to the filesystem in short steps (idle database)
+# -----------------------------
+def _vacuum(actions: Dict[str, Any]) -> None:
+    conn = get_read_db()
+    if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+        return
+    free = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+    total = conn.execute("PRAGMA page_count;").fetchone()[0]
+    if not free or free * 100 < total * settings.DB_VACUUM_FREE_PERCENT:
+        return
+
+    pages, freed, steps = VACUUM_STEP_PAGES, 0, 0
+    budget_ms = settings.DB_MAINTENANCE_STEP_MS
+    while freed < free and steps < VACUUM_STEPS_PER_PASS and not _stop.is_set():
+        start_ns = time.perf_counter_ns()
+        with transaction() as conn:
+            # The sqlite3 module runs a pragma without result rows for one page only
+            for _ in range(min(pages, free - freed)):
+                conn.execute("PRAGMA incremental_vacuum(1);")
+        ms = _step_done(start_ns)
+        freed += min(pages, free - freed)
+        steps += 1
+
+        # Step size follows the time budget of a step
+        if ms < budget_ms / 2:
+            pages = min(pages * 2, MAX_VACUUM_STEP_PAGES)
+        elif ms > budget_ms:
+            pages = max(pages // 2, MIN_VACUUM_STEP_PAGES)
+
+        # Queued writers go first
+        time.sleep(budget_ms / 1000)
+
+    _stats["vacuum_steps"] += steps
+    _stats["vacuumed_pages"] += freed
+    actions["vacuum"] = {"free_pages": free, "freed_pages": freed, "steps": steps}
+
+# -----------------------------
+# One maintenance pass (checkpoint, analyze, vacuum when idle)
+# -----------------------------
+def run_maintenance() -> Dict[str, Any]:
+    """
+    Each step holds the writers off for about DB_MAINTENANCE_STEP_MS at
+    most: the checkpoint copies the WAL without locking and only truncates
+    it once copied, ANALYZE samples ANALYSIS_LIMIT rows per index, and the
+    vacuum frees pages in steps sized to the budget.
+    """
+    start_ns = time.perf_counter_ns()
+    actions: Dict[str, Any] = {}
+
+    # Writes since the last pass (a new writer connection starts from 0)
+    writer = get_db()
+    total_changes = writer.total_changes
+    if _seen["conn"] is not writer or total_changes < _seen["total_changes"]:
+        _seen.update(conn=writer, total_changes=0, analyzed_at=0)
+    if total_changes != _seen["total_changes"]:
+        _seen["write_at"] = time.monotonic()
+
+    _checkpoint(actions)
+    _analyze(actions, total_changes)
+    if time.monotonic() - _seen["write_at"] >= settings.DB_MAINTENANCE_IDLE_SECONDS:
+        _vacuum(actions)
+
+    # Rows of the maintenance itself (ANALYZE) are not writes
+    _seen["total_changes"] = writer.total_changes
+    _seen["analyzed_at"] += writer.total_changes - total_changes
+
+    result = {
+        "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "took_ms": round((time.perf_counter_ns() - start_ns) / 1_000_000, 3),
+        **actions,
+    }
+    _stats["passes"] += 1
+    _stats["last_pass"] = result
+    if actions:
+        logger.info(f"DB MAINTENANCE: {', '.join(actions)} in {result['took_ms']} ms")
+    return result
+
+# -----------------------------
+# Internal: maintenance loop
+# -----------------------------
+def _maintenance_loop() -> None:
+    while not _stop.wait(settings.DB_MAINTENANCE_INTERVAL_SECONDS):
+        try:
+            run_maintenance()
+            _stats["last_error"] = None
+        except Exception as err:
+            _stats["last_error"] = str(err)
+            logger.error(f"DB MAINTENANCE: Error in maintenance pass - {err}")
+
+# -----------------------------
+# Start the maintenance thread (app lifespan)
+# -----------------------------
+def start_maintenance() -> None:
+    global _thread
+
+    if settings.DB_MAINTENANCE_INTERVAL_SECONDS <= 0:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+
+    _stop.clear()
+    _thread = threading.Thread(target=_maintenance_loop, name="db-maintenance", daemon=True)
+    _thread.start()
+
+# -----------------------------
+# Stop the maintenance thread (app lifespan)
+# -----------------------------
+def stop_maintenance(timeout: float = 5.0) -> None:
+    global _thread
+
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout)
+        _thread = None
+
+# -----------------------------
+# Maintenance statistics (with the current WAL and free space)
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    conn = get_read_db()
+    return {
+        "enabled": settings.DB_MAINTENANCE_INTERVAL_SECONDS > 0,
+        **_stats,
+        "wal_mb": round(_wal_bytes() / (1024 * 1024), 2),
+        "page_count": conn.execute("PRAGMA page_count;").fetchone()[0],
+        "freelist_pages": conn.execute("PRAGMA freelist_count;").fetchone()[0],
+        "auto_vacuum": ("none", "full", "incremental")[conn.execute("PRAGMA auto_vacuum;").fetchone()[0]],
+    }
@@ -0,0 +1,149 @@
+# backend/db/paging.py
+
+# Import standard modules
+import base64
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Largest page a client can ask for
+MAX_PAGE_SIZE = 1000
+
+# -----------------------------
+# Opaque cursor: sort, order and the key of the last row of the page
+# -----------------------------
+def encode_cursor(sort: str, order: str, key: Sequence[Any]) -> str:
+    raw = json.dumps({"s": sort, "o": order, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[int, Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        is_null, value, row_id = data["k"]
+        if data["s"] != sort or data["o"] != order:
+            raise ValueError("cursor belongs to another sort order")
+        return int(bool(is_null)), value, int(row_id)
+    except (ValueError, TypeError, KeyError) as err:
+        raise ValueError(f"Invalid cursor: {err}")
+
+# -----------------------------
+# LIKE pattern matching value anywhere (use with ESCAPE '\\')
+# -----------------------------
+def like_pattern(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+# -----------------------------
+# Internal: one segment (values / NULLs) of the sort column after the cursor
+# -----------------------------
+def _fetch_segment(
+    conn: sqlite3.Connection,
+    sql: str,
+    sort_expr: str,
+    where: List[str],
+    params: List[Any],
+    is_null: int,
+    after: Optional[Tuple[Any, int]],
+    descending: bool,
+    limit: int,
+) -> List[sqlite3.Row]:
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+    clauses = list(where) + [f"({sort_expr} IS NULL) = {is_null}"]
+    args = list(params)
+
+    # Served by the (<column> IS NULL, <column>) index of the sort column
+    if is_null:
+        if after is not None:
+            clauses.append(f"id {op} ?")
+            args.append(after[1])
+        order_by = f"id {direction}"
+    else:
+        if after is not None:
+            clauses.append(f"({sort_expr}, id) {op} (?, ?)")
+            args.extend(after)
+        order_by = f"{sort_expr} {direction}, id {direction}"
+
+    args.append(limit)
+    return conn.execute(f"{sql} WHERE {' AND '.join(clauses)} ORDER BY {order_by} LIMIT ?", args).fetchall()
+
+# -----------------------------
+# Keyset page: rows after the cursor, total of the filtered rows
+# -----------------------------
+def fetch_page(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: str,
+    sort: str,
+    sort_expr: str,
+    order: str = "asc",
+    where: Optional[List[str]] = None,
+    params: Optional[List[Any]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Page of <table> ordered by sort_expr (NULLs last, id as tie-breaker;
+    desc is the exact reverse). Each page seeks from the key of the last
+    row (keyset), so page N costs the same as page 1. limit None returns
+    every matching row.
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Invalid order: {order} (expected asc, desc)")
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Invalid limit: {limit} (expected 1-{MAX_PAGE_SIZE})")
+
+    where = where or []
+    params = params or []
+    descending = order == "desc"
+    sql = f"SELECT {columns}, {sort_expr} AS _sort_key FROM {table}"
+
+    # Segments in page order: values then NULLs (reversed for desc)
+    segments = [1, 0] if descending else [0, 1]
+    after: Optional[Tuple[Any, int]] = None
+    if cursor:
+        is_null, value, row_id = decode_cursor(cursor, sort, order)
+        segments = segments[segments.index(is_null):]
+        after = (value, row_id)
+
+    # Page and total from the same snapshot
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        # One row more than the page tells whether a next page exists
+        wanted = (limit + 1) if limit is not None else -1
+        rows: List[sqlite3.Row] = []
+        for is_null in segments:
+            remaining = wanted - len(rows) if limit is not None else -1
+            rows.extend(_fetch_segment(conn, sql, sort_expr, where, params, is_null, after, descending, remaining))
+            after = None
+            if limit is not None and len(rows) >= wanted:
+                break
+
+        total_sql = f"SELECT COUNT(*) FROM {table}" + (f" WHERE {' AND '.join(where)}" if where else "")
+        total = conn.execute(total_sql, params).fetchone()[0]
+    finally:
+        if own_transaction:
+            conn.rollback()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, order, [int(last["_sort_key"] is None), last["_sort_key"], last["id"]])
+
+    items = []
+    for r in rows:
+        item = dict(r)
+        del item["_sort_key"]
+        items.append(item)
+
+    return {
+        "items": items,
+        "total": total,
+        "limit": limit,
+        "sort": sort,
+        "order": order,
+        "next_cursor": next_cursor,
+    }
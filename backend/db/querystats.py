@@ -0,0 +1,297 @@
+# backend/db/querystats.py
+
+# Import standard modules
+from collections import deque
+from functools import lru_cache
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+# Import Settings
+from backend.settings.settings import settings
+
+# Durations kept per statement for the percentiles (most recent executions)
+SAMPLES_PER_STATEMENT = 1024
+
+# Distinct statements tracked (the others are counted under OTHER_STATEMENT)
+MAX_STATEMENTS = 500
+OTHER_STATEMENT = "(other)"
+
+# Sort keys of the statement list
+SORT_FIELDS = ("total_ms", "avg_ms", "p50_ms", "p95_ms", "max_ms", "count", "rows", "statement")
+
+# Statements with a query plan (EXPLAIN QUERY PLAN)
+PLAN_STATEMENTS = ("SELECT", "WITH", "INSERT", "REPLACE", "UPDATE", "DELETE")
+
+# Slow queries kept (most recent first when listed)
+SLOW_QUERY_LOG_SIZE = 100
+
+# Characters of a statement / its parameters kept in the slow-query log
+MAX_SQL_LENGTH = 2000
+MAX_PARAMS_LENGTH = 500
+
+# Literals and placeholder lists folded by the normalisation
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+# Per-statement aggregates and slow-query log
+_lock = threading.Lock()
+_statements: Dict[str, Dict[str, Any]] = {}
+_slow: Deque[Dict[str, Any]] = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_since = time.time()
+
+# -----------------------------
+# Normalised statement: literals and IN lists as ?, single spaces
+# -----------------------------
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    text = _SPACE_RE.sub(" ", sql).strip().rstrip(";").strip()
+    text = _STRING_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    return _IN_LIST_RE.sub("(?, ...)", text)
+
+# -----------------------------
+# Internal: query plan of a statement (plain cursor, not measured)
+# -----------------------------
+def _query_plan(conn: sqlite3.Connection, sql: str, params: Any) -> Optional[List[str]]:
+    words = sql.split(None, 1)
+    if not words or words[0].upper() not in PLAN_STATEMENTS:
+        return None
+    try:
+        cur = sqlite3.Cursor(conn)
+        rows = cur.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return [row[3] for row in rows]
+    except sqlite3.Error as err:
+        return [f"(plan unavailable: {err})"]
+
+# -----------------------------
+# Internal: add one execution to the aggregates
+# -----------------------------
+def _record(conn: sqlite3.Connection, sql: str, params: Any, elapsed_ns: int, rows: int) -> None:
+    key = normalize_sql(sql)
+    ms = elapsed_ns / 1_000_000
+
+    with _lock:
+        stat = _statements.get(key)
+        if stat is None:
+            if len(_statements) >= MAX_STATEMENTS:
+                key = OTHER_STATEMENT
+                stat = _statements.get(key)
+            if stat is None:
+                stat = _statements[key] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "samples": deque(maxlen=SAMPLES_PER_STATEMENT),
+                }
+        stat["count"] += 1
+        stat["total_ms"] += ms
+        stat["rows"] += rows
+        stat["samples"].append(ms)
+        if ms > stat["max_ms"]:
+            stat["max_ms"] = ms
+
+    threshold = settings.DB_SLOW_QUERY_MS
+    if threshold <= 0 or ms < threshold:
+        return
+
+    # Slow query: the plan is taken now, with the same parameters
+    params_text = repr(params)
+    entry = {
+        "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "ms": round(ms, 3),
+        "rows": rows,
+        "statement": key,
+        "sql": sql.strip()[:MAX_SQL_LENGTH],
+        "params": params_text[:MAX_PARAMS_LENGTH],
+        "thread": threading.current_thread().name,
+        "plan": _query_plan(conn, sql, params) if isinstance(params, (tuple, list, dict)) else None,
+    }
+    with _lock:
+        _slow.append(entry)
+
+# -----------------------------
+# Cursor timing each statement: execute plus the fetches of its rows
+# -----------------------------
+class StatsCursor(sqlite3.Cursor):
+    _sql: Optional[str] = None
+    _params: Any = None
+    _elapsed_ns = 0
+    _rows = 0
+
+    def _begin(self, sql: str, params: Any, elapsed_ns: int, rows: int = 0) -> None:
+        self._sql, self._params, self._elapsed_ns, self._rows = sql, params, elapsed_ns, rows
+
+    def _finish(self) -> None:
+        sql = self._sql
+        if sql is not None:
+            self._sql = None
+            _record(self.connection, sql, self._params, self._elapsed_ns, self._rows)
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start_ns = time.perf_counter_ns()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            self._begin(sql, parameters, time.perf_counter_ns() - start_ns)
+            # Statements without rows (and failed ones) are complete after execute
+            if self.description is None:
+                self._rows = max(self.rowcount, 0)
+                self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start_ns = time.perf_counter_ns()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            self._begin(sql, None, time.perf_counter_ns() - start_ns, max(self.rowcount, 0))
+            self._finish()
+        return self
+
+    def fetchone(self):
+        start_ns = time.perf_counter_ns()
+        row = super().fetchone()
+        self._elapsed_ns += time.perf_counter_ns() - start_ns
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        start_ns = time.perf_counter_ns()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._elapsed_ns += time.perf_counter_ns() - start_ns
+        self._rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start_ns = time.perf_counter_ns()
+        rows = super().fetchall()
+        self._elapsed_ns += time.perf_counter_ns() - start_ns
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        start_ns = time.perf_counter_ns()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed_ns += time.perf_counter_ns() - start_ns
+            self._finish()
+            raise
+        self._elapsed_ns += time.perf_counter_ns() - start_ns
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Rows left unread: the statement ends with the cursor
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+# -----------------------------
+# Connection whose statements all go through StatsCursor
+# -----------------------------
+class StatsConnection(sqlite3.Connection):
+    def cursor(self, factory=StatsCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    # COMMIT carries the write-ahead log sync of the transaction
+    def commit(self):
+        start_ns = time.perf_counter_ns()
+        try:
+            super().commit()
+        finally:
+            _record(self, "COMMIT", None, time.perf_counter_ns() - start_ns, 0)
+
+    def rollback(self):
+        start_ns = time.perf_counter_ns()
+        try:
+            super().rollback()
+        finally:
+            _record(self, "ROLLBACK", None, time.perf_counter_ns() - start_ns, 0)
+
+# -----------------------------
+# Internal: percentile of sorted samples (nearest rank)
+# -----------------------------
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(samples))
+    return samples[min(max(rank, 1), len(samples)) - 1]
+
+# -----------------------------
+# Aggregates and slow-query log
+# -----------------------------
+def get_query_stats(sort: str = "total_ms", limit: int = 50) -> Dict[str, Any]:
+    """
+    Statements by normalised text with count, total/avg/p50/p95/max ms and
+    rows returned (or written), the top `limit` by `sort`, plus the slow
+    queries (newest first) with their query plan. Percentiles are over the
+    last SAMPLES_PER_STATEMENT executions of each statement.
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort: {sort} (expected {', '.join(SORT_FIELDS)})")
+
+    with _lock:
+        items = [(key, dict(stat), sorted(stat["samples"])) for key, stat in _statements.items()]
+        slow = list(reversed(_slow))
+
+    statements = []
+    for key, stat, samples in items:
+        statements.append({
+            "statement": key,
+            "count": stat["count"],
+            "total_ms": round(stat["total_ms"], 3),
+            "avg_ms": round(stat["total_ms"] / stat["count"], 3),
+            "p50_ms": round(_percentile(samples, 50), 3),
+            "p95_ms": round(_percentile(samples, 95), 3),
+            "max_ms": round(stat["max_ms"], 3),
+            "rows": stat["rows"],
+        })
+
+    statements.sort(key=lambda s: s[sort], reverse=sort != "statement")
+
+    return {
+        "enabled": settings.DB_QUERY_STATS,
+        "slow_query_ms": settings.DB_SLOW_QUERY_MS,
+        "since": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(_since)),
+        "distinct_statements": len(statements),
+        "statements": statements[:limit],
+        "slow_queries": slow,
+    }
+
+# -----------------------------
+# Clear aggregates and slow-query log
+# -----------------------------
+def reset_query_stats() -> None:
+    global _since
+
+    with _lock:
+        _statements.clear()
+        _slow.clear()
+        _since = time.time()
@@ -0,0 +1,359 @@
+# backend/db/search.py
+
+# Import standard modules
+import json
+from pathlib import Path
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+# Import local modules
+from backend.db.db import get_read_db, register_migration
+from backend.db.leases import get_leases
+from backend.db.settings import get_config
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Result types
+SEARCH_TYPES = ("host", "alias", "lease")
+
+# Largest result list
+MAX_SEARCH_RESULTS = 100
+
+# Text index: words of names and descriptions, matched as prefixes
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+FTS_PREFIX = "2 3"
+
+# bm25 weights of the indexed columns (names weigh more than descriptions)
+HOSTS_FTS_COLUMNS = ("name", "description")
+HOSTS_FTS_WEIGHTS = (10.0, 1.0)
+ALIASES_FTS_COLUMNS = ("name", "target", "description")
+ALIASES_FTS_WEIGHTS = (10.0, 5.0, 1.0)
+FTS_COLUMNS = {"hosts": HOSTS_FTS_COLUMNS, "aliases": ALIASES_FTS_COLUMNS}
+
+# Address term: IP / MAC fragment ("10.0.1", "fd00:", "aa:bb", "aabb.cc"), matched by
+# prefix on the address indexes; a bare hex word with letters and digits may be a MAC prefix
+_ADDRESS_TERM_RE = re.compile(r"^(?=.*[.:])[0-9a-f:.]+$")
+_MAC_COMPACT_RE = re.compile(r"^(?=.*[a-f])(?=.*[0-9])[0-9a-f]{4,12}$")
+_TOKEN_RE = re.compile(r"\w+")
+
+# Parsed leases file, reused while the file is unchanged
+_leases_lock = threading.Lock()
+_leases_cache: Dict[str, Any] = {"key": None, "rows": []}
+
+# Tables whose index exists (the migration has run)
+_ready: Set[str] = set()
+
+# -----------------------------
+# Migration: full-text indexes of hosts and aliases (built in the background)
+# -----------------------------
+@register_migration("search_fts", online=True)
+def migrate_search_fts(cur: sqlite3.Cursor) -> None:
+    for table, columns in FTS_COLUMNS.items():
+        fts = f"{table}_fts"
+        names = ", ".join(columns)
+        cur.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {names},
+                tokenize = '{FTS_TOKENIZE}',
+                prefix = '{FTS_PREFIX}'
+            );
+            """
+        )
+
+        # Existing rows (writes wait for this transaction, then index their rows)
+        cur.execute(f"DELETE FROM {fts};")
+        cur.execute(f"INSERT INTO {fts} (rowid, {names}) SELECT id, {names} FROM {table};")
+
+    # IPv6 prefix search (ipv4 and mac have their unique indexes)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_hosts_ipv6 ON hosts(ipv6) WHERE ipv6 IS NOT NULL AND ipv6 != '';")
+
+# -----------------------------
+# Internal: True once the index of a table exists (online migration)
+# -----------------------------
+def _index_ready(conn: sqlite3.Connection, table: str) -> bool:
+    if table in _ready:
+        return True
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_fts",)).fetchone() is None:
+        return False
+    _ready.add(table)
+    return True
+
+# -----------------------------
+# Index one row again after an insert / update (inside the write transaction)
+# -----------------------------
+def index_row(conn: sqlite3.Connection, table: str, row_id: int) -> None:
+    """
+    The index is written by the write functions, like the changes journal:
+    FTS5 triggers cost 4x a set-based insert on bulk writes and, inside a
+    savepoint, grow superlinearly with the rows of an upsert.
+    """
+    if not _index_ready(conn, table):
+        return
+
+    fts = f"{table}_fts"
+    columns = ", ".join(FTS_COLUMNS[table])
+    conn.execute(f"DELETE FROM {fts} WHERE rowid = ?", (row_id,))
+    conn.execute(f"INSERT INTO {fts} (rowid, {columns}) SELECT id, {columns} FROM {table} WHERE id = ?", (row_id,))
+
+# -----------------------------
+# Remove one row from the index (after a delete)
+# -----------------------------
+def unindex_row(conn: sqlite3.Connection, table: str, row_id: int) -> None:
+    if _index_ready(conn, table):
+        conn.execute(f"DELETE FROM {table}_fts WHERE rowid = ?", (row_id,))
+
+# -----------------------------
+# Index the rows of a bulk insert / upsert (ids above max_id, upserted names)
+# -----------------------------
+def index_bulk_write(conn: sqlite3.Connection, table: str, max_id: int, names: Sequence[str] = ()) -> None:
+    if not _index_ready(conn, table):
+        return
+
+    fts = f"{table}_fts"
+    columns = ", ".join(FTS_COLUMNS[table])
+    if names:
+        updated = f"SELECT id FROM {table} WHERE id <= ? AND name IN (SELECT value FROM json_each(?))"
+        params = (max_id, json.dumps(list(names)))
+        conn.execute(f"DELETE FROM {fts} WHERE rowid IN ({updated})", params)
+        conn.execute(f"INSERT INTO {fts} (rowid, {columns}) SELECT id, {columns} FROM {table} WHERE id IN ({updated})", params)
+    conn.execute(f"INSERT INTO {fts} (rowid, {columns}) SELECT id, {columns} FROM {table} WHERE id > ?", (max_id,))
+
+# -----------------------------
+# Empty the index of a table (after a reset)
+# -----------------------------
+def clear_index(conn: sqlite3.Connection, table: str) -> None:
+    if _index_ready(conn, table):
+        conn.execute(f"DELETE FROM {table}_fts")
+
+# -----------------------------
+# Internal: tokens of a text (same rules as the index tokenizer)
+# -----------------------------
+def _tokens(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+# -----------------------------
+# Internal: terms of a search (words, address prefixes)
+# -----------------------------
+class _Term(NamedTuple):
+    words: List[str]             # tokens matched as a phrase prefix (empty: address only)
+    ip: Optional[str]            # IPv4 / IPv6 text prefix
+    mac: Optional[str]           # MAC prefix, aa:bb:c form
+
+def _mac_prefix(hexdigits: str) -> Optional[str]:
+    if not 2 <= len(hexdigits) <= 12:
+        return None
+    return ":".join(hexdigits[i:i + 2] for i in range(0, len(hexdigits), 2))
+
+def _parse(q: str) -> List[_Term]:
+    terms = []
+    for term in q.lower().split():
+        if _ADDRESS_TERM_RE.match(term):
+            compact = re.sub(r"[^0-9a-f]", "", term)
+            if ":" in term:
+                # "fd00::1" or "aa:bb:cc"
+                terms.append(_Term([], term, _mac_prefix(compact)))
+            elif re.fullmatch(r"[0-9.]+", term):
+                # "10.0.1"
+                terms.append(_Term([], term, None))
+            else:
+                # "aabb.cc" (dotted MAC)
+                terms.append(_Term([], None, _mac_prefix(compact)))
+        elif _MAC_COMPACT_RE.match(term):
+            # A bare MAC prefix may also be a word
+            terms.append(_Term(_tokens(term), None, _mac_prefix(term)))
+        elif _tokens(term):
+            terms.append(_Term(_tokens(term), None, None))
+    return terms
+
+# -----------------------------
+# Internal: FTS5 phrase prefix of a word term
+# -----------------------------
+def _phrase(words: List[str]) -> str:
+    return '"' + " ".join(words) + '"*'
+
+# -----------------------------
+# Internal: [lo, hi) range of the strings starting with prefix
+# -----------------------------
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+# -----------------------------
+# Internal: SQL condition of an address prefix on an indexed column
+# -----------------------------
+def _address_clause(column: str, prefix: str, args: List[Any]) -> str:
+    args.extend(_prefix_range(prefix))
+    # Literal conditions of the partial index, so that it is used
+    return f"(h.{column} >= ? AND h.{column} < ? AND h.{column} IS NOT NULL AND h.{column} != '')"
+
+# -----------------------------
+# Internal: hosts matching every term (address terms: by address order)
+# -----------------------------
+def _search_hosts(conn: sqlite3.Connection, terms: List[_Term], limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+    columns = "h.id, h.name, h.ipv4, h.ipv6, h.mac, h.description"
+
+    # Words only: one FTS query ranked by bm25
+    if all(t.ip is None and t.mac is None for t in terms):
+        rows = conn.execute(
+            f"""
+            SELECT {columns}, bm25(hosts_fts, {", ".join(map(str, HOSTS_FTS_WEIGHTS))}) AS score
+            FROM hosts_fts JOIN hosts h ON h.id = hosts_fts.rowid
+            WHERE hosts_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (" AND ".join(_phrase(t.words) for t in terms), limit),
+        ).fetchall()
+        return [(r["score"], dict(r)) for r in rows]
+
+    # Address prefixes on the address indexes, words through the FTS index
+    clauses, args = [], []
+    for t in terms:
+        alternatives = []
+        if t.ip is not None:
+            alternatives.append(_address_clause("ipv4" if ":" not in t.ip else "ipv6", t.ip, args))
+        if t.mac is not None:
+            alternatives.append(_address_clause("mac", t.mac, args))
+        if t.words:
+            alternatives.append("h.id IN (SELECT rowid FROM hosts_fts WHERE hosts_fts MATCH ?)")
+            args.append(_phrase(t.words))
+        clauses.append("(" + " OR ".join(alternatives) + ")")
+
+    args.append(limit)
+    rows = conn.execute(
+        f"""
+        SELECT {columns}, 0.0 AS score FROM hosts h
+        WHERE {" AND ".join(clauses)}
+        ORDER BY h.ipv4_int IS NULL, h.ipv4_int, h.id
+        LIMIT ?
+        """,
+        args,
+    ).fetchall()
+    return [(0.0, dict(r)) for r in rows]
+
+# -----------------------------
+# Internal: aliases matching every word term (ranked by bm25)
+# -----------------------------
+def _search_aliases(conn: sqlite3.Connection, terms: List[_Term], limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+    # An alias has no address: an address term is matched as words
+    query = " AND ".join(_phrase(t.words or _tokens(t.ip or t.mac)) for t in terms)
+    rows = conn.execute(
+        f"""
+        SELECT a.id, a.name, a.target, a.description,
+               bm25(aliases_fts, {", ".join(map(str, ALIASES_FTS_WEIGHTS))}) AS score
+        FROM aliases_fts JOIN aliases a ON a.id = aliases_fts.rowid
+        WHERE aliases_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        (query, limit),
+    ).fetchall()
+    return [(r["score"], dict(r)) for r in rows]
+
+# -----------------------------
+# Internal: True when the tokens of a field contain the phrase (last token as prefix)
+# -----------------------------
+def _phrase_match(field: List[str], phrase: List[str]) -> bool:
+    n = len(phrase)
+    for i in range(len(field) - n + 1):
+        if field[i:i + n - 1] == phrase[:-1] and field[i + n - 1].startswith(phrase[-1]):
+            return True
+    return False
+
+# -----------------------------
+# Internal: leases of the leases file (parsed again only when it changes)
+# -----------------------------
+def _cached_leases() -> List[Dict[str, Any]]:
+    path = Path(get_config("DHCP4_LEASES_FILE"))
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return []
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _leases_lock:
+        if _leases_cache["key"] != key:
+            _leases_cache["rows"] = get_leases()
+            _leases_cache["key"] = key
+        return _leases_cache["rows"]
+
+# -----------------------------
+# Internal: leases matching every term (same rules as the hosts)
+# -----------------------------
+def _search_leases(terms: List[_Term], limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+    results = []
+    for lease in _cached_leases():
+        name = _tokens(lease.get("name"))
+        ipv4 = (lease.get("ipv4") or "").lower()
+        mac = (lease.get("mac") or "").lower()
+        if all(
+            (t.ip is not None and ipv4.startswith(t.ip))
+            or (t.mac is not None and mac.startswith(t.mac))
+            or (bool(t.words) and _phrase_match(name, t.words))
+            for t in terms
+        ):
+            results.append((0.0, {
+                "id": lease["id"],
+                "name": lease.get("name"),
+                "ipv4": lease.get("ipv4"),
+                "mac": lease.get("mac"),
+                "dhcp_state": lease.get("dhcp_state"),
+            }))
+            if len(results) >= limit:
+                break
+    return results
+
+# -----------------------------
+# Internal: exact match of the whole search on a main field (ranked first)
+# -----------------------------
+def _exact(item: Dict[str, Any], q: str) -> bool:
+    return any((item.get(f) or "").lower() == q for f in ("name", "ipv4", "ipv6", "mac", "target"))
+
+# -----------------------------
+# Search hosts, aliases and leases
+# -----------------------------
+def search(q: str, limit: int = 20, types: Optional[Iterable[str]] = None, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+    """
+    Every term of q must match: words match the start of a word of a name
+    or description (FTS5), IP / MAC fragments ("10.0.1", "fd00:", "aa:bb",
+    "aabb.cc") the start of an address (address indexes). Results are
+    typed and ranked: exact name or address matches first, then by bm25
+    (names weigh more than descriptions) or, for address searches, by
+    address; leases last.
+    """
+    types = tuple(types) if types else SEARCH_TYPES
+    for t in types:
+        if t not in SEARCH_TYPES:
+            raise ValueError(f"Invalid type: {t} (expected {', '.join(SEARCH_TYPES)})")
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        raise ValueError(f"Invalid limit: {limit} (expected 1-{MAX_SEARCH_RESULTS})")
+
+    terms = _parse(q or "")
+    if not terms:
+        raise ValueError("Empty search")
+
+    conn = conn or get_read_db()
+    found: List[Tuple[str, float, Dict[str, Any]]] = []
+    if "host" in types:
+        found += [("host", score, item) for score, item in _search_hosts(conn, terms, limit)]
+    if "alias" in types:
+        found += [("alias", score, item) for score, item in _search_aliases(conn, terms, limit)]
+    if "lease" in types:
+        found += [("lease", score, item) for score, item in _search_leases(terms, limit)]
+
+    # Stable sort: address results keep their address order
+    key = q.strip().lower()
+    ranked = sorted(
+        enumerate(found),
+        key=lambda f: (not _exact(f[1][2], key), f[1][0] == "lease", f[1][1], f[0]),
+    )
+    return {
+        "q": q,
+        "results": [{"type": kind, **item, "score": score} for _, (kind, score, item) in ranked[:limit]],
+    }
@@ -0,0 +1,89 @@
+# backend/db/sessions.py
+
+# Import standard modules
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+# Import local modules
+from backend.db.db import get_read_db, register_migration, transaction
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# -----------------------------
+# Migration: server-side sessions (SESSION_STORE=sqlite)
+# -----------------------------
+@register_migration("sessions")
+def migrate_sessions(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions(username);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);")
+
+# -----------------------------
+# Create a session (expired ones purged on the way)
+# -----------------------------
+def create_session(session_id: str, username: str, expires_at: float) -> None:
+    now = time.time()
+    with transaction() as conn:
+        conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "INSERT INTO sessions (id, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (session_id, username, now, expires_at),
+        )
+
+# -----------------------------
+# Get a live session of an active user (primary key lookup)
+# -----------------------------
+def get_session(session_id: str) -> Optional[Dict[str, Any]]:
+    row = get_read_db().execute(
+        """
+        SELECT s.id, s.username, s.created_at, s.expires_at
+        FROM sessions s
+        JOIN users u ON u.username = s.username
+        WHERE s.id = ? AND s.expires_at > ? AND u.status = 'active'
+        """,
+        (session_id, time.time()),
+    ).fetchone()
+    return dict(row) if row else None
+
+# -----------------------------
+# Extend a session (sliding renewal)
+# -----------------------------
+def touch_session(session_id: str, expires_at: float) -> None:
+    with transaction() as conn:
+        conn.execute("UPDATE sessions SET expires_at = ? WHERE id = ?", (expires_at, session_id))
+
+# -----------------------------
+# Delete one session (logout)
+# -----------------------------
+def delete_session(session_id: str) -> int:
+    with transaction() as conn:
+        return conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount
+
+# -----------------------------
+# Delete every session of a user (global logout)
+# -----------------------------
+def delete_user_sessions(username: str) -> int:
+    with transaction() as conn:
+        deleted = conn.execute("DELETE FROM sessions WHERE username = ?", (username,)).rowcount
+    logger.info("Sessions of user %s invalidated (%d)", username, deleted)
+    return deleted
+
+# -----------------------------
+# Live sessions (statistics)
+# -----------------------------
+def count_sessions() -> int:
+    return get_read_db().execute("SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)).fetchone()[0]
@@ -1,10 +1,19 @@
 # backend/db/settings.py
 
 # Import standard modules
-from typing import Any, Dict, List
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
 
 # Import local modules
-from backend.db.db import get_db, register_init
+from backend.db.db import get_read_db, notify_change, register_init, transaction
+from backend.db.versions import get_versions
 from backend.utils import to_bool
 
 # Import Settings
@@ -36,6 +45,7 @@ TYPE_CASTERS = {
 
 # ---------------------------------------------------------
 # Default Values
+# (changes apply live through subscribe_config, unless flagged "restart": True)
 # ---------------------------------------------------------
 CONFIG_DEFAULTS = {
     "LANGUAGE": {
@@ -113,6 +123,42 @@ CONFIG_DEFAULTS = {
         "group_name": "network - dhcp",
         "type": "string",
     },
+    "DHCP4_SUBNETS": {
+        "value": settings.DHCP4_SUBNETS,
+        "description": "DHCPv4 subnets with their own reservations file (<subnet-id>:<cidr>, comma separated)",
+        "group_name": "network - dhcp",
+        "type": "string",
+    },
+    "KEA_CONTROL_URL": {
+        "value": settings.KEA_CONTROL_URL,
+        "description": "Kea control channel (unix:///path/to/socket or http://agent:8000/), empty to disable live updates",
+        "group_name": "network - dhcp",
+        "type": "string",
+    },
+    "KEA_SUBNET4_ID": {
+        "value": settings.KEA_SUBNET4_ID,
+        "description": "Kea subnet-id of the DHCPv4 reservations outside DHCP4_SUBNETS (0 = global reservations)",
+        "group_name": "network - dhcp",
+        "type": "integer",
+        "min": 0,
+        "max": 65535,
+    },
+    "REGEN_DEBOUNCE_SECONDS": {
+        "value": settings.REGEN_DEBOUNCE_SECONDS,
+        "description": "Quiet time before DNS/DHCP are regenerated after a data change (seconds)",
+        "group_name": "network",
+        "type": "integer",
+        "min": 0,
+        "max": 300,
+    },
+    "REGEN_MAX_DELAY_SECONDS": {
+        "value": settings.REGEN_MAX_DELAY_SECONDS,
+        "description": "Maximum delay before a pending DNS/DHCP regeneration is forced (seconds)",
+        "group_name": "network",
+        "type": "integer",
+        "min": 1,
+        "max": 3600,
+    },
     "BACKUP_PATH": {
         "value": settings.BACKUP_PATH,
         "description": "Directory path for storing backups",
@@ -145,10 +191,69 @@ CONFIG_DEFAULTS = {
     },
 }
 
+class ConfigSnapshot(NamedTuple):
+    """
+    Typed values of every config key as of one config version, shared by
+    all threads and replaced as a whole when another connection (or
+    process) commits a config change. Keys read as attributes or with get().
+    """
+    version: Optional[Tuple[int, int]]
+    values: Mapping[str, Any]
+    loaded_ms: float
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self.values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
 # ---------------------------------------------------------
 # Runtime cache to avoid repeated DB queries
 # ---------------------------------------------------------
-_config_cache = {}
+_snapshot: Optional[ConfigSnapshot] = None
+_stale = False
+_load_lock = threading.Lock()
+
+# PRAGMA data_version last seen by each thread (on its reader connection)
+_local = threading.local()
+
+_stats: Dict[str, Any] = {"loads": 0, "checks": 0, "last_load_ms": 0.0, "dispatches": 0}
+
+# Subscribers to config changes: (keys, func(changes)), changes = {key: (old, new)}
+CONFIG_SUBSCRIBERS: List[Tuple[FrozenSet[str], Callable[[Dict[str, Tuple[Any, Any]]], None]]] = []
+
+# Single thread running the subscribers of a change seen on an event loop (keeps their order)
+_dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config")
+
+# ---------------------------------------------------------
+# Subscribe to changes of the given config keys (decorator)
+# ---------------------------------------------------------
+def subscribe_config(*keys: str):
+    """
+    The subscriber runs once per new config snapshot in which some of its
+    keys changed, whichever process committed the change, and applies it
+    live (get_config() already returns the new values). It never runs on
+    the event loop, so it may block (file I/O, logging setup).
+    """
+    unknown = [k for k in keys if k not in CONFIG_DEFAULTS]
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(unknown)}")
+
+    def decorator(func):
+        unsubscribe_config(func)
+        CONFIG_SUBSCRIBERS.append((frozenset(keys), func))
+        return func
+
+    return decorator
+
+# ---------------------------------------------------------
+# Unsubscribe from config changes
+# ---------------------------------------------------------
+def unsubscribe_config(func) -> None:
+    CONFIG_SUBSCRIBERS[:] = [s for s in CONFIG_SUBSCRIBERS if s[1] is not func]
 
 # ---------------------------------------------------------
 # Internal: error response helper
@@ -206,6 +311,9 @@ def _expand_config_data(key, data: dict) -> dict:
     if cfg_default.get("allowed") is not None:
         data["allowed"] = cfg_default["allowed"]
 
+    # Applied live unless the key is flagged
+    data["restart_required"] = bool(cfg_default.get("restart"))
+
     # -------------------------
     # Type info (optional but useful)
     # -------------------------
@@ -213,21 +321,197 @@ def _expand_config_data(key, data: dict) -> dict:
 
     return data
 
+# ---------------------------------------------------------
+# Internal: cast a stored value to the type of its key
+# ---------------------------------------------------------
+def _cast(key, raw_value):
+    meta = CONFIG_DEFAULTS.get(key, {})
+    type_name = meta.get("type", "string")
+    caster = TYPE_CASTERS.get(type_name, str)
+    try:
+        return caster(raw_value)
+    except Exception:
+        return raw_value  # fallback safe
+
+# ---------------------------------------------------------
+# Internal: config version (database epoch, config counter)
+# ---------------------------------------------------------
+def _config_version(conn: sqlite3.Connection) -> Optional[Tuple[int, int]]:
+    try:
+        versions = get_versions(("config",), conn=conn)
+    except sqlite3.OperationalError as err:
+        # Startup, before the data_versions migration
+        if "no such table" not in str(err):
+            raise
+        return None
+    if "config" not in versions:
+        return None
+    return versions.get("*", 0), versions["config"]
+
+# ---------------------------------------------------------
+# Internal: load every key in one query
+# ---------------------------------------------------------
+def _load(conn: sqlite3.Connection) -> ConfigSnapshot:
+    start_ns = time.monotonic_ns()
+
+    # Version first: a change committed in between only costs one more load
+    version = _config_version(conn)
+    stored = dict(conn.execute("SELECT key, value FROM config").fetchall())
+
+    values = {}
+    for key in CONFIG_DEFAULTS:
+        if key in stored:
+            values[key] = _cast(key, stored[key])
+        else:
+            values[key] = getattr(settings, key, None)
+            logger.warning("Config key not found in database: %s (using default: %s)", key, values[key])
+
+    loaded_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+    return ConfigSnapshot(version=version, values=MappingProxyType(values), loaded_ms=loaded_ms)
+
+# ---------------------------------------------------------
+# Internal: call the subscribers of the changed keys (blocking)
+# ---------------------------------------------------------
+def _notify(changed: Dict[str, Tuple[Any, Any]]) -> None:
+    for keys, func in list(CONFIG_SUBSCRIBERS):
+        changes = {k: v for k, v in changed.items() if k in keys}
+        if not changes:
+            continue
+        try:
+            func(changes)
+        except Exception as err:
+            logger.error(f"CONFIG: Subscriber {func.__qualname__} failed for {', '.join(changes)} - {err}")
+
+# ---------------------------------------------------------
+# Internal: dispatch a new snapshot (inline, or on the config thread from an event loop)
+# ---------------------------------------------------------
+def _dispatch(old: ConfigSnapshot, new: ConfigSnapshot) -> None:
+    changed = {
+        key: (old.values.get(key), value)
+        for key, value in new.values.items()
+        if old.values.get(key) != value
+    }
+    if not changed:
+        return
+
+    _stats["dispatches"] += 1
+    logger.info(f"CONFIG: {', '.join(sorted(changed))} changed, applying")
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Worker thread or background job: apply before returning
+        _notify(changed)
+        return
+    _dispatcher.submit(_notify, changed)
+
+# ---------------------------------------------------------
+# Internal: PRAGMA data_version of this thread reader (moves on commits of other connections)
+# ---------------------------------------------------------
+def _seen(conn: sqlite3.Connection) -> Tuple[sqlite3.Connection, int]:
+    return conn, conn.execute("PRAGMA data_version;").fetchone()[0]
+
+def _is_current(snap: Optional[ConfigSnapshot], version: Optional[Tuple[int, int]]) -> bool:
+    return not _stale and snap is not None and version is not None and snap.version == version
+
+# ---------------------------------------------------------
+# Internal: reload the snapshot and call the subscribers (blocking)
+# ---------------------------------------------------------
+def _reload() -> ConfigSnapshot:
+    global _snapshot, _stale
+
+    conn = get_read_db()
+    previous = None
+    # One load at a time, concurrent callers reuse its result
+    with _load_lock:
+        snap = _snapshot
+        if not _is_current(snap, _config_version(conn)):
+            previous = snap
+            _stale = False
+            snap = _load(conn)
+            _snapshot = snap
+            _stats["loads"] += 1
+            _stats["last_load_ms"] = snap.loaded_ms
+            logger.debug(f"CONFIG: {len(snap.values)} keys loaded in {snap.loaded_ms:.2f} ms")
+
+    # Subscribers see the new snapshot through get_config()
+    if previous is not None:
+        _dispatch(previous, snap)
+    return snap
+
+# ---------------------------------------------------------
+# Current config snapshot (reloaded when the config version changed)
+# ---------------------------------------------------------
+def get_config_snapshot() -> ConfigSnapshot:
+    """
+    PRAGMA data_version of the thread reader only moves when another
+    connection commits, so an unchanged value skips the version lookup.
+    Called once per request and per background job; get_config() reads
+    the snapshot without touching the database.
+    """
+    conn = get_read_db()
+    seen = _seen(conn)
+    snap = _snapshot
+    if snap is not None and not _stale and getattr(_local, "seen", None) == seen:
+        return snap
+
+    _stats["checks"] += 1
+    if not _is_current(snap, _config_version(conn)):
+        snap = _reload()
+
+    _local.seen = seen
+    return snap
+
+# ---------------------------------------------------------
+# Check the config version (start of a request or job)
+# ---------------------------------------------------------
+def refresh_config() -> None:
+    get_config_snapshot()
+
+# ---------------------------------------------------------
+# Check the config version from the event loop
+# ---------------------------------------------------------
+async def refresh_config_async() -> None:
+    """
+    Same checks as get_config_snapshot(), PRAGMA data_version and the
+    version lookup inline (microseconds); a reload and the subscribers
+    it triggers run in the threadpool, not on the event loop.
+    """
+    conn = get_read_db()
+    seen = _seen(conn)
+    snap = _snapshot
+    if snap is not None and not _stale and getattr(_local, "seen", None) == seen:
+        return
+
+    _stats["checks"] += 1
+    if not _is_current(snap, _config_version(conn)):
+        await run_in_threadpool(_reload)
+
+    # The reload read at least up to the data_version seen here
+    _local.seen = seen
+
 # ---------------------------------------------------------
 # Clear cache
 # ---------------------------------------------------------
 def clear_cache(key=None):
-    """Clear cached config entry (or full cache)."""
-    if key:
-        _config_cache.pop(key, None)
-    else:
-        _config_cache.clear()
+    """Mark the config snapshot stale (reloaded on next check)."""
+    global _stale
+    _stale = True
+
+# ---------------------------------------------------------
+# Config cache statistics
+# ---------------------------------------------------------
+def get_stats() -> Dict[str, Any]:
+    snap = _snapshot
+    return {
+        **_stats,
+        "version": list(snap.version) if snap and snap.version else None,
+    }
 
 # -----------------------------
 # Return the list of configs
 # -----------------------------
 def get_configs() -> List[Dict[str, Any]]:
-    conn = get_db()
+    conn = get_read_db()
     query = (
         "SELECT * FROM config"
     )
@@ -254,7 +538,7 @@ def get_config(key, json_format: bool = False):
 
     # ---- JSON format (no cache, no type casting) ----
     if json_format:
-        conn = get_db()
+        conn = get_read_db()
         cur = conn.execute("SELECT * FROM config WHERE key = ?", (key,))
         row = cur.fetchone()
 
@@ -277,36 +561,11 @@ def get_config(key, json_format: bool = False):
 
         return data
 
-    # ---- Cache hit ----
-    if key in _config_cache:
-        return _config_cache[key]
-
-    # ---- Read from DB ----
-    conn = get_db()
-    cur = conn.execute("SELECT value FROM config WHERE key = ?", (key,))
-    row = cur.fetchone()
-
-    if not row:
-        value = getattr(settings, key, None)
-        logger.warning("Config key not found in database: %s (using default: %s)", key, value)
-        _config_cache[key] = value
-        return value
-
-    raw_value = row["value"]
-
-    # ---- Type casting ----
-    meta = CONFIG_DEFAULTS.get(key, {})
-    type_name = meta.get("type", "string")
-    caster = TYPE_CASTERS.get(type_name, str)
-    try:
-        value = caster(raw_value)
-    except Exception:
-        value = raw_value  # fallback safe
-
-    # ---- Save in cache ----
-    _config_cache[key] = value
-
-    return value
+    # ---- Snapshot (typed, checked once per request) ----
+    snap = _snapshot
+    if snap is None:
+        snap = get_config_snapshot()
+    return snap.values[key]
 
 # ---------------------------------------------------------
 # Return a specific config value or default
@@ -323,8 +582,6 @@ def update_config(key, value=None, reset_to_default=False, json_format=False):
     # Initialization
     meta = CONFIG_DEFAULTS.get(key, {})
 
-    conn = get_db()
-
     # JSON input
     if json_format and not reset_to_default:
         if not isinstance(value, dict) or "value" not in value:
@@ -358,43 +615,43 @@ def update_config(key, value=None, reset_to_default=False, json_format=False):
         return _error(f"Value above maximum for {key}: {value}", json_format=json_format)
 
     try:
-        cur = conn.cursor()
-
-        # Check existence
-        cur.execute("SELECT value FROM config WHERE key = ?", (key,))
-        row = cur.fetchone()
-        if not row:
-            return _error(f"Config key not found: {key}", "CONFIG_NOT_FOUND", json_format=json_format)
-
-        current_value = row["value"]
-        str_value = str(value)
-
-        # Skip if unchanged
-        if current_value == str_value:
-            if json_format:
-                return {"code": "CONFIG_UNCHANGED", "status": "success"}
-            else:
-                return True
-
-        # Update
-        cur.execute("""
-            UPDATE config
-            SET value = ?, last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
-            WHERE key = ?
-        """, (str_value, key))
-
-        conn.commit()
-
-        # cache invalidation
+        with transaction() as conn:
+            cur = conn.cursor()
+
+            # Check existence
+            cur.execute("SELECT value FROM config WHERE key = ?", (key,))
+            row = cur.fetchone()
+            if not row:
+                return _error(f"Config key not found: {key}", "CONFIG_NOT_FOUND", json_format=json_format)
+
+            current_value = row["value"]
+            str_value = str(value)
+
+            # Skip if unchanged
+            if current_value == str_value:
+                if json_format:
+                    return {"code": "CONFIG_UNCHANGED", "status": "success"}
+                else:
+                    return True
+
+            # Update
+            cur.execute("""
+                UPDATE config
+                SET value = ?, last_updated=strftime('%Y-%m-%dT%H:%M:%SZ','now')
+                WHERE key = ?
+            """, (str_value, key))
+            notify_change("config")
+
+        # Reload now: the subscribers apply the change before returning
         clear_cache(key)
+        get_config_snapshot()
 
         if json_format:
-            return {"code": "CONFIG_UPDATED", "status": "success"}
+            return {"code": "CONFIG_UPDATED", "status": "success", "restart_required": bool(meta.get("restart"))}
         else:
             return True
 
     except Exception as err:
-        conn.rollback()
         logger.error(f"CONFIG DB: Error updating config - {err}")
         raise
 
@@ -0,0 +1,123 @@
+# backend/db/snapshot.py
+
+# Import standard modules
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+# Import local modules
+from backend.db.db import get_read_db, read_snapshot
+from backend.db.hosts import get_hosts
+from backend.db.aliases import get_aliases
+from backend.db.versions import get_versions
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Data versions the snapshot depends on
+SNAPSHOT_TABLES = ("hosts", "aliases")
+
+class Snapshot(NamedTuple):
+    """
+    Hosts and aliases as of one committed data version, shared by every
+    reader. Rows are ordered as get_hosts() / get_aliases() and must be
+    treated as read-only: copy a row before changing it.
+    """
+    version: Tuple[Tuple[str, int], ...]
+    hosts: Tuple[Dict[str, Any], ...]
+    aliases: Tuple[Dict[str, Any], ...]
+    hosts_by_id: Mapping[int, Dict[str, Any]]
+    hosts_by_name: Mapping[str, Dict[str, Any]]
+    hosts_by_ipv4: Mapping[str, Dict[str, Any]]
+    hosts_by_mac: Mapping[str, Dict[str, Any]]
+    aliases_by_id: Mapping[int, Dict[str, Any]]
+    aliases_by_name: Mapping[str, Dict[str, Any]]
+    built_ms: float
+
+# Current snapshot (replaced as a whole, never modified)
+_snapshot: Optional[Snapshot] = None
+_build_lock = threading.Lock()
+_stats: Dict[str, Any] = {"builds": 0, "hits": 0, "last_build_ms": 0.0}
+
+# -----------------------------
+# Internal: version key of the snapshot tables
+# -----------------------------
+def _version(conn: sqlite3.Connection) -> Tuple[Tuple[str, int], ...]:
+    return tuple(sorted(get_versions(SNAPSHOT_TABLES, conn=conn).items()))
+
+# -----------------------------
+# Internal: index of rows by a column (first row wins, empty values skipped)
+# -----------------------------
+def _index(rows: Tuple[Dict[str, Any], ...], column: str) -> Mapping[Any, Dict[str, Any]]:
+    index: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        key = row.get(column)
+        if key is not None and key != "" and key not in index:
+            index[key] = row
+    return MappingProxyType(index)
+
+# -----------------------------
+# Internal: build a snapshot from one read transaction
+# -----------------------------
+def _build() -> Snapshot:
+    start_ns = time.monotonic_ns()
+    with read_snapshot() as conn:
+        version = _version(conn)
+        hosts = tuple(get_hosts(conn=conn))
+        aliases = tuple(get_aliases(conn=conn))
+
+    built_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+    return Snapshot(
+        version=version,
+        hosts=hosts,
+        aliases=aliases,
+        hosts_by_id=_index(hosts, "id"),
+        hosts_by_name=_index(hosts, "name"),
+        hosts_by_ipv4=_index(hosts, "ipv4"),
+        hosts_by_mac=_index(hosts, "mac"),
+        aliases_by_id=_index(aliases, "id"),
+        aliases_by_name=_index(aliases, "name"),
+        built_ms=built_ms,
+    )
+
+# -----------------------------
+# Current snapshot (rebuilt on first use after a write)
+# -----------------------------
+def get_snapshot() -> Snapshot:
+    global _snapshot
+
+    version = _version(get_read_db())
+    snap = _snapshot
+    if snap is not None and snap.version == version:
+        _stats["hits"] += 1
+        return snap
+
+    # One build at a time, concurrent readers reuse its result
+    with _build_lock:
+        snap = _snapshot
+        if snap is not None and snap.version == version:
+            _stats["hits"] += 1
+            return snap
+
+        snap = _build()
+        _snapshot = snap
+        _stats["builds"] += 1
+        _stats["last_build_ms"] = snap.built_ms
+        logger.debug(f"SNAPSHOT: {len(snap.hosts)} hosts, {len(snap.aliases)} aliases built in {snap.built_ms:.1f} ms")
+        return snap
+
+# -----------------------------
+# Snapshot statistics
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    snap = _snapshot
+    return {
+        **_stats,
+        "hosts": len(snap.hosts) if snap else 0,
+        "aliases": len(snap.aliases) if snap else 0,
+    }
@@ -5,7 +5,7 @@ import bcrypt
 import json
 
 # Import local modules
-from backend.db.db import get_db, register_init
+from backend.db.db import get_read_db, register_init, transaction
 
 # Import Settings
 from backend.settings.settings import settings
@@ -27,7 +27,7 @@ def hash_password(password: str) -> str:
 # Get User from DB by username
 # -----------------------------
 def get_user_by_username(username):
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.cursor()
     cur.execute("SELECT * FROM users WHERE username = ?", (username,))
     row = cur.fetchone()
@@ -37,26 +37,23 @@ def get_user_by_username(username):
 # Create User
 # -----------------------------
 def create_user(username, password_hash, email=None, is_admin=0, modules=None):
-    conn = get_db()
-    cur = conn.cursor()
-
     try:
-        cur.execute("""
-            INSERT INTO users (
-                username, password_hash, email, is_admin, modules, status,
-                created_at, updated_at, password_changed_at
-            ) VALUES (?, ?, ?, ?, ?, 'active', strftime('%s','now'), strftime('%s','now'), strftime('%s','now'));
-        """, (
-            username,
-            password_hash,
-            email,
-            is_admin,
-            json.dumps(modules or [])
-        ))
-        conn.commit()
+        with transaction() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO users (
+                    username, password_hash, email, is_admin, modules, status,
+                    created_at, updated_at, password_changed_at
+                ) VALUES (?, ?, ?, ?, ?, 'active', strftime('%s','now'), strftime('%s','now'), strftime('%s','now'));
+            """, (
+                username,
+                password_hash,
+                email,
+                is_admin,
+                json.dumps(modules or [])
+            ))
         return cur.lastrowid
     except Exception as err:
-        conn.rollback()
         logger.error(f"USERS DB: Error creating user - {err}")
         raise
 
@@ -0,0 +1,72 @@
+# backend/db/versions.py
+
+# Import standard modules
+import secrets
+import sqlite3
+from typing import Dict, Iterable, Optional
+
+# Import local modules
+from backend.db.db import get_read_db, register_commit_hook, register_migration
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Tables with a change counter (bumped once by every transaction writing them)
+VERSIONED_TABLES = ("hosts", "aliases", "config")
+
+# Row holding the random id of this database (a recreated database never reuses a version)
+EPOCH_ROW = "*"
+
+# -----------------------------
+# Current versions of the given tables (plus the database epoch)
+# -----------------------------
+def get_versions(tables: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+    conn = conn or get_read_db()
+    names = [EPOCH_ROW, *tables]
+    cur = conn.execute(
+        f"SELECT name, version FROM data_versions WHERE name IN ({', '.join('?' * len(names))})",
+        names,
+    )
+    return {r[0]: r[1] for r in cur.fetchall()}
+
+# -----------------------------
+# Migration: data_versions table and its triggers
+# -----------------------------
+@register_migration("data_versions")
+def migrate_data_versions(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+        """
+    )
+    cur.execute(
+        "INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, ?);",
+        (EPOCH_ROW, secrets.randbits(62)),
+    )
+
+    for table in VERSIONED_TABLES:
+        cur.execute("INSERT OR IGNORE INTO data_versions (name) VALUES (?);", (table,))
+
+# -----------------------------
+# Commit hook: bump the counters of the tables notified in the transaction
+# -----------------------------
+@register_commit_hook
+def bump_versions(conn: sqlite3.Connection, tables: Iterable[str]) -> None:
+    names = [t for t in tables if t in VERSIONED_TABLES]
+    if not names:
+        return
+    try:
+        conn.execute(
+            f"UPDATE data_versions SET version = version + 1 WHERE name IN ({', '.join('?' * len(names))})",
+            names,
+        )
+    except sqlite3.OperationalError as err:
+        # Writes of the startup migrations, before data_versions exists
+        if "no such table" not in str(err):
+            raise
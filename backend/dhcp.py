@@ -0,0 +1,457 @@
+# backend/dhcp.py
+
+# import standard modules
+import bisect
+import ipaddress
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Import local modules
+from backend.db.hosts import ReservationRecord
+from backend.kea import (
+    KeaControlError,
+    diff_reservations,
+    get_client,
+    push_reservation_delta,
+    read_reservations,
+    reload_config,
+    reservation_digests,
+)
+from backend.utils import StagedFile, StagedRemoval, atomic_write, ipv4_to_int
+
+# Import Config
+from backend.db.settings import get_config
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Indentation of a reservation inside the "reservations" list
+# (same layout json.dumps(..., indent=4) gives to {"reservations": [...]})
+RESERVATION_INDENT = " " * 8
+
+# ---------------------------------------------------------
+# Kea reservation entries
+# ---------------------------------------------------------
+def kea4_entries(rows: Iterable[ReservationRecord]) -> Iterable[Dict[str, Any]]:
+    for r in rows:
+        yield {
+            "hw-address": r.mac,
+            "ip-address": r.ip,
+            "hostname": r.name,
+        }
+
+def kea6_entries(rows: Iterable[ReservationRecord]) -> Iterable[Dict[str, Any]]:
+    for r in rows:
+        yield {
+            "duid": r.mac,
+            "ip-addresses": r.ip,
+            "hostname": r.name,
+        }
+
+# ---------------------------------------------------------
+# Streaming writer of a '"reservations": [...]' include file
+# ---------------------------------------------------------
+class ReservationWriter(StagedFile):
+    """
+    Stages the reservations fragment entry by entry; close() finishes the
+    fragment before the file is committed or discarded.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path, kind="kea")
+        self.write('"reservations": [')
+
+    def add(self, entry: Dict[str, Any]):
+        body = json.dumps(entry, indent=4, ensure_ascii=False)
+        self.write((",\n" if self.count else "\n") + RESERVATION_INDENT + body.replace("\n", "\n" + RESERVATION_INDENT))
+        self.count += 1
+
+    def close(self) -> str:
+        if not self._f.closed:
+            self.write("\n    ]\n" if self.count else "]\n")
+        return super().close()
+
+# ---------------------------------------------------------
+# Entries of a reservations fragment, read back one at a time
+# ---------------------------------------------------------
+def iter_fragment_entries(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Parses a file written by ReservationWriter without loading it whole:
+    every entry starts at a RESERVATION_INDENT + "{" line and ends at the
+    matching "}" line. Raises ValueError on any other layout.
+    """
+    start, end = RESERVATION_INDENT + "{", RESERVATION_INDENT + "}"
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline().rstrip("\n")
+        if header == '"reservations": []':
+            if f.read().strip():
+                raise ValueError("unexpected content after the reservations list")
+            return
+        if header != '"reservations": [':
+            raise ValueError("missing reservations list")
+
+        # entry: an entry starts next, end: the list closes next, done: closed
+        entry: List[str] = []
+        state = "entry"
+        for n, line in enumerate(f, start=2):
+            line = line.rstrip("\n")
+            if entry:
+                entry.append(line)
+                if line in (end, end + ","):
+                    yield json.loads("\n".join(entry).rstrip(","))
+                    state = "entry" if line.endswith(",") else "end"
+                    entry = []
+            elif state == "entry" and line == start:
+                entry.append(line)
+            elif state == "end" and line == "    ]":
+                state = "done"
+            elif state != "done" or line.strip():
+                raise ValueError(f"line {n}: invalid reservations layout")
+
+        if state != "done":
+            raise ValueError("unterminated reservations list")
+
+# ---------------------------------------------------------
+# DHCPv4 subnets (DHCP4_SUBNETS = "<subnet-id>:<cidr>,...")
+# ---------------------------------------------------------
+def parse_subnets(value: Optional[str]) -> List[Tuple[int, ipaddress.IPv4Network]]:
+    subnets = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            subnet_id, cidr = item.split(":", 1)
+            subnets.append((int(subnet_id), ipaddress.IPv4Network(cidr.strip(), strict=False)))
+        except ValueError:
+            raise ValueError(f"Invalid DHCP4_SUBNETS entry (expected <subnet-id>:<cidr>): {item}")
+    ids = [subnet_id for subnet_id, _ in subnets]
+    if len(ids) != len(set(ids)):
+        raise ValueError("Duplicate subnet-id in DHCP4_SUBNETS")
+    return subnets
+
+# ---------------------------------------------------------
+# Shard include file of a subnet (hosts-ipv4.json -> hosts-ipv4-subnet-<id>.json)
+# ---------------------------------------------------------
+def shard_path(base: Path, subnet_id: int) -> Path:
+    return base.with_name(f"{base.stem}-subnet-{subnet_id}{base.suffix}")
+
+def is_shard_name(base: Path, name: str) -> bool:
+    return name.startswith(f"{base.stem}-subnet-") and name.endswith(base.suffix) and "/" not in name
+
+def manifest_path(base: Path) -> Path:
+    return base.with_name(f"{base.stem}.manifest.json")
+
+# Digest of the shard content the running Kea holds (hosts-ipv4.kea-state.json)
+def kea_state_path(base: Path) -> Path:
+    return base.with_name(f"{base.stem}.kea-state.json")
+
+# ---------------------------------------------------------
+# Internal: read the shard manifest (file name -> digest)
+# ---------------------------------------------------------
+def _read_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("shards", {})
+    except (OSError, ValueError):
+        return {}
+
+# ---------------------------------------------------------
+# Shard digests of the manifest (file name -> sha256)
+# ---------------------------------------------------------
+def read_manifest_digests(base: Path) -> Dict[str, Optional[str]]:
+    return {name: meta.get("sha256") for name, meta in _read_manifest(manifest_path(base)).items()}
+
+# ---------------------------------------------------------
+# Shard files a manifest lists (path, subnet-id), the base file included
+# ---------------------------------------------------------
+def read_manifest_shards(path: Path, base: Path) -> List[Tuple[Path, int]]:
+    shards = []
+    for name, meta in _read_manifest(path).items():
+        if name == base.name or is_shard_name(base, name):
+            shards.append((base.with_name(name), meta.get("subnet_id") or 0))
+    return shards
+
+# ---------------------------------------------------------
+# Kea sync state (file name -> digest of the content Kea holds, None: out of sync)
+# ---------------------------------------------------------
+def read_kea_state(base: Path) -> Dict[str, Optional[str]]:
+    try:
+        with open(kea_state_path(base), "r", encoding="utf-8") as f:
+            return json.load(f).get("shards", {})
+    except (OSError, ValueError):
+        return {}
+
+def _write_kea_state(base: Path, state: Dict[str, Optional[str]]) -> None:
+    with atomic_write(kea_state_path(base)) as f:
+        json.dump({"shards": state}, f, ensure_ascii=False, indent=2)
+
+# ---------------------------------------------------------
+# Internal: locate the shard of an address (sorted, non-overlapping ranges)
+# ---------------------------------------------------------
+class _ShardIndex:
+    def __init__(self, subnets: List[Tuple[int, ipaddress.IPv4Network]]):
+        ranges = sorted(
+            (int(net.network_address), int(net.broadcast_address), subnet_id)
+            for subnet_id, net in subnets
+        )
+        for prev, cur in zip(ranges, ranges[1:]):
+            if cur[0] <= prev[1]:
+                raise ValueError(f"Overlapping DHCP4_SUBNETS entries: subnet-id {prev[2]} and {cur[2]}")
+        self._starts = [r[0] for r in ranges]
+        self._ranges = ranges
+
+    def find(self, ip: str) -> Optional[int]:
+        value = ipv4_to_int(ip)
+        if value is None:
+            return None
+        i = bisect.bisect_right(self._starts, value) - 1
+        if i >= 0 and value <= self._ranges[i][1]:
+            return self._ranges[i][2]
+        return None
+
+# ---------------------------------------------------------
+# Reservations of a shard file, when the running Kea holds that content
+# ---------------------------------------------------------
+def kea_previous(path: Path, digest: Optional[str], state: Dict[str, Optional[str]]) -> Optional[Dict[str, bytes]]:
+    """
+    digest is the sha256 of the file (manifest). Returns the identifier ->
+    digest map of its reservations (streamed, not the entries), or None
+    when Kea may hold something else (failed or partial push, no sync
+    recorded yet): a delta against the file would miss what Kea never
+    received.
+    """
+    if digest is None or state.get(path.name) != digest:
+        return None
+    try:
+        return reservation_digests(read_reservations(path))
+    except (OSError, ValueError) as err:
+        logger.warning("Kea: unable to parse reservations file %s - %s", path, err)
+        return None
+
+# ---------------------------------------------------------
+# Bring the running Kea server in line with the DHCPv4 shard files
+# ---------------------------------------------------------
+def kea_sync(base: Path, shards: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    shards: path, subnet_id, sha256 (content of the file now), previous
+    (reservations Kea holds, from kea_previous, or None) and current
+    (function streaming the reservations of the file now). Shards Kea
+    already holds are left alone, the others get their delta; without a
+    usable previous content or when the push fails, one config-reload
+    makes Kea load the files. The digest Kea holds is recorded per shard,
+    so a shard left out of sync is retried at the next apply. Returns the
+    result per file name.
+    """
+    url = get_config("KEA_CONTROL_URL")
+    if not url:
+        return {shard["path"].name: {"status": "disabled"} for shard in shards}
+
+    client = get_client(url, "dhcp4")
+    state = read_kea_state(base)
+    results: Dict[str, Dict[str, Any]] = {}
+    stale: List[Dict[str, Any]] = []
+
+    for shard in shards:
+        name = shard["path"].name
+        if shard["sha256"] is not None and state.get(name) == shard["sha256"]:
+            results[name] = {"status": "unchanged", "added": 0, "deleted": 0, "updated": 0}
+            continue
+        if shard["previous"] is None:
+            stale.append(shard)
+            continue
+
+        try:
+            delta = diff_reservations(shard["previous"], shard["current"]())
+            result = push_reservation_delta(client, delta, subnet_id=shard["subnet_id"])
+        except (KeaControlError, OSError, ValueError) as err:
+            result = {"status": "failure", "errors": [str(err)]}
+        results[name] = result
+
+        if result["status"] == "success":
+            state[name] = shard["sha256"]
+        else:
+            # Kea now holds neither the old nor the new content
+            logger.warning("Kea live update of %s failed, reloading the configuration: %s", name, result["errors"])
+            state[name] = None
+            stale.append(shard)
+
+    if stale:
+        try:
+            reload = reload_config(client)
+        except KeaControlError as err:
+            reload = {"status": "failure", "errors": [str(err)]}
+        if reload["status"] != "success":
+            logger.warning("Kea config-reload failed, %d shard(s) out of sync until the next apply: %s", len(stale), reload["errors"])
+
+        for shard in stale:
+            name = shard["path"].name
+            state[name] = shard["sha256"] if reload["status"] == "success" else None
+            result = {"status": reload["status"], "reload": reload}
+            if name in results:
+                result["push"] = results[name]
+            results[name] = result
+
+    # Shards no longer written (subnet removed): nothing Kea holds can be assumed
+    names = {shard["path"].name for shard in shards}
+    state = {name: digest for name, digest in state.items() if name in names}
+
+    try:
+        _write_kea_state(base, state)
+    except OSError as err:
+        logger.error("Kea: unable to record the sync state - %s", err)
+
+    return results
+
+# ---------------------------------------------------------
+# Stage DHCPv4 reservations, sharded per subnet
+# ---------------------------------------------------------
+def dhcp4_stage(rows: Iterable[ReservationRecord]) -> Dict[str, Any]:
+
+    # Initialization
+    base = Path(get_config("DHCP4_HOST_FILE"))
+    subnets = parse_subnets(get_config("DHCP4_SUBNETS"))
+    index = _ShardIndex(subnets)
+    live = bool(get_config("KEA_CONTROL_URL"))
+    manifest_file = manifest_path(base)
+    manifest = _read_manifest(manifest_file)
+    kea_state = read_kea_state(base) if live else {}
+
+    # One shard per configured subnet + the base file for everything else
+    shards: Dict[Optional[int], Dict[str, Any]] = {
+        None: {"path": base, "subnet": None, "subnet_id": get_config("KEA_SUBNET4_ID") or 0},
+    }
+    for subnet_id, net in subnets:
+        shards[subnet_id] = {"path": shard_path(base, subnet_id), "subnet": str(net), "subnet_id": subnet_id}
+
+    # Shards of subnets no longer in DHCP4_SUBNETS: deleted with the commit
+    configured = {shard["path"].name for shard in shards.values()}
+    removed = [
+        StagedRemoval(base.with_name(name))
+        for name in manifest
+        if name not in configured and is_shard_name(base, name) and base.with_name(name).is_file()
+    ]
+
+    manifest_writer = None
+    try:
+        for shard in shards.values():
+            shard["previous"] = None
+            shard["writer"] = ReservationWriter(shard["path"])
+
+        # Stream the rows into their shard
+        for entry in kea4_entries(rows):
+            shard = shards[index.find(entry["ip-address"])] if subnets else shards[None]
+            shard["writer"].add(entry)
+
+        # Only the shards whose content changed have to be committed
+        for shard in shards.values():
+            writer = shard["writer"]
+            digest = writer.close()
+            name = shard["path"].name
+            writer.changed = not (shard["path"].is_file() and manifest.get(name, {}).get("sha256") == digest)
+            if writer.changed and live:
+                # Content Kea holds, to compute the delta pushed after the commit
+                shard["previous"] = kea_previous(shard["path"], manifest.get(name, {}).get("sha256"), kea_state)
+
+        # Stage the manifest
+        manifest_writer = StagedFile(manifest_file, kind="json")
+        manifest_writer.write(json.dumps({
+            "shards": {
+                shard["path"].name: {
+                    "subnet": shard["subnet"],
+                    "subnet_id": shard["subnet_id"],
+                    "count": shard["writer"].count,
+                    "sha256": shard["writer"].sha256,
+                }
+                for shard in shards.values()
+            },
+        }, ensure_ascii=False, indent=2))
+        manifest_writer.close()
+
+    except BaseException:
+        # Only the writers created before the failure
+        for shard in shards.values():
+            if "writer" in shard:
+                shard["writer"].discard()
+        if manifest_writer is not None:
+            manifest_writer.discard()
+        raise
+
+    return {
+        "base": base,
+        "live": live,
+        "shards": list(shards.values()),
+        "removed": removed,
+        # Include files first, the manifest describing them last
+        "files": [shard["writer"] for shard in shards.values()] + removed + [manifest_writer],
+    }
+
+# ---------------------------------------------------------
+# Push the changed DHCPv4 shards to Kea (after the commit)
+# ---------------------------------------------------------
+def dhcp4_push(stage: Dict[str, Any]) -> Dict[str, Any]:
+
+    results = []
+    for shard in stage["shards"]:
+        writer = shard["writer"]
+        item = {
+            "file": str(shard["path"]),
+            "subnet": shard["subnet"],
+            "subnet_id": shard["subnet_id"],
+            "count": writer.count,
+            "changed": writer.changed,
+        }
+        results.append(item)
+
+    for f in stage["removed"]:
+        logger.warning("DHCPv4 shard %s removed (subnet no longer in DHCP4_SUBNETS): drop its include from the Kea configuration", f.path.name)
+
+    # Every shard, changed or not: one left out of sync by a failed push is retried
+    if stage["live"]:
+        kea = kea_sync(stage["base"], [
+            {
+                "path": shard["path"],
+                "subnet_id": shard["subnet_id"],
+                "sha256": shard["writer"].sha256,
+                "previous": shard["previous"],
+                # The committed fragment, read back entry by entry
+                "current": lambda path=shard["path"]: read_reservations(path),
+            }
+            for shard in stage["shards"]
+        ])
+        for item, shard in zip(results, stage["shards"]):
+            item["kea"] = kea[shard["path"].name]
+
+    return {
+        "count": sum(item["count"] for item in results),
+        "changed": [item["file"] for item in results if item["changed"]],
+        "shards": results,
+        "removed": [str(f.path) for f in stage["removed"]],
+    }
+
+# ---------------------------------------------------------
+# Stage DHCPv6 reservations
+# ---------------------------------------------------------
+def dhcp6_stage(rows: Iterable[ReservationRecord]) -> ReservationWriter:
+    writer = ReservationWriter(Path(get_config("DHCP6_HOST_FILE")))
+    try:
+        for entry in kea6_entries(rows):
+            writer.add(entry)
+        writer.close()
+    except BaseException:
+        writer.discard()
+        raise
+    return writer
+
+# ---------------------------------------------------------
+# DHCPv4 include files of the current configuration (shards + manifest)
+# ---------------------------------------------------------
+def dhcp4_outputs() -> List[Tuple[Path, int]]:
+    base = Path(get_config("DHCP4_HOST_FILE"))
+    outputs = [(base, get_config("KEA_SUBNET4_ID") or 0)]
+    for subnet_id, _ in parse_subnets(get_config("DHCP4_SUBNETS")):
+        outputs.append((shard_path(base, subnet_id), subnet_id))
+    return outputs
@@ -0,0 +1,139 @@
+# backend/dns.py
+
+# import standard modules
+from pathlib import Path
+from typing import Iterable, List
+
+# Import local modules
+from backend.db.aliases import AliasRecord
+from backend.db.hosts import HostRecord
+from backend.utils import StagedFile
+
+# Import Config
+from backend.db.settings import get_config
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------
+# External view file (DNS_HOST_FILE + "_ext")
+# ---------------------------------------------------------
+def external_path() -> Path:
+    path = Path(get_config("DNS_HOST_FILE"))
+    return path.with_name(path.name + "_ext")
+
+# ---------------------------------------------------------
+# Internal: stage the files written by func, dropped on error
+# ---------------------------------------------------------
+def _stage(paths: List[Path], func) -> List[StagedFile]:
+    files = [StagedFile(p, kind="dns") for p in paths]
+    try:
+        func(*files)
+        for f in files:
+            f.close()
+    except BaseException:
+        for f in files:
+            f.discard()
+        raise
+    return files
+
+# ---------------------------------------------------------
+# Stage the internal view (hosts, reverse, aliases)
+# ---------------------------------------------------------
+def dns_stage_internal(hosts: Iterable[HostRecord], aliases: Iterable[AliasRecord]) -> List[StagedFile]:
+
+    def render(hosts_file, reverse_file, aliases_file):
+        domain = get_config("DOMAIN")
+
+        # DNS Hosts and Reverse Configuration (one pass over the hosts)
+        for h in hosts:
+            name   = h.name.ljust(20)
+            rtype  = "A".ljust(8)
+            target = h.ipv4
+            line = f"{name} IN {rtype} {target}\n"
+            hosts_file.write(line)
+            hosts_file.count += 1
+
+            ip = h.ipv4
+            if ip:
+                parts  = ip.split(".")
+                rev    = f"{parts[-1]}.{parts[-2]}"
+                ip     = rev.ljust(20)
+                rtype  = "PTR".ljust(8)
+                target = h.name + "." + domain
+                line = f"{ip} IN {rtype} {target}\n"
+                reverse_file.write(line)
+                reverse_file.count += 1
+
+        # DNS Aliases Configuration
+        for a in aliases:
+            name   = a.name.ljust(20)
+            rtype  = "CNAME".ljust(8)
+            target = a.target
+            line = f"{name} IN {rtype} {target}\n"
+            aliases_file.write(line)
+            aliases_file.count += 1
+
+    return _stage([
+        Path(get_config("DNS_HOST_FILE")),
+        Path(get_config("DNS_REVERSE_FILE")),
+        Path(get_config("DNS_ALIAS_FILE")),
+    ], render)
+
+# ---------------------------------------------------------
+# Stage the external view (hosts and aliases for the EXT DNS)
+# ---------------------------------------------------------
+def dns_stage_external(hosts: Iterable[HostRecord], aliases: Iterable[AliasRecord]) -> List[StagedFile]:
+
+    # Get Ext_Cname
+    ext_cname = get_config("EXTERNAL_NAME")
+
+    def render(f):
+        domain = get_config("DOMAIN")
+
+        for h in hosts:
+            name   = h.name.ljust(20)
+            vis = h.visibility
+            if (vis == 1):
+                rtype  = "A".ljust(8)
+                target = h.ipv4
+                line = f"{name} IN {rtype} {target}\n"
+                f.write(line)
+                f.count += 1
+            if (vis == 2):
+                rtype  = "CNAME".ljust(8)
+                target = ext_cname + "."
+                line = f"{name} IN {rtype} {target}\n"
+                f.write(line)
+                f.count += 1
+
+        for a in aliases:
+            name   = a.name.ljust(20)
+            vis = a.visibility
+            if (vis == 1):
+                rtype  = "CNAME".ljust(8)
+                target = a.target + "." + domain + "."
+                line = f"{name} IN {rtype} {target}\n"
+                f.write(line)
+                f.count += 1
+            if (vis == 2):
+                rtype  = "CNAME".ljust(8)
+                target = ext_cname + "."
+                line = f"{name} IN {rtype} {target}\n"
+                f.write(line)
+                f.count += 1
+
+    return _stage([external_path()], render)
+
+# ---------------------------------------------------------
+# DNS files of the current configuration
+# ---------------------------------------------------------
+def dns_outputs() -> List[Path]:
+    return [
+        Path(get_config("DNS_HOST_FILE")),
+        Path(get_config("DNS_REVERSE_FILE")),
+        Path(get_config("DNS_ALIAS_FILE")),
+        external_path(),
+    ]
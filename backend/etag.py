@@ -0,0 +1,50 @@
+# backend/etag.py
+
+# import standard modules
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+
+# Import local modules
+from backend.db.versions import get_versions
+
+# Clients must revalidate, a matching ETag costs a 304 without body
+CACHE_CONTROL = "no-cache"
+
+# ---------------------------------------------------------
+# Strong ETag of a response built from the given tables
+# ---------------------------------------------------------
+def data_etag(tables: Iterable[str], variant: str = "") -> str:
+    """
+    Derived from the change counters of the tables only (no row is read).
+    variant tells apart representations of the same data (e.g. the query
+    string of a page).
+    """
+    versions = get_versions(tables)
+    key = ";".join(f"{name}={versions.get(name)}" for name in sorted(versions)) + "|" + variant
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+# ---------------------------------------------------------
+# If-None-Match check: the 304 response, or None to build the body
+# ---------------------------------------------------------
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as required for If-None-Match
+    if "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    return None
+
+# ---------------------------------------------------------
+# Add the validators to the response of a route
+# ---------------------------------------------------------
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,367 @@
+# backend/kea.py
+
+# import standard modules
+import hashlib
+import http.client
+import json
+from pathlib import Path
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Kea result codes
+KEA_SUCCESS = 0
+KEA_ERROR = 1
+KEA_UNSUPPORTED = 2
+KEA_EMPTY = 3
+
+# Reservations are changed in the running server only: the include file
+# written by backend.dhcp stays the durable copy loaded at the next restart
+OPERATION_TARGET = "memory"
+
+# Fields compared to decide whether a reservation changed
+RESERVATION_FIELDS = ("ip-address", "hostname")
+
+class KeaControlError(Exception):
+    pass
+
+# ---------------------------------------------------------
+# Kea control channel client (UNIX socket or HTTP control agent)
+# ---------------------------------------------------------
+class KeaControlClient:
+    """
+    Sends commands to Kea over the control socket of the server
+    (unix:///run/kea/kea4-ctrl-socket) or to the control agent
+    (http://127.0.0.1:8000/). The underlying connection is kept open
+    and reused across commands; it is re-opened once if the server
+    closed it in the meantime.
+    """
+
+    def __init__(self, url: str, service: str = "dhcp4", timeout: float = 5.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ("unix", "http", "https"):
+            raise ValueError(f"Unsupported Kea control URL: {url}")
+
+        self.url = url
+        self.service = service
+        self.timeout = timeout
+        self._scheme = parts.scheme
+        self._parts = parts
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Internal: open the connection
+    # -----------------------------
+    def _connect(self):
+        if self._scheme == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self._parts.path)
+            return sock
+
+        conn_cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        return conn_cls(self._parts.hostname, self._parts.port, timeout=self.timeout)
+
+    # -----------------------------
+    # Internal: UNIX socket round-trip
+    # -----------------------------
+    def _send_unix(self, payload: bytes) -> Any:
+        self._conn.sendall(payload)
+
+        decoder = json.JSONDecoder()
+        buffer = b""
+        while True:
+            chunk = self._conn.recv(65536)
+            if not chunk:
+                # Kea closes the socket after the answer: drop it for the next command
+                self.close_connection()
+                if not buffer:
+                    raise ConnectionResetError("Kea closed the control socket")
+                break
+            buffer += chunk
+            try:
+                # Kea does not delimit answers: stop as soon as a full JSON is received
+                data, _ = decoder.raw_decode(buffer.decode("utf-8").strip())
+                return data
+            except ValueError:
+                continue
+
+        return json.loads(buffer.decode("utf-8"))
+
+    # -----------------------------
+    # Internal: HTTP round-trip (keep-alive)
+    # -----------------------------
+    def _send_http(self, payload: bytes) -> Any:
+        path = self._parts.path or "/"
+        self._conn.request("POST", path, body=payload, headers={"Content-Type": "application/json"})
+        response = self._conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise KeaControlError(f"Kea control agent returned HTTP {response.status}")
+        if response.will_close:
+            self.close_connection()
+        return json.loads(body.decode("utf-8"))
+
+    # -----------------------------
+    # Send a command, returns the answer of the service
+    # -----------------------------
+    def command(self, command: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"command": command}
+        if arguments is not None:
+            message["arguments"] = arguments
+        if self._scheme != "unix":
+            message["service"] = [self.service]
+        payload = json.dumps(message).encode("utf-8")
+
+        with self._lock:
+            for attempt in (1, 2):
+                reused = self._conn is not None
+                try:
+                    if self._conn is None:
+                        self._conn = self._connect()
+                    if self._scheme == "unix":
+                        answer = self._send_unix(payload)
+                    else:
+                        answer = self._send_http(payload)
+                    break
+                except (ConnectionError, BrokenPipeError, http.client.HTTPException, socket.timeout, OSError) as err:
+                    self.close_connection()
+                    # A reused connection may have been closed by Kea: retry once on a fresh one
+                    if attempt == 2 or not reused:
+                        raise KeaControlError(f"Kea control channel error: {err}") from err
+
+        # The control agent wraps the answer of each service in a list
+        if isinstance(answer, list):
+            if not answer:
+                raise KeaControlError("Empty answer from Kea control agent")
+            answer = answer[0]
+        if not isinstance(answer, dict) or "result" not in answer:
+            raise KeaControlError(f"Invalid answer from Kea: {answer}")
+        return answer
+
+    # -----------------------------
+    # Close the connection
+    # -----------------------------
+    def close_connection(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+# ---------------------------------------------------------
+# Shared clients (one per URL/service, connection reused)
+# ---------------------------------------------------------
+_clients: Dict[tuple, KeaControlClient] = {}
+_clients_lock = threading.Lock()
+
+def get_client(url: str, service: str = "dhcp4") -> KeaControlClient:
+    key = (url, service)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = KeaControlClient(url, service=service)
+            _clients[key] = client
+        return client
+
+def close_clients():
+    with _clients_lock:
+        for client in _clients.values():
+            client.close_connection()
+        _clients.clear()
+
+# ---------------------------------------------------------
+# Read the reservations of an include file, one entry at a time
+# ---------------------------------------------------------
+def read_reservations(path: Path, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """
+    Decodes the entries of a '"reservations": [...]' include file
+    incrementally: memory is bound by the read chunk, not by the file.
+    Raises OSError or ValueError when the file is missing or malformed.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        while "[" not in buffer:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("missing reservations list")
+            buffer += chunk
+        head, _, buffer = buffer.partition("[")
+        if "".join(head.split()) != '"reservations":':
+            raise ValueError("missing reservations list")
+
+        pos = 0
+        while True:
+            # Next token: an entry, a separator or the end of the list
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+                pos += 1
+            if pos == len(buffer):
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError("unterminated reservations list")
+                buffer, pos = chunk, 0
+                continue
+            if buffer[pos] == "]":
+                if buffer[pos + 1:].strip() or f.read(1).strip():
+                    raise ValueError("unexpected content after the reservations list")
+                return
+            if buffer[pos] != "{":
+                raise ValueError(f"unexpected {buffer[pos]!r} in the reservations list")
+            try:
+                entry, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # Entry cut by the chunk boundary
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield entry
+            pos = end
+
+# ---------------------------------------------------------
+# Internal: digest of the compared fields of a reservation
+# ---------------------------------------------------------
+def _entry_digest(r: Dict[str, Any]) -> bytes:
+    fields = json.dumps([r.get(f) for f in RESERVATION_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(fields.encode("utf-8"), digest_size=8).digest()
+
+# ---------------------------------------------------------
+# Identifier -> digest map of reservations (state Kea holds)
+# ---------------------------------------------------------
+def reservation_digests(entries: Iterable[Dict[str, Any]], identifier: str = "hw-address") -> Dict[str, bytes]:
+    return {r[identifier]: _entry_digest(r) for r in entries if r.get(identifier)}
+
+# ---------------------------------------------------------
+# Reservation diff engine
+# ---------------------------------------------------------
+def diff_reservations(
+    previous: Dict[str, bytes],
+    current: Iterable[Dict[str, Any]],
+    identifier: str = "hw-address",
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    previous: reservation_digests() of the content Kea holds (consumed).
+    current is streamed: only the changed entries are kept.
+    """
+    added: List[Dict[str, Any]] = []
+    updated: List[Dict[str, Any]] = []
+    for r in current:
+        key = r.get(identifier)
+        if not key:
+            continue
+        digest = previous.pop(key, None)
+        if digest is None:
+            added.append(r)
+        elif digest != _entry_digest(r):
+            updated.append(r)
+
+    deleted = [{identifier: key} for key in previous]
+    previous.clear()
+
+    return {"add": added, "delete": deleted, "update": updated}
+
+# ---------------------------------------------------------
+# Push a reservation delta to Kea (reservation-add/del/update)
+# ---------------------------------------------------------
+def push_reservation_delta(
+    client: KeaControlClient,
+    delta: Dict[str, List[Dict[str, Any]]],
+    subnet_id: int = 0,
+    identifier: str = "hw-address",
+) -> Dict[str, Any]:
+
+    # Initialization
+    start_ns = time.monotonic_ns()
+    counts = {"added": 0, "deleted": 0, "updated": 0}
+    errors: List[str] = []
+    update_supported = True
+
+    def reservation(r):
+        return {"subnet-id": subnet_id, **r}
+
+    def delete_args(r):
+        return {
+            "subnet-id": subnet_id,
+            "identifier-type": identifier,
+            "identifier": r[identifier],
+            "operation-target": OPERATION_TARGET,
+        }
+
+    def check(answer, what, allow_empty=False):
+        result = answer.get("result")
+        if result == KEA_SUCCESS or (allow_empty and result == KEA_EMPTY):
+            return True
+        errors.append(f"{what}: {answer.get('text', 'result ' + str(result))}")
+        return False
+
+    # Deletions first: an address may move from a deleted host to a new one
+    for r in delta["delete"]:
+        if check(client.command("reservation-del", delete_args(r)), f"del {r[identifier]}", allow_empty=True):
+            counts["deleted"] += 1
+
+    for r in delta["update"]:
+        if update_supported:
+            answer = client.command("reservation-update", {
+                "reservation": reservation(r),
+                "operation-target": OPERATION_TARGET,
+            })
+            if answer.get("result") != KEA_UNSUPPORTED:
+                if check(answer, f"update {r[identifier]}"):
+                    counts["updated"] += 1
+                continue
+            # Older Kea (no reservation-update): replace the reservation
+            update_supported = False
+        if not check(client.command("reservation-del", delete_args(r)), f"update {r[identifier]} (del)", allow_empty=True):
+            continue
+        if check(client.command("reservation-add", {
+            "reservation": reservation(r),
+            "operation-target": OPERATION_TARGET,
+        }), f"update {r[identifier]}"):
+            counts["updated"] += 1
+
+    for r in delta["add"]:
+        if check(client.command("reservation-add", {
+            "reservation": reservation(r),
+            "operation-target": OPERATION_TARGET,
+        }), f"add {r[identifier]}"):
+            counts["added"] += 1
+
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+
+    return {
+        "status": "failure" if errors else "success",
+        **counts,
+        "errors": errors,
+        "took_ms": took_ms,
+    }
+
+# ---------------------------------------------------------
+# Reload the configuration (include files) of the running Kea server
+# ---------------------------------------------------------
+def reload_config(client: KeaControlClient) -> Dict[str, Any]:
+
+    # Initialization
+    start_ns = time.monotonic_ns()
+
+    answer = client.command("config-reload")
+    errors = [] if answer.get("result") == KEA_SUCCESS else [f"config-reload: {answer.get('text', 'result ' + str(answer.get('result')))}"]
+
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+
+    return {
+        "status": "failure" if errors else "success",
+        "errors": errors,
+        "took_ms": took_ms,
+    }
@@ -6,7 +6,11 @@ import os
 # Import backend modules
 from backend.bootstrap import bootstrap
 from backend.app import create_app
-from backend.server import run_server
+from backend.server import run_server, run_supervisor
+from backend.db.db import close_db
+
+# Import Settings
+from backend.settings.settings import settings
 
 # ------------------------------------------------------------------------------
 # Main: entry point of the application
@@ -16,7 +20,13 @@ def main():
     # 1) System Initialization (Settings, Logging, DB, etc.)
     bootstrap()
 
-    # 2) Costruzione app FastAPI
+    # 2) Supervised workers: each one builds its own app and connections
+    if settings.HTTP_WORKERS > 1:
+        close_db()
+        run_supervisor(settings.HTTP_WORKERS)
+        return
+
+    # 3) Costruzione app FastAPI
     app = create_app()
 
     # 4) Uvicorn Start
@@ -0,0 +1,137 @@
+# backend/passwords.py
+
+# Import standard modules
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import bcrypt
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Hash checked for unknown or disabled users: same cost as users.hash_password (12 rounds)
+DUMMY_HASH = b"$2b$12$ASQ91Cs5/dMhsWUW7NfNlO3LKkX.6lEOdY9WyfVRDAdMUx1OTKYwu"
+
+class PasswordPoolBusy(Exception):
+    """Every worker busy and the queue full: the caller should fail fast."""
+
+# Executor (created on first use) and its admission control
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots: Optional[threading.BoundedSemaphore] = None
+
+_stats: Dict[str, Any] = {
+    "submitted": 0,
+    "rejected": 0,
+    "completed": 0,
+    "failed": 0,
+    "in_flight": 0,
+    "total_ms": 0.0,
+    "max_ms": 0.0,
+}
+
+# -----------------------------
+# Internal: worker thread setup (lower priority: requests keep the CPU first)
+# -----------------------------
+def _init_worker() -> None:
+    # Linux applies nice to the calling thread only
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+# -----------------------------
+# Internal: executor (bcrypt releases the GIL: the threads hash in parallel)
+# -----------------------------
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _slots
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = max(1, settings.PASSWORD_WORKERS)
+                _slots = threading.BoundedSemaphore(workers + max(0, settings.PASSWORD_QUEUE_SIZE))
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="password",
+                    initializer=_init_worker,
+                )
+    return _executor
+
+# -----------------------------
+# Internal: submit a bcrypt call, or raise PasswordPoolBusy
+# -----------------------------
+def _submit(func, *args) -> Future:
+    executor = _get_executor()
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        _stats["rejected"] += 1
+        raise PasswordPoolBusy()
+
+    start_ns = time.monotonic_ns()
+    try:
+        future = executor.submit(func, *args)
+    except Exception:
+        slots.release()
+        raise
+
+    _stats["submitted"] += 1
+    _stats["in_flight"] += 1
+
+    def done(f: Future) -> None:
+        slots.release()
+        ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        _stats["in_flight"] -= 1
+        _stats["failed" if f.cancelled() or f.exception() else "completed"] += 1
+        _stats["total_ms"] += ms
+        if ms > _stats["max_ms"]:
+            _stats["max_ms"] = round(ms, 3)
+
+    future.add_done_callback(done)
+    return future
+
+# -----------------------------
+# Check a password against its bcrypt hash (on the password workers)
+# -----------------------------
+async def check_password(password: Optional[str], hashed: Optional[str]) -> bool:
+    """
+    hashed=None (unknown or disabled user) checks against a dummy hash of
+    the same cost, so the answer takes as long as for a real user.
+    Raises PasswordPoolBusy when the queue is full.
+    """
+    matched = await asyncio.wrap_future(
+        _submit(bcrypt.checkpw, (password or "").encode(), hashed.encode() if hashed else DUMMY_HASH)
+    )
+    return bool(matched) and hashed is not None
+
+# -----------------------------
+# Stop the workers (app lifespan)
+# -----------------------------
+def shutdown_pool() -> None:
+    global _executor
+
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# -----------------------------
+# Password worker statistics
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    finished = _stats["completed"] + _stats["failed"]
+    return {
+        "workers": settings.PASSWORD_WORKERS,
+        "queue_size": settings.PASSWORD_QUEUE_SIZE,
+        **{k: v for k, v in _stats.items() if k != "total_ms"},
+        "avg_ms": round(_stats["total_ms"] / finished, 3) if finished else 0.0,
+    }
@@ -0,0 +1,286 @@
+# backend/ratelimit.py
+
+# Import standard modules
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from fastapi import HTTPException, Request, status
+
+# Import local modules
+from backend.db.db import get_read_db, register_migration, transaction
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# A limit value or a function returning it (read at every hit: config changes apply live)
+Limit = Union[int, Callable[[], int]]
+
+class Decision(NamedTuple):
+    allowed: bool
+    count: float
+    limit: int
+    retry_after: int
+
+# -----------------------------
+# Internal: sliding window estimate
+# -----------------------------
+def _slide(slot: Optional[Tuple[float, int, int]], now: float, window: int) -> Tuple[float, int, int, float]:
+    """
+    Sliding-window counter: the hits of the current fixed window plus the
+    previous window's, weighted by the part of it still inside the
+    sliding window. Returns (start, previous, current, estimate).
+    """
+    start = math.floor(now / window) * window
+    previous = current = 0
+    if slot is not None:
+        if slot[0] == start:
+            _, previous, current = slot
+        elif slot[0] == start - window:
+            previous = slot[2]
+    estimate = previous * (1 - (now - start) / window) + current
+    return start, previous, current, estimate
+
+# -----------------------------
+# Internal: seconds until the estimate drops below the limit
+# -----------------------------
+def _retry_after(start: float, now: float, window: int, previous: int, current: int, limit: int) -> int:
+    if current < limit and previous:
+        # Previous window fading out of this one
+        at = start + window * (1 - (limit - current) / previous)
+    else:
+        # The current window fading out of the next one
+        at = start + window + window * max(0.0, 1 - limit / current) if current else start + window
+    return max(1, math.ceil(at - now))
+
+# ---------------------------------------------------------
+# Memory backend: fixed-size slots, LRU bounded, expired slots evicted first
+# ---------------------------------------------------------
+class MemoryBackend:
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # (name, key) -> (window start, previous count, current count, expires at)
+        self._slots: "OrderedDict[Tuple[str, str], Tuple[float, int, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, name: str, key: str, limit: int, window: int, now: float) -> Decision:
+        with self._lock:
+            slot_key = (name, key)
+            slot = self._slots.get(slot_key)
+            start, previous, current, estimate = _slide(slot[:3] if slot else None, now, window)
+            allowed = estimate < limit
+            if allowed:
+                current += 1
+            self._slots[slot_key] = (start, previous, current, start + 2 * window)
+            self._slots.move_to_end(slot_key)
+            self._evict(now)
+
+        return Decision(allowed, estimate + allowed, limit, 0 if allowed else _retry_after(start, now, window, previous, current, limit))
+
+    def reset(self, name: str, key: str) -> None:
+        with self._lock:
+            self._slots.pop((name, key), None)
+
+    # Least recently hit first: expired slots (no weight left) always, live ones over max_keys
+    def _evict(self, now: float) -> None:
+        while self._slots:
+            slot_key, slot = next(iter(self._slots.items()))
+            if len(self._slots) <= self.max_keys and slot[3] > now:
+                return
+            del self._slots[slot_key]
+
+    def size(self) -> int:
+        return len(self._slots)
+
+# ---------------------------------------------------------
+# SQLite backend: one row per key, shared by the workers
+# ---------------------------------------------------------
+class SQLiteBackend:
+
+    def __init__(self):
+        self._purged_at = 0.0
+
+    def hit(self, name: str, key: str, limit: int, window: int, now: float) -> Decision:
+        with transaction() as conn:
+            row = conn.execute(
+                "SELECT start, previous, current FROM rate_limits WHERE name = ? AND key = ?",
+                (name, key),
+            ).fetchone()
+            start, previous, current, estimate = _slide(tuple(row) if row else None, now, window)
+            allowed = estimate < limit
+            if allowed:
+                current += 1
+            conn.execute(
+                """
+                INSERT INTO rate_limits (name, key, start, previous, current, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name, key) DO UPDATE SET
+                    start = excluded.start, previous = excluded.previous,
+                    current = excluded.current, expires_at = excluded.expires_at
+                """,
+                (name, key, start, previous, current, start + 2 * window),
+            )
+
+            # Expired rows, at most once per window
+            if now - self._purged_at >= window:
+                self._purged_at = now
+                conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+
+        return Decision(allowed, estimate + allowed, limit, 0 if allowed else _retry_after(start, now, window, previous, current, limit))
+
+    def reset(self, name: str, key: str) -> None:
+        with transaction() as conn:
+            conn.execute("DELETE FROM rate_limits WHERE name = ? AND key = ?", (name, key))
+
+    def size(self) -> int:
+        return get_read_db().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+# -----------------------------
+# Migration: rate limit slots (SQLite backend)
+# -----------------------------
+@register_migration("rate_limits")
+def migrate_rate_limits(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            name TEXT NOT NULL,
+            key TEXT NOT NULL,
+            start REAL NOT NULL,
+            previous INTEGER NOT NULL DEFAULT 0,
+            current INTEGER NOT NULL DEFAULT 0,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (name, key)
+        ) WITHOUT ROWID;
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits(expires_at);")
+
+# -----------------------------
+# Internal: backend of the limiters (RATE_LIMIT_BACKEND)
+# -----------------------------
+def _make_backend():
+    kind = (settings.RATE_LIMIT_BACKEND or "auto").lower()
+    if kind == "auto":
+        kind = "sqlite" if settings.HTTP_WORKERS > 1 else "memory"
+    if kind == "sqlite":
+        return SQLiteBackend()
+    if kind != "memory":
+        logger.warning(f"RATE LIMIT: Unknown backend {kind}, using memory")
+    return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+# -----------------------------
+# Internal: shared backend (created on first use)
+# -----------------------------
+def _get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _make_backend()
+    return _backend
+
+# ---------------------------------------------------------
+# Rate limiter: limit hits per key within a sliding window
+# ---------------------------------------------------------
+class RateLimiter:
+    """
+    Sliding-window limiter over fixed-size slots (window start, previous
+    and current count) per key, in process memory or in SQLite when the
+    workers must share it. limit and window may be functions reading the
+    config.
+    """
+
+    def __init__(self, name: str, limit: Limit, window: Limit):
+        self.name = name
+        self._limit = limit
+        self._window = window
+        self.stats: Dict[str, int] = {"allowed": 0, "rejected": 0}
+
+    def _value(self, value: Limit) -> int:
+        return int(value() if callable(value) else value)
+
+    def hit(self, key: str) -> Decision:
+        limit = self._value(self._limit)
+        window = max(1, self._value(self._window))
+        decision = _get_backend().hit(self.name, key, limit, window, time.time())
+        self.stats["allowed" if decision.allowed else "rejected"] += 1
+        return decision
+
+    def reset(self, key: str) -> None:
+        _get_backend().reset(self.name, key)
+
+    # 429 with the repo error format and a Retry-After header
+    def check(self, key: str, code: str = "RATE_LIMITED", message: str = "Too many requests") -> Decision:
+        decision = self.hit(key)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(decision.retry_after)},
+                detail={
+                    "code": code,
+                    "status": "failure",
+                    "message": message,
+                    "retry_after": decision.retry_after,
+                },
+            )
+        return decision
+
+# Registered limiters (statistics)
+_limiters: Dict[str, RateLimiter] = {}
+
+# -----------------------------
+# Get or create a named limiter
+# -----------------------------
+def get_limiter(name: str, limit: Limit, window: Limit) -> RateLimiter:
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = _limiters.setdefault(name, RateLimiter(name, limit, window))
+    return limiter
+
+# -----------------------------
+# Client key of a request (one budget per IP)
+# -----------------------------
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+# -----------------------------
+# FastAPI dependency: limit a route per client IP
+# -----------------------------
+def rate_limit(limiter: RateLimiter):
+
+    def dependency(request: Request) -> None:
+        limiter.check(client_ip(request))
+
+    return dependency
+
+# Sensitive APIs (backup, settings, certificates): one budget per client
+sensitive_limiter = get_limiter(
+    "sensitive",
+    lambda: settings.RATE_LIMIT_SENSITIVE_REQUESTS,
+    lambda: settings.RATE_LIMIT_SENSITIVE_WINDOW_SECONDS,
+)
+# Routes answering conditional GETs check sensitive_limiter after the ETag instead
+sensitive_rate_limit = rate_limit(sensitive_limiter)
+
+# -----------------------------
+# Rate limit statistics
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    backend = _get_backend()
+    return {
+        "backend": "sqlite" if isinstance(backend, SQLiteBackend) else "memory",
+        "keys": backend.size(),
+        "limiters": {name: dict(limiter.stats) for name, limiter in _limiters.items()},
+    }
@@ -0,0 +1,287 @@
+# backend/regeneration.py
+
+# import standard modules
+from datetime import datetime, timezone
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: regenerations serialized per process only
+    fcntl = None
+
+# Import local modules
+from backend.db.db import register_change_listener, unregister_change_listener
+from backend.apply import apply_outputs
+
+# Import Settings & Config
+from backend.settings.settings import settings
+from backend.db.settings import get_config, refresh_config, subscribe_config, unsubscribe_config
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Tables whose changes require a DNS/DHCP regeneration
+WATCHED_TABLES = ("hosts", "aliases")
+
+# Config keys changing the generated files (contents or location)
+WATCHED_CONFIG = (
+    "DOMAIN", "EXTERNAL_NAME",
+    "DNS_HOST_FILE", "DNS_ALIAS_FILE", "DNS_REVERSE_FILE",
+    "DHCP4_HOST_FILE", "DHCP6_HOST_FILE", "DHCP4_SUBNETS",
+    "KEA_CONTROL_URL", "KEA_SUBNET4_ID",
+)
+
+# Serializes the regenerations of all processes (file in DATA_PATH)
+LOCK_FILE = "regeneration.lock"
+
+# Serializes every regeneration (worker and manual reloads)
+_run_lock = threading.Lock()
+# Protects the queue state below and wakes up the worker
+_cond = threading.Condition()
+_thread: Optional[threading.Thread] = None
+_stop = False
+
+# Queue state
+_state: Dict[str, Any] = {
+    "pending": False,
+    "running": False,
+    "first_request_ns": None,
+    "last_request_ns": None,
+    "requests": 0,
+    "reasons": set(),
+    "force": False,
+}
+
+# Statistics
+_stats: Dict[str, Any] = {
+    "runs": 0,
+    "failures": 0,
+    "requests_total": 0,
+    "requests_coalesced": 0,
+    "last_run": None,
+}
+
+# ---------------------------------------------------------
+# Internal: current time in ISO format
+# ---------------------------------------------------------
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+# ---------------------------------------------------------
+# Internal: seconds until the pending run is due (0 = due now)
+# ---------------------------------------------------------
+def _seconds_until_due(now_ns: int) -> float:
+    if _state["force"]:
+        return 0.0
+
+    debounce = get_config("REGEN_DEBOUNCE_SECONDS") or 0
+    max_delay = get_config("REGEN_MAX_DELAY_SECONDS") or 0
+
+    due_ns = _state["last_request_ns"] + int(debounce * 1_000_000_000)
+    if max_delay:
+        due_ns = min(due_ns, _state["first_request_ns"] + int(max_delay * 1_000_000_000))
+
+    return max(0.0, (due_ns - now_ns) / 1_000_000_000)
+
+# ---------------------------------------------------------
+# Run a generation function exclusively (never two at once)
+# ---------------------------------------------------------
+def run_exclusive(func: Callable[[], Any]) -> Any:
+    with _run_lock:
+        if fcntl is None:
+            return func()
+
+        # Workers of the same server share the output files
+        with open(settings.DATA_PATH / LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                return func()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+# ---------------------------------------------------------
+# Internal: execute one coalesced run and record its timings
+# ---------------------------------------------------------
+def _execute(batch: Dict[str, Any]) -> None:
+
+    # Initialization
+    start_ns = time.monotonic_ns()
+    started_at = _now_iso()
+    waited_ms = (start_ns - batch["first_request_ns"]) / 1_000_000
+    result = None
+    errors = []
+
+    try:
+        refresh_config()
+        result = run_exclusive(apply_outputs)
+    except Exception as err:
+        logger.exception("Regeneration failed: %s", str(err).strip())
+        errors.append(str(err))
+
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+
+    with _cond:
+        _stats["runs"] += 1
+        if errors:
+            _stats["failures"] += 1
+        _stats["last_run"] = {
+            "status": "failure" if errors else "success",
+            "started_at": started_at,
+            "requests": batch["requests"],
+            "reasons": sorted(batch["reasons"]),
+            "waited_ms": waited_ms,
+            "took_ms": took_ms,
+            "changed": result["changed"] if result else [],
+            "timings": result["timings"] if result else None,
+            "errors": errors,
+        }
+
+    logger.info(
+        "Regeneration %s: %d request(s) coalesced, waited %.1f ms, took %.1f ms",
+        "failed" if errors else "completed", batch["requests"], waited_ms, took_ms
+    )
+
+# ---------------------------------------------------------
+# Internal: worker loop
+# ---------------------------------------------------------
+def _worker_loop() -> None:
+    while True:
+        with _cond:
+            # Wait for a request (or stop)
+            while not _stop and not _state["pending"]:
+                _cond.wait()
+            if _stop:
+                return
+
+            # Debounce: wait until the queue has been quiet long enough
+            delay = _seconds_until_due(time.monotonic_ns())
+            if delay > 0:
+                _cond.wait(timeout=delay)
+                continue
+
+            # Take the batch and reset the queue
+            batch = {
+                "first_request_ns": _state["first_request_ns"],
+                "requests": _state["requests"],
+                "reasons": set(_state["reasons"]),
+            }
+            _state.update({
+                "pending": False,
+                "running": True,
+                "first_request_ns": None,
+                "last_request_ns": None,
+                "requests": 0,
+                "reasons": set(),
+                "force": False,
+            })
+
+        try:
+            _execute(batch)
+        finally:
+            with _cond:
+                _state["running"] = False
+                _cond.notify_all()
+
+# ---------------------------------------------------------
+# Enqueue a regeneration request (coalesced with pending ones)
+# ---------------------------------------------------------
+def request_regeneration(reason: str = "manual", immediate: bool = False) -> None:
+    now_ns = time.monotonic_ns()
+    with _cond:
+        if not _state["pending"]:
+            _state["pending"] = True
+            _state["first_request_ns"] = now_ns
+        else:
+            _stats["requests_coalesced"] += 1
+        _state["last_request_ns"] = now_ns
+        _state["requests"] += 1
+        _state["reasons"].add(reason)
+        if immediate:
+            _state["force"] = True
+        _stats["requests_total"] += 1
+        _cond.notify_all()
+
+# ---------------------------------------------------------
+# Internal: DB change listener
+# ---------------------------------------------------------
+def _on_change(table: str) -> None:
+    if table in WATCHED_TABLES:
+        request_regeneration(table)
+
+# ---------------------------------------------------------
+# Internal: config subscriber (outputs re-pointed, debounce changed)
+# ---------------------------------------------------------
+def _on_config_change(changes: Dict[str, Any]) -> None:
+    if any(key in WATCHED_CONFIG for key in changes):
+        request_regeneration("config")
+    else:
+        # New debounce: the waiting worker recomputes its deadline
+        with _cond:
+            _cond.notify_all()
+
+# ---------------------------------------------------------
+# Queue state and last-run timings
+# ---------------------------------------------------------
+def get_status() -> Dict[str, Any]:
+    now_ns = time.monotonic_ns()
+    with _cond:
+        pending = _state["pending"]
+        return {
+            "worker": "running" if (_thread and _thread.is_alive()) else "stopped",
+            "state": "running" if _state["running"] else ("pending" if pending else "idle"),
+            "pending_requests": _state["requests"],
+            "pending_reasons": sorted(_state["reasons"]),
+            "pending_for_ms": (now_ns - _state["first_request_ns"]) / 1_000_000 if pending else None,
+            "due_in_ms": _seconds_until_due(now_ns) * 1000 if pending else None,
+            "debounce_seconds": get_config("REGEN_DEBOUNCE_SECONDS"),
+            "max_delay_seconds": get_config("REGEN_MAX_DELAY_SECONDS"),
+            "runs": _stats["runs"],
+            "failures": _stats["failures"],
+            "requests_total": _stats["requests_total"],
+            "requests_coalesced": _stats["requests_coalesced"],
+            "last_run": _stats["last_run"],
+        }
+
+# ---------------------------------------------------------
+# Start the worker (app lifespan)
+# ---------------------------------------------------------
+def start_worker() -> None:
+    global _thread, _stop
+
+    if _thread is not None and _thread.is_alive():
+        return
+
+    _stop = False
+    _thread = threading.Thread(target=_worker_loop, name="regeneration", daemon=True)
+    _thread.start()
+    register_change_listener(_on_change)
+    subscribe_config(*WATCHED_CONFIG, "REGEN_DEBOUNCE_SECONDS", "REGEN_MAX_DELAY_SECONDS")(_on_config_change)
+    logger.debug("Regeneration worker started")
+
+# ---------------------------------------------------------
+# Stop the worker (app lifespan), flushing a pending run
+# ---------------------------------------------------------
+def stop_worker(timeout: float = 10.0) -> None:
+    global _thread, _stop
+
+    unregister_change_listener(_on_change)
+    unsubscribe_config(_on_config_change)
+    if _thread is None:
+        return
+
+    with _cond:
+        # Do not lose pending changes on shutdown
+        if _state["pending"]:
+            _state["force"] = True
+            _cond.notify_all()
+            _cond.wait_for(lambda: not _state["pending"] and not _state["running"], timeout=timeout)
+        _stop = True
+        _cond.notify_all()
+
+    _thread.join(timeout=timeout)
+    _thread = None
+    logger.debug("Regeneration worker stopped")
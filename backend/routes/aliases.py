@@ -1,18 +1,28 @@
 # backend/routes/aliases.py
 
 # import standard modules
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 import time
+from typing import Optional
 
 # Import local modules
+from backend.db.aio import run_read, run_write
 from backend.db.aliases import (
-    get_aliases,
+    get_aliases_page,
     get_alias,
     add_alias,
+    add_aliases,
+    upsert_aliases,
     update_alias,
-    delete_alias
+    delete_alias,
+    iter_aliases,
+    ALIAS_COLUMNS,
 )
+from backend.db.paging import MAX_PAGE_SIZE
+from backend.db.snapshot import get_snapshot
+from backend.etag import data_etag, not_modified, set_etag
+from backend.transfer import MEDIA_TYPES, export_rows, import_records, iter_csv, iter_ndjson, resolve_format
 
 # Import Settings
 from backend.settings.settings import settings
@@ -42,15 +52,68 @@ def aliases_js():
 # Get Aliass
 # ---------------------------------------------------------
 @router.get("/api/aliases", status_code=status.HTTP_200_OK, responses={
-    200: {"description": "Aliass found"},
+    200: {"description": "Aliass found (a page when any paging, search or filter parameter is given)"},
+    304: {"description": "Not modified (If-None-Match)"},
+    400: {"description": "Invalid query parameters"},
     500: {"description": "Internal server error"},
 })
-def api_get_aliases():
+async def api_get_aliases(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    order: Optional[str] = None,
+    q: Optional[str] = None,
+    name: Optional[str] = None,
+    target: Optional[str] = None,
+    visibility: Optional[int] = None,
+    ssl_enabled: Optional[int] = None,
+):
+
+    filters = {
+        "name": name,
+        "target": target,
+        "visibility": visibility,
+        "ssl_enabled": ssl_enabled,
+    }
+    paged = any(v is not None for v in (limit, cursor, sort, order, q, *filters.values()))
 
     try:
-        aliases = get_aliases()
+        # Unchanged table: 304 without reading any row
+        etag = await run_read(data_etag, ("aliases",), request.url.query)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        set_etag(response, etag)
+
+        # Page: {items, total, limit, sort, order, next_cursor}
+        if paged:
+            return await run_read(
+                get_aliases_page,
+                limit=limit,
+                cursor=cursor,
+                sort=sort or "target",
+                order=order or "asc",
+                q=q,
+                filters=filters,
+            )
+
+        # No parameters: the whole list, as always (shared snapshot)
+        aliases = (await run_read(get_snapshot)).aliases
         return aliases or []
 
+    # Invalid query
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "ALIASES_INVALID_QUERY",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
     except Exception as err:
         logger.exception("Error getting list aliases %s", str(err).strip())
         raise HTTPException(
@@ -62,6 +125,96 @@ def api_get_aliases():
             },
         )
 
+# ---------------------------------------------------------
+# Import Aliases (CSV / NDJSON request body, streamed)
+# ---------------------------------------------------------
+@router.post("/api/aliases/import", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Aliases imported (invalid rows are reported)"},
+    400: {"description": "Invalid import parameters"},
+    500: {"description": "Internal server error"},
+})
+async def api_import_aliases(request: Request, format: Optional[str] = None, mode: str = "upsert", dry_run: bool = False):
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        fmt = resolve_format(format, request.headers.get("content-type"))
+        if mode not in ("add", "upsert"):
+            raise ValueError(f"Unsupported mode: {mode} (expected add, upsert)")
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "ALIASES_IMPORT_INVALID",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    try:
+        parse = iter_csv if fmt == "csv" else iter_ndjson
+        write = add_aliases if mode == "add" else upsert_aliases
+        result = await import_records(parse(request.stream()), write, dry_run=dry_run)
+
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return {
+            "code": "ALIASES_IMPORTED",
+            "status": "success",
+            "message": "Aliases import checked" if dry_run else "Aliases imported",
+            "details": {
+                **result,
+                "format": fmt,
+                "mode": mode,
+                "took_ms": took_ms,
+            },
+        }
+
+    except Exception as err:
+        logger.exception("Error importing aliases: %s", str(err).strip())
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "ALIASES_IMPORT_ERROR",
+                "status": "failure",
+                "message": "Internal error importing aliases",
+                "details": {
+                    "took_ms": took_ms,
+                },
+            },
+        )
+
+# ---------------------------------------------------------
+# Export Aliases (CSV / NDJSON, streamed)
+# ---------------------------------------------------------
+@router.get("/api/aliases/export", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Aliases export"},
+    400: {"description": "Invalid format"},
+})
+def api_export_aliases(format: str = "csv"):
+
+    try:
+        fmt = resolve_format(format)
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "ALIASES_EXPORT_INVALID",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    columns = [c.strip() for c in ALIAS_COLUMNS.split(",")]
+    return StreamingResponse(
+        export_rows(iter_aliases, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="aliases.{fmt}"'},
+    )
+
 # ---------------------------------------------------------
 # Get Alias
 # ---------------------------------------------------------
@@ -70,13 +223,13 @@ def api_get_aliases():
     404: {"description": "Alias not found"},
     500: {"description": "Internal server error"},
 })
-def api_get_alias(alias_id: int):
+async def api_get_alias(alias_id: int):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        alias = get_alias(alias_id)
+        alias = await run_read(get_alias, alias_id)
 
     except Exception as err:
         logger.exception("Error getting alias %s: %s", alias_id, str(err).strip())
@@ -119,14 +272,14 @@ def api_get_alias(alias_id: int):
     409: {"description": "Alias already present"},
     500: {"description": "Internal server error"},
 })
-def api_add_alias(data: dict):
+async def api_add_alias(data: dict):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
     alias_id = None
 
     try:
-        alias_id = add_alias(data)
+        alias_id = await run_write(add_alias, data)
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
                 "code": "ALIAS_ADDED",
@@ -178,13 +331,13 @@ def api_add_alias(data: dict):
     404: {"description": "Alias not found"},
     500: {"description": "Internal server error"},
 })
-def api_update_alias(data: dict, alias_id: int):
+async def api_update_alias(data: dict, alias_id: int):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        update_alias(alias_id, data)
+        await run_write(update_alias, alias_id, data)
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
                "code": "ALIAS_UPDATED",
@@ -236,13 +389,13 @@ def api_update_alias(data: dict, alias_id: int):
     404: {"description": "Alias not found"},
     500: {"description": "Internal server error"},
 })
-def api_delete_alias(alias_id: int):
+async def api_delete_alias(alias_id: int):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        delete_alias(alias_id)
+        await run_write(delete_alias, alias_id)
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
                 "code": "ALIAS_DELETED",
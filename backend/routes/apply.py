@@ -0,0 +1,115 @@
+# backend/routes/apply.py
+
+# import standard modules
+from fastapi import APIRouter, HTTPException, status
+import time
+
+# Import local modules
+from backend.apply import ApplyValidationError, apply_outputs, rollback_outputs
+from backend.regeneration import run_exclusive
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Create Router
+router = APIRouter()
+
+# ---------------------------------------------------------
+# Apply DNS + DHCP configuration (all or nothing)
+# ---------------------------------------------------------
+@router.post("/api/apply", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Configuration applied successfully"},
+    422: {"description": "Generated configuration failed validation"},
+    500: {"description": "Internal server error"},
+})
+def api_apply():
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        # Render, validate and commit every output (serialized with the regeneration worker)
+        result = run_exclusive(apply_outputs)
+
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return {
+            "code": "APPLY_OK",
+            "status": "success",
+            "message": "Configuration applied successfully",
+            "took_ms": took_ms,
+            "details": result,
+        }
+
+    except ApplyValidationError as err:
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "code": "APPLY_VALIDATION_ERROR",
+                "status": "failure",
+                "message": "Generated configuration failed validation, nothing applied",
+                "details": {
+                    "errors": err.errors,
+                    "took_ms": took_ms,
+                },
+            },
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as err:
+        logger.exception("Error applying configuration: %s", str(err).strip())
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "APPLY_ERROR",
+                "status": "failure",
+                "message": "Internal error applying configuration",
+                "took_ms": took_ms,
+            },
+        )
+
+# ---------------------------------------------------------
+# Roll back to the previous generation
+# ---------------------------------------------------------
+@router.post("/api/apply/rollback", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Previous configuration restored"},
+    500: {"description": "Internal server error"},
+})
+def api_apply_rollback():
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        result = run_exclusive(rollback_outputs)
+
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return {
+            "code": "APPLY_ROLLBACK_OK",
+            "status": "success",
+            "message": "Previous configuration restored",
+            "took_ms": took_ms,
+            "details": result,
+        }
+
+    except HTTPException:
+        raise
+
+    except Exception as err:
+        logger.exception("Error rolling back configuration: %s", str(err).strip())
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "APPLY_ROLLBACK_ERROR",
+                "status": "failure",
+                "message": "Internal error rolling back configuration",
+                "took_ms": took_ms,
+            },
+        )
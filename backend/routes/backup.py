@@ -1,7 +1,7 @@
 # backend/routes/backup.py
 
 # import standard modules
-from fastapi import APIRouter, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from fastapi.responses import Response, JSONResponse, FileResponse
 from pathlib import Path
 from pydantic import BaseModel
@@ -11,6 +11,7 @@ from typing import Dict, Any
 import zipfile
 
 # Import local modules
+from backend.ratelimit import sensitive_rate_limit
 from backend.backup import backup_create, backup_list, backup_restore, backup_delete
 
 # Import Config
@@ -111,7 +112,7 @@ def build_operation_response(
 # ---------------------------------------------------------
 # API: Create Backup
 # ---------------------------------------------------------
-@router.post("/api/backup/create")
+@router.post("/api/backup/create", dependencies=[Depends(sensitive_rate_limit)])
 async def api_backup_create():
 
     # Initialization
@@ -146,7 +147,7 @@ async def api_backup_create():
 # ---------------------------------------------------------
 # API: List available backups
 # ---------------------------------------------------------
-@router.get("/api/backup/list")
+@router.get("/api/backup/list", dependencies=[Depends(sensitive_rate_limit)])
 async def api_backup_list():
 
     # Initialization
@@ -172,7 +173,7 @@ async def api_backup_list():
 # ---------------------------------------------------------
 # API: Restore from backup
 # ---------------------------------------------------------
-@router.post("/api/backup/restore")
+@router.post("/api/backup/restore", dependencies=[Depends(sensitive_rate_limit)])
 async def api_backup_restore(payload: BackupRestoreRequest):
 
     # Initialization
@@ -207,7 +208,7 @@ async def api_backup_restore(payload: BackupRestoreRequest):
 # ---------------------------------------------------------
 # API: Delete a backup
 # ---------------------------------------------------------
-@router.post("/api/backup/delete")
+@router.post("/api/backup/delete", dependencies=[Depends(sensitive_rate_limit)])
 async def api_backup_delete(payload: BackupDeleteRequest):
 
     # Initialization
@@ -242,7 +243,7 @@ async def api_backup_delete(payload: BackupDeleteRequest):
 # ---------------------------------------------------------
 # API: Download backup
 # ---------------------------------------------------------
-@router.get("/api/backup/download/{backup_id}")
+@router.get("/api/backup/download/{backup_id}", dependencies=[Depends(sensitive_rate_limit)])
 def download_backup(backup_id: str):
     backup_dir = Path(get_config("BACKUP_PATH"))
 
@@ -267,7 +268,7 @@ def download_backup(backup_id: str):
 # ---------------------------------------------------------
 # API: Upload backup
 # ---------------------------------------------------------
-@router.post("/api/backup/upload")
+@router.post("/api/backup/upload", dependencies=[Depends(sensitive_rate_limit)])
 def upload_backup(file: UploadFile = File(...)):
 
     # Initialization
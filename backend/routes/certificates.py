@@ -8,8 +8,9 @@ import time
 import os
 
 # Import local modules
-from backend.db.hosts import get_hosts_certificates
-from backend.db.aliases import get_aliases_certificates
+from backend.ratelimit import client_ip, sensitive_limiter
+from backend.db.snapshot import get_snapshot
+from backend.etag import data_etag, not_modified, set_etag
 
 # Import Settings
 from backend.settings.settings import settings
@@ -36,13 +37,24 @@ def build_cert_domain(hosts, aliases, domain: str):
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "List Domain with SSL Enabled"},
+        304: {"description": "Not modified (If-None-Match)"},
+        429: {"description": "Too many requests (Retry-After)"},
         500: {"description": "Internal server error"},
     }
 )
-def api_get_certificates(request: Request):
+def api_get_certificates(request: Request, response: Response):
     try:
-        hosts = get_hosts_certificates()
-        aliases = get_aliases_certificates()
+        # Unchanged hosts and aliases: 304 without reading any row nor counting the request (ACME pollers)
+        etag = data_etag(("hosts", "aliases"), settings.DOMAIN)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        sensitive_limiter.check(client_ip(request))
+        set_etag(response, etag)
+
+        snap = get_snapshot()
+        hosts = [h for h in snap.hosts if h["ssl_enabled"] == 1]
+        aliases = [a for a in snap.aliases if a["ssl_enabled"] == 1]
         return build_cert_domain(hosts, aliases, settings.DOMAIN)
 
     except HTTPException:
@@ -0,0 +1,101 @@
+# backend/routes/changes.py
+
+# import standard modules
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, status
+import time
+from typing import Optional, Set, Tuple
+
+# Import local modules
+from backend.db.aio import run_read
+from backend.db.changes import JOURNAL_COLUMNS, MAX_CHANGES, get_changes
+from backend.db.db import register_change_listener
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Create Router
+router = APIRouter()
+
+# Longest long-poll (seconds)
+MAX_WAIT_SECONDS = 60
+
+# Journal re-read interval of a long-poll (writes of other processes are not notified)
+POLL_SECONDS = 1.0
+
+# Long-polls waiting for a change
+_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+# ---------------------------------------------------------
+# Internal: wake the long-polls (DB change listener, any thread)
+# ---------------------------------------------------------
+def _on_change(table: str) -> None:
+    if table not in JOURNAL_COLUMNS:
+        return
+    for loop, event in list(_waiters):
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # Loop already closed
+            _waiters.discard((loop, event))
+
+register_change_listener(_on_change)
+
+# ---------------------------------------------------------
+# Get the changes after a sequence (delta sync, optional long-poll)
+# ---------------------------------------------------------
+@router.get("/api/changes", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Changes after since (resync set when since is no longer in the journal)"},
+    400: {"description": "Invalid query parameters"},
+    500: {"description": "Internal server error"},
+})
+async def api_get_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(1000, ge=1, le=MAX_CHANGES),
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS),
+):
+
+    # Inizializzazioni
+    deadline = time.monotonic() + wait
+
+    try:
+        while True:
+            # Registered before reading: a commit in between still wakes us
+            waiter = (asyncio.get_running_loop(), asyncio.Event())
+            _waiters.add(waiter)
+            try:
+                result = await run_read(get_changes, since, limit)
+                remaining = deadline - time.monotonic()
+                if since is None or result["changes"] or result["resync"] or remaining <= 0:
+                    return result
+
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), timeout=min(remaining, POLL_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                _waiters.discard(waiter)
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "CHANGES_INVALID_QUERY",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    except Exception as err:
+        logger.exception("Error getting changes: %s", str(err).strip())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "CHANGES_GET_ERROR",
+                "status": "failure",
+                "message": "Internal error getting changes",
+            },
+        )
@@ -4,14 +4,16 @@
 from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import FileResponse
+import threading
+from typing import Optional
 
 # Import local modules
-from backend.db.hosts import get_hosts
+from backend.db.snapshot import get_snapshot
 from backend.db.leases import get_leases
 
 # Import Settings & Config
 from backend.settings.settings import settings
-from backend.db.settings import get_config
+from backend.db.settings import get_config, subscribe_config
 # Import Logging
 from backend.log.log import get_logger
 
@@ -23,6 +25,36 @@ logger = get_logger(__name__)
 # Create Router
 router = APIRouter()
 
+# Probe pool shared by the requests (sized by PING_WORKERS)
+_probe_pool: Optional[ThreadPoolExecutor] = None
+_probe_lock = threading.Lock()
+
+# ---------------------------------------------------------
+# Internal: current probe pool (created on first use)
+# ---------------------------------------------------------
+def _get_probe_pool() -> ThreadPoolExecutor:
+    global _probe_pool
+
+    pool = _probe_pool
+    if pool is None:
+        with _probe_lock:
+            if _probe_pool is None:
+                _probe_pool = ThreadPoolExecutor(max_workers=get_config("PING_WORKERS"), thread_name_prefix="ping")
+            pool = _probe_pool
+    return pool
+
+# ---------------------------------------------------------
+# Config subscriber: resize the probe pool
+# ---------------------------------------------------------
+@subscribe_config("PING_WORKERS")
+def _on_ping_workers_change(changes):
+    global _probe_pool
+
+    # The old pool finishes its probes, its threads exit once it is released
+    with _probe_lock:
+        _probe_pool = None
+    logger.info("Ping workers: %s (applied live)", changes["PING_WORKERS"][1])
+
 # ---------------------------------------------------------
 # FRONTEND PATHS (absolute paths inside Docker)
 # ---------------------------------------------------------
@@ -46,26 +78,35 @@ def devices_js():
 def api_get_devices():
 
     try:
-        workers = get_config("PING_WORKERS")
-        hosts = get_hosts(filter_devices=True)
         leases = get_leases(filter_devices=True)
 
-        for host in hosts:
-            host["dhcp_state"] = "static"
+        # New rows: the snapshot rows are shared with every other reader
+        hosts = [
+            {
+                "id": f"s-{h['id']}",  # Frontend requires this format
+                "ipv4": h["ipv4"],
+                "mac": h["mac"],
+                "name": h["name"],
+                "description": h["description"],
+                "dhcp_state": "static",
+            }
+            for h in get_snapshot().hosts
+            if h["ipv4"] is not None
+        ]
 
         for lease in leases:
             lease["description"] = None
 
         devices = hosts + leases
 
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = [
-                executor.submit(is_host_active, device["ipv4"])
-                for device in devices
-            ]
+        executor = _get_probe_pool()
+        futures = [
+            executor.submit(is_host_active, device["ipv4"])
+            for device in devices
+        ]
 
-            for i, future in enumerate(futures):
-                devices[i]["active"] = future.result()
+        for i, future in enumerate(futures):
+            devices[i]["active"] = future.result()
 
         return devices
 
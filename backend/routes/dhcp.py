@@ -3,17 +3,15 @@
 # import standard modules
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import FileResponse
-import json
-from pathlib import Path
 import time
 
 # Import local modules
-from backend.db.hosts import get_hosts
+from backend.apply import apply_outputs
 from backend.db.leases import get_leases, get_lease, delete_lease
+from backend.regeneration import run_exclusive
 
-# Import Settings & Config
+# Import Settings
 from backend.settings.settings import settings
-from backend.db.settings import get_config
 # Import Logging
 from backend.log.log import get_logger
 
@@ -43,51 +41,14 @@ def leases_js():
     200: {"description": "DHCP configuration reload successfully"},
     500: {"description": "Internal server error"},
 })
-async def api_dhcp_reload():
+def api_dhcp_reload():
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
-    kea4_hosts = []
-    kea6_hosts = []
 
     try:
-        # Get Hosts List
-        hosts = get_hosts()
-
-        # Convert hosts into the kea structure
-        for h in hosts:
-            if h.get("ipv4") and h.get("mac"):
-                kea4_hosts.append({
-                    "hw-address": h.get("mac"),
-                    "ip-address": h.get("ipv4"),
-                    "hostname": h.get("name"),
-            })
-            if h.get("ipv6") and h.get("mac"):
-                kea6_hosts.append({
-                    "duid": h.get("mac"),
-                    "ip-addresses": h.get("ipv6"),
-                    "hostname": h.get("name"),
-            })
-
-        # Save DHCP4 Configuration
-        path = Path(get_config("DHCP4_HOST_FILE"))
-        path.parent.mkdir(parents=True, exist_ok=True)
-        data = {"reservations": kea4_hosts}
-        full = json.dumps(data, indent=4, ensure_ascii=False)
-        fragment = full.strip()[1:-1].strip() + "\n"
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(fragment)
-
-        # Save DHCP6 Configuration
-        path = Path(get_config("DHCP6_HOST_FILE"))
-        path.parent.mkdir(parents=True, exist_ok=True)
-        data = {"reservations": kea6_hosts}
-        full = json.dumps(data, indent=4, ensure_ascii=False)
-        fragment = full.strip()[1:-1].strip() + "\n"
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(fragment)
-
-        # RELOAD DHCP
+        # Regenerate DHCP Configuration (serialized with the regeneration worker)
+        result = run_exclusive(lambda: apply_outputs(("dhcp",)))
 
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
@@ -95,6 +56,7 @@ async def api_dhcp_reload():
                 "status": "success",
                 "message": "DHCP configuration reload successfully",
                 "took_ms": took_ms,
+                "details": result,
             }
 
     except HTTPException:
@@ -2,20 +2,12 @@
 
 # import standard modules
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
-import asyncio
-import json
-import ipaddress
-from pathlib import Path
 import time
 
 # Import local modules
-from backend.db.hosts import get_hosts
-from backend.db.aliases import get_aliases
+from backend.apply import apply_outputs
+from backend.regeneration import run_exclusive
 
-# Import Settings & Config
-from backend.settings.settings import settings
-from backend.db.settings import get_config
 # Import Logging
 from backend.log.log import get_logger
 
@@ -32,93 +24,14 @@ router = APIRouter()
     200: {"description": "DNS configuration reload successfully"},
     500: {"description": "Internal server error"},
 })
-async def api_dns_reload():
+def api_dns_reload():
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        # Get Hosts List
-        hosts = get_hosts()
-
-        # Save DNS Hosts Configuration
-        path = Path(get_config("DNS_HOST_FILE"))
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            for h in hosts:
-                name   = h.get("name").ljust(20)
-                rtype  = "A".ljust(8)
-                target = h.get("ipv4")
-                line = f"{name} IN {rtype} {target}\n"
-                f.write(line)
-
-        # Save DNS Reverse Configuration
-        path = Path(get_config("DNS_REVERSE_FILE"))
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            for h in hosts:
-                ip = h.get("ipv4")
-                if ip:
-                    parts  = ip.split(".")
-                    rev    = f"{parts[-1]}.{parts[-2]}"
-                    ip     = rev.ljust(20)
-                    rtype  = "PTR".ljust(8)
-                    target = h.get("name")+ "." + get_config("DOMAIN")
-                    line = f"{ip} IN {rtype} {target}\n"
-                    f.write(line)
-
-        # Get Aliases List
-        aliases = get_aliases()
-
-        # Save DNS Aliases Configuration
-        path = Path(get_config("DNS_ALIAS_FILE"))
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            for a in aliases:
-                name   = a.get("name").ljust(20)
-                rtype  = "CNAME".ljust(8)
-                target = a.get("target")
-                line = f"{name} IN {rtype} {target}\n"
-                f.write(line)
-
-        # Get Ext_Cname
-        ext_cname = get_config("EXTERNAL_NAME")
-
-        # Save DNS Host and Aliases for the EXT DNS
-        path = Path(get_config("DNS_HOST_FILE")).with_name(
-               Path(get_config("DNS_HOST_FILE")).name + "_ext"
-        )
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            for h in hosts:
-                name   = h.get("name").ljust(20)
-                vis = h.get('visibility')
-                if (vis == 1):
-                    rtype  = "A".ljust(8)
-                    target = h.get("ipv4")
-                    line = f"{name} IN {rtype} {target}\n"
-                    f.write(line)
-                if (vis == 2):
-                    rtype  = "CNAME".ljust(8)
-                    target = ext_cname + "."
-                    line = f"{name} IN {rtype} {target}\n"
-                    f.write(line)
-
-            for a in aliases:
-                name   = a.get("name").ljust(20)
-                vis = a.get('visibility')
-                if (vis == 1):
-                    rtype  = "CNAME".ljust(8)
-                    target = a.get("target") + "." + get_config("DOMAIN") + "."
-                    line = f"{name} IN {rtype} {target}\n"
-                    f.write(line)
-                if (vis == 2):
-                    rtype  = "CNAME".ljust(8)
-                    target = ext_cname + "."
-                    line = f"{name} IN {rtype} {target}\n"
-                    f.write(line)
-
-        # RELOAD DNS
+        # Regenerate DNS Configuration (serialized with the regeneration worker)
+        result = run_exclusive(lambda: apply_outputs(("dns",)))
 
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
@@ -126,6 +39,7 @@ async def api_dns_reload():
                 "status": "success",
                 "message": "DNS configuration reload successfully",
                 "took_ms": took_ms,
+                "details": result,
             }
 
     except HTTPException:
@@ -6,6 +6,17 @@ import sqlite3
 import time
 import os
 
+# Import local modules
+from backend.db.aio import get_stats as get_writer_stats
+from backend.db.changes import get_stats as get_changes_stats
+from backend.db.db import get_migration_status
+from backend.db.maintenance import get_stats as get_maintenance_stats
+from backend.db.settings import get_stats as get_config_stats
+from backend.db.snapshot import get_stats as get_snapshot_stats
+from backend.ratelimit import get_stats as get_ratelimit_stats
+from backend.passwords import get_stats as get_password_stats
+from backend.security import get_stats as get_session_stats
+
 # Import Settings
 from backend.settings.settings import settings
 # Import Logging
@@ -57,6 +68,44 @@ def health():
             "status": db_status,
             "version": db_version,
             "tables": db_tables,
-            "size_mb": db_size
-        }
+            "size_mb": db_size,
+        },
+    }
+
+# -----------------------------
+# Internal: statistics of one component (its error instead of a failed request)
+# -----------------------------
+def _collect(func) -> dict:
+    try:
+        return func()
+    except Exception as err:
+        logger.exception("Statistics unavailable: " + str(err).strip())
+        return {"error": str(err).strip()}
+
+# Runtime statistics: behind the session (not under /api/health, which is public)
+@router.get("/api/stats", tags=["health"])
+def stats():
+    start = time.time()
+
+    result = {
+        "database": {
+            "writer": _collect(get_writer_stats),
+            "migrations": _collect(get_migration_status),
+            "snapshot": _collect(get_snapshot_stats),
+            "config": _collect(get_config_stats),
+            "changes": _collect(get_changes_stats),
+            "maintenance": _collect(get_maintenance_stats),
+        },
+        "rate_limits": _collect(get_ratelimit_stats),
+        "passwords": _collect(get_password_stats),
+        "sessions": _collect(get_session_stats),
+    }
+
+    failed = any("error" in section for section in (*result["database"].values(), result["rate_limits"], result["passwords"], result["sessions"]))
+    latency = round((time.time() - start) * 1000, 2)
+
+    return {
+        "status": "degraded" if failed else "healthy",
+        "latency_ms": latency,
+        **result,
     }
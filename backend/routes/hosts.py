@@ -1,18 +1,30 @@
 # backend/routes/hosts.py
 
 # import standard modules
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+import sqlite3
 import time
+from typing import Optional
 
 # Import local modules
+from backend.db.aio import run_read, run_write
 from backend.db.hosts import (
-    get_hosts,
+    get_hosts_in_network,
+    get_hosts_page,
     get_host,
     add_host,
+    add_hosts,
+    upsert_hosts,
     update_host,
-    delete_host
+    delete_host,
+    iter_hosts,
+    HOST_COLUMNS,
 )
+from backend.db.paging import MAX_PAGE_SIZE
+from backend.db.snapshot import get_snapshot
+from backend.etag import data_etag, not_modified, set_etag
+from backend.transfer import MEDIA_TYPES, export_rows, import_records, iter_csv, iter_ndjson, resolve_format
 
 # Import Settings
 from backend.settings.settings import settings
@@ -42,15 +54,77 @@ def hosts_js():
 # Get Hosts
 # ---------------------------------------------------------
 @router.get("/api/hosts", status_code=status.HTTP_200_OK, responses={
-    200: {"description": "Hosts found"},
+    200: {"description": "Hosts found (a page when any paging, search or filter parameter is given)"},
+    304: {"description": "Not modified (If-None-Match)"},
+    400: {"description": "Invalid network or query parameters"},
     500: {"description": "Internal server error"},
 })
-def api_get_hosts():
+async def api_get_hosts(
+    request: Request,
+    response: Response,
+    network: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    order: Optional[str] = None,
+    q: Optional[str] = None,
+    name: Optional[str] = None,
+    ipv4: Optional[str] = None,
+    ipv6: Optional[str] = None,
+    mac: Optional[str] = None,
+    visibility: Optional[int] = None,
+    ssl_enabled: Optional[int] = None,
+):
+
+    filters = {
+        "name": name,
+        "ipv4": ipv4,
+        "ipv6": ipv6,
+        "mac": mac,
+        "visibility": visibility,
+        "ssl_enabled": ssl_enabled,
+    }
+    paged = any(v is not None for v in (limit, cursor, sort, order, q, *filters.values()))
 
     try:
-        hosts = get_hosts()
+        # Unchanged table: 304 without reading any row
+        etag = await run_read(data_etag, ("hosts",), request.url.query)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        set_etag(response, etag)
+
+        # Page: {items, total, limit, sort, order, next_cursor}
+        if paged:
+            return await run_read(
+                get_hosts_page,
+                limit=limit,
+                cursor=cursor,
+                sort=sort or "ipv4",
+                order=order or "asc",
+                q=q,
+                filters=filters,
+                network=network,
+            )
+
+        # No parameters: the whole list, as always (shared snapshot)
+        if network:
+            hosts = await run_read(get_hosts_in_network, network)
+        else:
+            hosts = (await run_read(get_snapshot)).hosts
         return hosts or []
 
+    # Invalid network / query
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "HOSTS_INVALID_QUERY" if paged else "HOSTS_INVALID_NETWORK",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
     except Exception as err:
         logger.exception("Error getting list hosts %s", str(err).strip())
         raise HTTPException(
@@ -62,6 +136,96 @@ def api_get_hosts():
             },
         )
 
+# ---------------------------------------------------------
+# Import Hosts (CSV / NDJSON request body, streamed)
+# ---------------------------------------------------------
+@router.post("/api/hosts/import", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Hosts imported (invalid rows are reported)"},
+    400: {"description": "Invalid import parameters"},
+    500: {"description": "Internal server error"},
+})
+async def api_import_hosts(request: Request, format: Optional[str] = None, mode: str = "upsert", dry_run: bool = False):
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        fmt = resolve_format(format, request.headers.get("content-type"))
+        if mode not in ("add", "upsert"):
+            raise ValueError(f"Unsupported mode: {mode} (expected add, upsert)")
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "HOSTS_IMPORT_INVALID",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    try:
+        parse = iter_csv if fmt == "csv" else iter_ndjson
+        write = add_hosts if mode == "add" else upsert_hosts
+        result = await import_records(parse(request.stream()), write, dry_run=dry_run)
+
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return {
+            "code": "HOSTS_IMPORTED",
+            "status": "success",
+            "message": "Hosts import checked" if dry_run else "Hosts imported",
+            "details": {
+                **result,
+                "format": fmt,
+                "mode": mode,
+                "took_ms": took_ms,
+            },
+        }
+
+    except Exception as err:
+        logger.exception("Error importing hosts: %s", str(err).strip())
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "HOSTS_IMPORT_ERROR",
+                "status": "failure",
+                "message": "Internal error importing hosts",
+                "details": {
+                    "took_ms": took_ms,
+                },
+            },
+        )
+
+# ---------------------------------------------------------
+# Export Hosts (CSV / NDJSON, streamed)
+# ---------------------------------------------------------
+@router.get("/api/hosts/export", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Hosts export"},
+    400: {"description": "Invalid format"},
+})
+def api_export_hosts(format: str = "csv"):
+
+    try:
+        fmt = resolve_format(format)
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "HOSTS_EXPORT_INVALID",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    columns = [c.strip() for c in HOST_COLUMNS.split(",")]
+    return StreamingResponse(
+        export_rows(iter_hosts, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="hosts.{fmt}"'},
+    )
+
 # ---------------------------------------------------------
 # Get Host
 # ---------------------------------------------------------
@@ -70,13 +234,13 @@ def api_get_hosts():
     404: {"description": "Host not found"},
     500: {"description": "Internal server error"},
 })
-def api_get_host(host_id: int):
+async def api_get_host(host_id: int):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        host = get_host(host_id)
+        host = await run_read(get_host, host_id)
 
     except Exception as err:
         logger.exception("Error getting host %s: %s", host_id, str(err).strip())
@@ -119,14 +283,14 @@ def api_get_host(host_id: int):
     409: {"description": "Host already present"},
     500: {"description": "Internal server error"},
 })
-def api_add_host(data: dict):
+async def api_add_host(data: dict):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
     host_id = None
 
     try:
-        host_id = add_host(data)
+        host_id = await run_write(add_host, data)
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
                 "code": "HOST_ADDED",
@@ -176,15 +340,16 @@ def api_add_host(data: dict):
 @router.put("/api/hosts/{host_id}", status_code=status.HTTP_200_OK, responses={
     200: {"description": "Host updated"},
     404: {"description": "Host not found"},
+    409: {"description": "Host name, IPv4 or MAC already used"},
     500: {"description": "Internal server error"},
 })
-def api_update_host(data: dict, host_id: int):
+async def api_update_host(data: dict, host_id: int):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        update_host(host_id, data)
+        await run_write(update_host, host_id, data)
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
                 "code": "HOST_UPDATED",
@@ -196,6 +361,22 @@ def api_update_host(data: dict, host_id: int):
                 },
             }
 
+    # Duplicate name / ipv4 / mac
+    except sqlite3.IntegrityError:
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "HOST_ALREADY_PRESENT",
+                "status": "failure",
+                "message": "Host name, IPv4 or MAC already used by another host",
+                "details": {
+                    "host_id": host_id,
+                    "took_ms": took_ms,
+                },
+            },
+        )
+
     # Not Found
     except ValueError:
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
@@ -236,13 +417,13 @@ def api_update_host(data: dict, host_id: int):
     404: {"description": "Host not found"},
     500: {"description": "Internal server error"},
 })
-def api_delete_host(host_id: int):
+async def api_delete_host(host_id: int):
 
     # Inizializzazioni
     start_ns = time.monotonic_ns()
 
     try:
-        delete_host(host_id)
+        await run_write(delete_host, host_id)
         took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
         return {
                 "code": "HOST_DELETED",
@@ -1,16 +1,17 @@
 # backend/routes/localization.py
 
 # import standard modules
+import json
 from fastapi import APIRouter, Request, Response, HTTPException, status
 from fastapi.responses import FileResponse
 
 # Import Settings & Config
 from backend.settings.settings import settings
-from backend.db.settings import get_config
+from backend.db.settings import get_config, subscribe_config
 # Import Logging
 from backend.log.log import get_logger
 # Import Localization
-from backend.settings.localization import load_language
+from backend.settings.localization import load_language, swap_language
 
 # Logger initialization
 logger = get_logger(__name__)
@@ -18,6 +19,18 @@ logger = get_logger(__name__)
 # Create Router
 router = APIRouter()
 
+# ---------------------------------------------------------
+# Config subscriber: swap the translation cache to the new language
+# ---------------------------------------------------------
+@subscribe_config("LANGUAGE")
+def _on_language_change(changes):
+    lang = changes["LANGUAGE"][1]
+    try:
+        swap_language(lang)
+        logger.info("Language: %s (applied live)", lang)
+    except (FileNotFoundError, json.JSONDecodeError) as err:
+        logger.warning("Translations for '%s' not loaded: %s", lang, err)
+
 # ---------------------------------------------------------
 # FRONTEND PATHS (absolute paths inside Docker)
 # ---------------------------------------------------------
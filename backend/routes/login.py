@@ -3,10 +3,12 @@
 # import standard modules
 from fastapi import APIRouter, Request, Response, HTTPException, status
 from fastapi.responses import FileResponse, JSONResponse
-import time
+from starlette.concurrency import run_in_threadpool
 
 # Import local modules
-from backend.security import verify_login, apply_session, close_session
+from backend.security import verify_login, open_session, close_session, has_session_store
+from backend.ratelimit import get_limiter
+from backend.passwords import PasswordPoolBusy
 
 # Import Settings & Config
 from backend.settings.settings import settings
@@ -15,28 +17,15 @@ from backend.db.settings import get_config
 # Create Router
 router = APIRouter()
 
-# IP -> lista timestamp tentativi
-login_attempts = {}
+# Login attempts per IP (sliding window, shared by the workers with the SQLite backend)
+login_limiter = get_limiter(
+    "login",
+    lambda: get_config("LOGIN_MAX_ATTEMPTS"),
+    lambda: get_config("LOGIN_WINDOW_SECONDS"),
+)
 
 def check_rate_limit(ip: str):
-    now = time.time()
-    attempts = login_attempts.get(ip, [])
-    # tieni solo tentativi negli ultimi LOGIN_WINDOW_SECONDS secondi
-    attempts = [t for t in attempts if now - t < get_config("LOGIN_WINDOW_SECONDS")]
-
-    if len(attempts) >= get_config("LOGIN_MAX_ATTEMPTS"):
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail={
-                "code": "LOGIN_ERROR",
-                "status": "failure",
-                "message": "Too many login attempts"
-            },
-        )
-
-    # registra nuovo tentativo
-    attempts.append(now)
-    login_attempts[ip] = attempts
+    login_limiter.check(ip, code="LOGIN_ERROR", message="Too many login attempts")
 
 # ---------------------------------------------------------
 # FRONTEND PATHS (absolute paths inside Docker)
@@ -65,15 +54,30 @@ def session_js():
     403: {"description": "Account locked"}, # GRGR TBD
     429: {"description": "Too many login attempts"},
     500: {"description": "Internal server error"},
+    503: {"description": "Too many logins in progress"},
 })
-def api_login(request: Request, data: dict, response: Response):
+async def api_login(request: Request, data: dict, response: Response):
     ip = request.client.host
-    check_rate_limit(ip)
+    await run_in_threadpool(check_rate_limit, ip)
 
     user = data.get("username")
     pwd = data.get("password")
 
-    if verify_login(user, pwd):
+    try:
+        verified = await verify_login(user, pwd)
+    except PasswordPoolBusy:
+        # Every password worker busy: fail fast instead of queueing
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+            detail={
+                "code": "LOGIN_BUSY",
+                "status": "failure",
+                "message": "Too many logins in progress, retry shortly",
+            },
+        )
+
+    if verified:
         # check if HTTPS is required and the request is not secure
         if settings.HTTPS_ENABLED and request.url.scheme != "https":
             return JSONResponse(
@@ -86,9 +90,9 @@ def api_login(request: Request, data: dict, response: Response):
             )
 
         # reset tentativi su IP
-        login_attempts.pop(ip, None)
+        await run_in_threadpool(login_limiter.reset, ip)
 
-        apply_session(response, username=user)
+        await open_session(response, user)
         response.status_code = status.HTTP_200_OK
         return {
             "code": "LOGIN_SUCCESS",
@@ -109,13 +113,26 @@ def api_login(request: Request, data: dict, response: Response):
 # Logout API
 # ---------------------------------------------------------
 @router.post("/api/logout", status_code=status.HTTP_200_OK, responses={
-    200: {"description": "Logout successful"}
+    200: {"description": "Logout successful"},
+    409: {"description": "Logout everywhere needs the server-side session store"},
 })
-def api_logout(response: Response):
-    close_session(response)
+async def api_logout(request: Request, response: Response, everywhere: bool = False):
+    # Cookie sessions cannot be revoked before they expire
+    if everywhere and not has_session_store():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "SESSION_STORE_REQUIRED",
+                "status": "failure",
+                "message": "Logout everywhere requires SESSION_STORE=sqlite",
+            },
+        )
+
+    closed = await close_session(request, response, everywhere=everywhere)
     response.status_code = status.HTTP_200_OK
     return {
         "code": "LOGOUT_SUCCESS",
         "status": "success",
         "message": "Logout successful",
+        "details": {"sessions_closed": closed},
     }
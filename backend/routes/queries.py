@@ -0,0 +1,89 @@
+# backend/routes/queries.py
+
+# import standard modules
+from fastapi import APIRouter, HTTPException, Query, status
+import time
+
+# Import local modules
+from backend.db.querystats import get_query_stats, reset_query_stats
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Create Router
+router = APIRouter()
+
+# ---------------------------------------------------------
+# Get per-statement SQL timings and the slow-query log
+# ---------------------------------------------------------
+@router.get("/api/db/queries", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Statement statistics and slow queries (empty unless DB_QUERY_STATS is enabled)"},
+    400: {"description": "Invalid sort"},
+    500: {"description": "Internal server error"},
+})
+def api_get_query_stats(
+    sort: str = "total_ms",
+    limit: int = Query(50, ge=1, le=500),
+):
+
+    try:
+        return get_query_stats(sort=sort, limit=limit)
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "DB_QUERIES_INVALID_QUERY",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    except Exception as err:
+        logger.exception("Error getting query statistics: %s", str(err).strip())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "DB_QUERIES_ERROR",
+                "status": "failure",
+                "message": "Internal error getting query statistics",
+            },
+        )
+
+# ---------------------------------------------------------
+# Reset SQL timings and the slow-query log
+# ---------------------------------------------------------
+@router.delete("/api/db/queries", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Statistics cleared"},
+    500: {"description": "Internal server error"},
+})
+def api_reset_query_stats():
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        reset_query_stats()
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return {
+            "code": "DB_QUERIES_RESET",
+            "status": "success",
+            "message": "Query statistics cleared",
+            "took_ms": took_ms,
+        }
+
+    except Exception as err:
+        logger.exception("Error resetting query statistics: %s", str(err).strip())
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "DB_QUERIES_RESET_ERROR",
+                "status": "failure",
+                "message": "Internal error resetting query statistics",
+                "took_ms": took_ms,
+            },
+        )
@@ -0,0 +1,75 @@
+# backend/routes/regeneration.py
+
+# import standard modules
+from fastapi import APIRouter, HTTPException, status
+import time
+
+# Import local modules
+from backend.regeneration import get_status, request_regeneration
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Create Router
+router = APIRouter()
+
+# ---------------------------------------------------------
+# Get regeneration queue state and last-run timings
+# ---------------------------------------------------------
+@router.get("/api/regeneration", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Regeneration status"},
+    500: {"description": "Internal server error"},
+})
+def api_regeneration_status():
+
+    try:
+        return get_status()
+
+    except Exception as err:
+        logger.exception("Error getting regeneration status: %s", str(err).strip())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "REGEN_STATUS_ERROR",
+                "status": "failure",
+                "message": "Internal error getting regeneration status",
+            },
+        )
+
+# ---------------------------------------------------------
+# Enqueue a regeneration (skips the debounce window)
+# ---------------------------------------------------------
+@router.post("/api/regeneration", status_code=status.HTTP_202_ACCEPTED, responses={
+    202: {"description": "Regeneration queued"},
+    500: {"description": "Internal server error"},
+})
+def api_regeneration_request():
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        request_regeneration("manual", immediate=True)
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        return {
+            "code": "REGEN_QUEUED",
+            "status": "success",
+            "message": "Regeneration queued",
+            "took_ms": took_ms,
+        }
+
+    except Exception as err:
+        logger.exception("Error queuing regeneration: %s", str(err).strip())
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "REGEN_QUEUE_ERROR",
+                "status": "failure",
+                "message": "Internal error queuing regeneration",
+                "took_ms": took_ms,
+            },
+        )
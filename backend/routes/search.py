@@ -0,0 +1,86 @@
+# backend/routes/search.py
+
+# import standard modules
+from fastapi import APIRouter, HTTPException, Query, status
+import sqlite3
+import time
+from typing import Optional
+
+# Import local modules
+from backend.db.aio import run_read
+from backend.db.search import MAX_SEARCH_RESULTS, search
+
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Create Router
+router = APIRouter()
+
+# ---------------------------------------------------------
+# Search hosts, aliases and leases
+# ---------------------------------------------------------
+@router.get("/api/search", status_code=status.HTTP_200_OK, responses={
+    200: {"description": "Ranked results ({type: host|alias|lease, ...})"},
+    400: {"description": "Empty search or invalid parameters"},
+    503: {"description": "Search index still being built"},
+    500: {"description": "Internal server error"},
+})
+async def api_search(
+    q: str = Query(..., max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    types: Optional[str] = Query(None, description="Comma-separated result types (host, alias, lease)"),
+):
+
+    # Inizializzazioni
+    start_ns = time.monotonic_ns()
+
+    try:
+        wanted = [t.strip() for t in types.split(",") if t.strip()] if types else None
+        result = await run_read(search, q, limit=limit, types=wanted)
+        result["took_ms"] = (time.monotonic_ns() - start_ns) / 1_000_000
+        return result
+
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "SEARCH_INVALID_QUERY",
+                "status": "failure",
+                "message": str(err),
+            },
+        )
+
+    # Index created by a background migration after an upgrade
+    except sqlite3.OperationalError as err:
+        if "no such table" not in str(err):
+            logger.exception("Error searching: %s", str(err).strip())
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={
+                    "code": "SEARCH_ERROR",
+                    "status": "failure",
+                    "message": "Internal error searching",
+                },
+            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "code": "SEARCH_INDEX_BUILDING",
+                "status": "failure",
+                "message": "Search index is being built, retry shortly",
+            },
+        )
+
+    except Exception as err:
+        logger.exception("Error searching: %s", str(err).strip())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "SEARCH_ERROR",
+                "status": "failure",
+                "message": "Internal error searching",
+            },
+        )
@@ -1,16 +1,18 @@
 # backend/routes/settings.py
 
 # import standard modules
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import FileResponse
 import time
 
 # Import local modules
+from backend.ratelimit import client_ip, sensitive_limiter, sensitive_rate_limit
 from backend.db.settings import (
     get_configs,
     get_config,
     update_config,
 )
+from backend.etag import data_etag, not_modified, set_etag
 
 # Import Settings
 from backend.settings.settings import settings
@@ -41,14 +43,27 @@ def settings_js():
 # ---------------------------------------------------------
 @router.get("/api/settings", status_code=status.HTTP_200_OK, responses={
     200: {"description": "Settings found"},
+    304: {"description": "Not modified (If-None-Match)"},
+    429: {"description": "Too many requests (Retry-After)"},
     500: {"description": "Internal server error"},
 })
-def api_get_configs():
+def api_get_configs(request: Request, response: Response):
 
     try:
+        # Unchanged settings: 304 without reading any row (nor counting the request)
+        etag = data_etag(("config",))
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        sensitive_limiter.check(client_ip(request))
+        set_etag(response, etag)
+
         configs = get_configs()
         return configs or []
 
+    except HTTPException:
+        raise
+
     except Exception as err:
         logger.exception("Error getting list of the configuration parameters %s", str(err).strip())
         raise HTTPException(
@@ -63,9 +78,10 @@ def api_get_configs():
 # ---------------------------------------------------------
 # Get a configuration parameter
 # ---------------------------------------------------------
-@router.get("/api/settings/{config_key}", status_code=status.HTTP_200_OK, responses={
+@router.get("/api/settings/{config_key}", dependencies=[Depends(sensitive_rate_limit)], status_code=status.HTTP_200_OK, responses={
     200: {"description": "Configuration parameter found"},
     404: {"description": "Configuration parameter not found"},
+    429: {"description": "Too many requests (Retry-After)"},
     500: {"description": "Internal server error"},
 })
 def api_get_setting(config_key: str):
@@ -111,10 +127,11 @@ def api_get_setting(config_key: str):
 # ---------------------------------------------------------
 # Update config
 # ---------------------------------------------------------
-@router.put("/api/settings/{config_key}", status_code=status.HTTP_201_CREATED, responses={
+@router.put("/api/settings/{config_key}", dependencies=[Depends(sensitive_rate_limit)], status_code=status.HTTP_201_CREATED, responses={
     201: {"description": "Configuration parameter updated"},
     400: {"description": "Invalid request"},
     404: {"description": "Configuration parameter not found"},
+    429: {"description": "Too many requests (Retry-After)"},
     500: {"description": "Internal server error"},
 })
 def api_update_setting(data: dict, config_key: str):
@@ -132,6 +149,7 @@ def api_update_setting(data: dict, config_key: str):
                     "message": "Configuration parameter updated successfully",
                     "details": {
                         "config_key": config_key,
+                        "restart_required": result.get("restart_required", False),
                         "took_ms": took_ms,
                     },
                 }
@@ -191,10 +209,11 @@ def api_update_setting(data: dict, config_key: str):
 # ---------------------------------------------------------
 # Reset config to default
 # ---------------------------------------------------------
-@router.post("/api/settings/{config_key}/reset", status_code=status.HTTP_200_OK, responses={
+@router.post("/api/settings/{config_key}/reset", dependencies=[Depends(sensitive_rate_limit)], status_code=status.HTTP_200_OK, responses={
     200: {"description": "Configuration parameter restored to default"},
     400: {"description": "Invalid request"},
     404: {"description": "Configuration parameter not found"},
+    429: {"description": "Too many requests (Retry-After)"},
     500: {"description": "Internal server error"},
 })
 def api_reset_config(config_key: str):
@@ -212,6 +231,7 @@ def api_reset_config(config_key: str):
                     "message": "Configuration parameter restored to default successfully",
                     "details": {
                         "config_key": config_key,
+                        "restart_required": result.get("restart_required", False),
                         "took_ms": took_ms,
                     },
                 }
@@ -3,14 +3,13 @@
 # Import standard modules
 from fastapi import APIRouter
 from datetime import datetime, timezone
-import os
-import signal
 import threading
 import time
 
 # Import Settings & Config
 from backend.settings.settings import settings
 from backend.db.settings import get_config
+from backend.server import request_restart
 
 # Create Router
 router = APIRouter()
@@ -35,9 +34,10 @@ def about():
 @router.post("/api/restart")
 def restart():
 
+    # Rolling restart when supervised (the port keeps being served)
     def do_restart():
         time.sleep(0.5)
-        os.kill(os.getpid(), signal.SIGTERM)
+        request_restart()
 
     threading.Thread(
         target=do_restart,
@@ -1,13 +1,24 @@
 # backend/security.py
 
 # Import standard modules
-import bcrypt
-import os
-from fastapi import Request, HTTPException
-from itsdangerous import TimestampSigner, BadSignature, SignatureExpired
+import secrets
+import time
+from typing import Any, Dict, NamedTuple, Optional
+from fastapi import Request
+from itsdangerous import TimestampSigner, BadSignature
 
 # Import local modules
 from backend.db.users import get_user_by_username
+from backend.db.sessions import (
+    count_sessions,
+    create_session,
+    delete_session,
+    delete_user_sessions,
+    get_session as get_stored_session,
+    touch_session,
+)
+from backend.db.aio import run_read, run_write
+from backend.passwords import check_password
 
 # Import Settings
 from backend.settings.settings import settings
@@ -19,79 +30,178 @@ logger = get_logger(__name__)
 
 signer = TimestampSigner(settings.SECRET_KEY)
 
+# request.state marker: session cookie not verified yet
+_UNVERIFIED = object()
+
 # -----------------------------
 # Verify Login
 # -----------------------------
-def verify_login(username, password):
+async def verify_login(username, password):
 
-    user = get_user_by_username(username)
-    if not user:
-        logger.error("Login failed - user %s not found", username)
-        return False
+    user = await run_read(get_user_by_username, username)
 
-    if user["status"] != "active":
-        logger.error("Login Failed - user %s disabled", username)
+    # Unknown and disabled users cost a bcrypt check too (same response time)
+    if not user or user["status"] != "active":
+        await check_password(password, None)
+        if not user:
+            logger.error("Login failed - user %s not found", username)
+        else:
+            logger.error("Login Failed - user %s disabled", username)
         return False
 
-    if not bcrypt.checkpw(password.encode(), user["password_hash"].encode()):
+    if not await check_password(password, user["password_hash"]):
         logger.error("Login Failed - password wrong for user %s", username)
         return False
 
     logger.debug("Login successful - user %s", username)
     return True
 
-# ----------------------------
-# creates or renew the cookie
-# ----------------------------
-def apply_session(response, username: str | None = None, token: str | None = None):
+# Session cookie name
+SESSION_COOKIE = "session"
 
-    # First Login
-    if username is not None and token is None:
-        token = signer.sign(username).decode()
-        logger.debug("Session created - %s", username)
+class Session(NamedTuple):
+    username: str
+    token: str
+    issued_at: float
+    # Server-side store only (SESSION_STORE=sqlite)
+    session_id: Optional[str] = None
 
-    if username is None:
-        username = signer.unsign(token, max_age=86400).decode()
-        logger.debug("Session updated - %s", username)
+    @property
+    def expires_at(self) -> float:
+        return self.issued_at + settings.SESSION_MAX_AGE_SECONDS
 
-    if username is None or token is None:
-        logger.error("Session Error - missing username or token")
-        return
+_stats: Dict[str, int] = {
+    "opened": 0,
+    "verified": 0,
+    "rejected": 0,
+    "renewed": 0,
+    "closed": 0,
+}
 
+# -----------------------------
+# Sessions kept server-side (SESSION_STORE)
+# -----------------------------
+def has_session_store() -> bool:
+    return (settings.SESSION_STORE or "cookie").lower() == "sqlite"
+
+# -----------------------------
+# Internal: set the session cookie
+# -----------------------------
+def _set_cookie(response, token: str) -> None:
     response.set_cookie(
-        "session",
+        SESSION_COOKIE,
         token,
         httponly=True,
         secure=settings.HTTPS_ENABLED,
         samesite="Strict",
         path="/",
-        max_age=86400,
+        max_age=settings.SESSION_MAX_AGE_SECONDS,
     )
 
 # -----------------------------
-# check session cookie
+# Internal: verify a session token (one HMAC, one lookup on the read executor with the store)
 # -----------------------------
-def is_logged_in(request: Request) -> bool:
-
-    token = request.cookies.get("session")
+async def _verify(token: Optional[str]) -> Optional[Session]:
     if not token:
-        return False
+        return None
     try:
-        signer.unsign(token, max_age=86400)
-        return True
-    except (BadSignature, SignatureExpired):
+        value, signed_at = signer.unsign(token, max_age=settings.SESSION_MAX_AGE_SECONDS, return_timestamp=True)
+    except BadSignature:
+        # SignatureExpired included
+        _stats["rejected"] += 1
+        return None
+
+    value = value.decode()
+    if has_session_store():
+        stored = await run_read(get_stored_session, value)
+        if stored is None:
+            _stats["rejected"] += 1
+            return None
+        session = Session(stored["username"], token, signed_at.timestamp(), value)
+    else:
+        session = Session(value, token, signed_at.timestamp())
+
+    _stats["verified"] += 1
+    return session
+
+# ----------------------------
+# Open a session (login) and set its cookie
+# ----------------------------
+async def open_session(response, username: str) -> Session:
+    value = username
+    session_id = None
+    if has_session_store():
+        value = session_id = secrets.token_urlsafe(32)
+        await run_write(create_session, session_id, username, time.time() + settings.SESSION_MAX_AGE_SECONDS)
+
+    token = signer.sign(value).decode()
+    _set_cookie(response, token)
+    _stats["opened"] += 1
+    logger.debug("Session created - %s", username)
+    return Session(username, token, time.time(), session_id)
+
+# -----------------------------
+# Session of the request (verified once, cached on request.state)
+# -----------------------------
+async def get_session(request: Request) -> Optional[Session]:
+    session = getattr(request.state, "session", _UNVERIFIED)
+    if session is _UNVERIFIED:
+        session = await _verify(request.cookies.get(SESSION_COOKIE))
+        request.state.session = session
+        request.state.user = session.username if session else None
+    return session
+
+# -----------------------------
+# check session cookie
+# -----------------------------
+async def is_logged_in(request: Request) -> bool:
+    return await get_session(request) is not None
+
+# ----------------------------
+# Sliding expiration: new cookie only when the session nears its end
+# ----------------------------
+async def renew_session(response, session: Session) -> bool:
+    max_age = settings.SESSION_MAX_AGE_SECONDS
+    if session.expires_at - time.time() >= max_age * settings.SESSION_RENEW_PERCENT / 100:
         return False
 
+    if session.session_id:
+        await run_write(touch_session, session.session_id, time.time() + max_age)
+    _set_cookie(response, signer.sign(session.session_id or session.username).decode())
+    _stats["renewed"] += 1
+    logger.debug("Session renewed - %s", session.username)
+    return True
+
 # -----------------------------
-# Close Session
+# Close Session (everywhere: every session of the user, store only)
 # -----------------------------
-def close_session(response):
+async def close_session(request: Request, response, everywhere: bool = False) -> int:
+
+    closed = 0
+    session = await get_session(request)
+    if session is not None and session.session_id:
+        if everywhere:
+            closed = await run_write(delete_user_sessions, session.username)
+        else:
+            closed = await run_write(delete_session, session.session_id)
 
     response.delete_cookie(
-        key="session",
+        key=SESSION_COOKIE,
         path="/",
         samesite="Strict",
         secure=settings.HTTPS_ENABLED,
     )
 
+    _stats["closed"] += 1
     logger.debug("Session closed")
+    return closed
+
+# -----------------------------
+# Session statistics
+# -----------------------------
+def get_stats() -> Dict[str, Any]:
+    return {
+        "store": "sqlite" if has_session_store() else "cookie",
+        "active": count_sessions() if has_session_store() else None,
+        **_stats,
+    }
@@ -1,17 +1,101 @@
 # backend/server.py
 
 # import standard modules
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
 import uvicorn
 
 # Import Settings & Config
 from backend.settings.settings import settings
-from backend.db.settings import get_config
+from backend.db.settings import CONFIG_DEFAULTS, get_config, subscribe_config
 # Import Logging
 from backend.log.log import get_logger
 
 # Logger initialization
 logger = get_logger(__name__)
 
+# Config keys only applied by new workers
+RESTART_CONFIG = tuple(k for k, meta in CONFIG_DEFAULTS.items() if meta.get("restart"))
+
+# Pause before respawning a worker that died (doubled while it keeps failing to start)
+RESPAWN_DELAY_SECONDS = 1.0
+MAX_RESPAWN_DELAY_SECONDS = 30.0
+
+# Supervisor of this worker process (None when serving alone)
+_supervisor_pid: Optional[int] = None
+
+# Whether this process runs the database jobs (the only process, or worker 0 of the supervisor)
+_primary = True
+
+# ------------------------------------------------------------------------------
+# Internal: Uvicorn options shared by both serving modes
+# ------------------------------------------------------------------------------
+def _uvicorn_options() -> dict:
+    return {
+        "proxy_headers": True,
+        "forwarded_allow_ips": "*",
+        "log_level": (get_config("LOG_LEVEL") or "info").lower(),
+        "log_config": None,
+        "timeout_graceful_shutdown": settings.HTTP_GRACEFUL_SECONDS,
+    }
+
+# ------------------------------------------------------------------------------
+# Restart the application (rolling when supervised)
+# ------------------------------------------------------------------------------
+def request_restart() -> bool:
+    """
+    Supervised workers ask the supervisor for a rolling restart: the port
+    keeps being served while the workers are replaced one at a time.
+    Returns False when the process stops and relies on being restarted
+    from outside (Docker restart policy).
+    """
+    if _supervisor_pid is not None:
+        os.kill(_supervisor_pid, signal.SIGHUP)
+        return True
+
+    os.kill(os.getpid(), signal.SIGTERM)
+    return False
+
+# ------------------------------------------------------------------------------
+# Whether this process runs the database jobs (app lifespan)
+# ------------------------------------------------------------------------------
+def is_primary_worker() -> bool:
+    """
+    Compaction, maintenance and online migrations run in one process:
+    the server when serving alone, worker 0 when supervised (its
+    replacement takes over on respawn and rolling restart).
+    """
+    return _primary
+
+# ------------------------------------------------------------------------------
+# Take over the database jobs when the supervisor hands them over (app lifespan)
+# ------------------------------------------------------------------------------
+def on_promotion(callback: Callable[[], None]) -> None:
+    """
+    A replacement of worker 0 starts without the database jobs while the
+    worker it replaces is still draining; the supervisor sends SIGUSR1
+    once that worker exited. callback runs in the event loop, once.
+    """
+    if _primary or _supervisor_pid is None:
+        return
+
+    def promote() -> None:
+        global _primary
+        if _primary:
+            return
+        _primary = True
+        logger.info(f"SERVER: Worker {os.getpid()} takes over the database jobs")
+        callback()
+
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, promote)
+
 # ------------------------------------------------------------------------------
 # Starting the server with Uvicorn
 # ------------------------------------------------------------------------------
@@ -20,22 +104,221 @@ def run_server(app):
     # Uvicorn config da settings with fallback
     host=(settings.HTTP_HOST or "0.0.0.0")
     port=(settings.HTTP_PORT or 8000)
-    log_level=(get_config("LOG_LEVEL") or "info").lower()
-    workers = 1 # GRGR in prod valuta gunicorn+uvicorn workers
     #reload = os.getenv("UVICORN_RELOAD", "false").lower() == "true"
     reload = bool(getattr(settings, "DEV_RELOAD", False))
+    options = _uvicorn_options()
 
-    logger.info(f"Server running on http://{host}:{port} (reload={reload}, log_level={log_level})")
+    logger.info(f"Server running on http://{host}:{port} (reload={reload}, log_level={options['log_level']})")
 
     uvicorn.run(
         app,
         host=host,
         port=port,
-        proxy_headers=True,
-        forwarded_allow_ips="*",
-        log_level=log_level,
         #access_log=True,
-        log_config=None,
-        workers=(1 if reload else workers),
+        workers=1,
         reload=reload,
+        **options,
     )
+
+# ------------------------------------------------------------------------------
+# Worker: Uvicorn server reporting when it accepts connections
+# ------------------------------------------------------------------------------
+class _WorkerServer(uvicorn.Server):
+
+    def __init__(self, config: uvicorn.Config, ready):
+        super().__init__(config)
+        self._ready = ready
+
+    async def startup(self, sockets=None):
+        # Lifespan (warm-up included) first, then the listening socket
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            self._ready.set()
+
+# ------------------------------------------------------------------------------
+# Worker: entry point of a supervised worker process (spawned)
+# ------------------------------------------------------------------------------
+def _worker_main(sock: socket.socket, ready, supervisor_pid: int, primary: bool) -> None:
+    global _supervisor_pid, _primary
+
+    from backend.bootstrap import bootstrap_worker
+    from backend.app import create_app
+
+    _supervisor_pid = supervisor_pid
+    _primary = primary
+    bootstrap_worker()
+
+    # Config changes that need new workers
+    if RESTART_CONFIG:
+        subscribe_config(*RESTART_CONFIG)(lambda changes: request_restart())
+
+    server = _WorkerServer(uvicorn.Config(create_app(), **_uvicorn_options()), ready)
+    server.run(sockets=[sock])
+
+# ------------------------------------------------------------------------------
+# Supervisor: N workers sharing one listening socket
+# ------------------------------------------------------------------------------
+class Supervisor:
+    """
+    The supervisor binds the port once and spawns the workers, which
+    accept on the shared socket only after their startup (warm-up
+    included), so no connection waits on a cold worker. Worker 0 alone
+    runs the database jobs. SIGHUP replaces
+    the workers one at a time, each only once its replacement is ready;
+    a replaced worker stops accepting and finishes its requests. The
+    replacement of worker 0 gets the database jobs (SIGUSR1) only once
+    the worker it replaces exited: two processes never run them at once.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.ctx = multiprocessing.get_context("spawn")
+        self.sock: Optional[socket.socket] = None
+        self.procs: List[multiprocessing.Process] = []
+        self.draining: List[multiprocessing.Process] = []
+        # Process running the database jobs (possibly a draining worker 0)
+        self.primary: Optional[multiprocessing.Process] = None
+        self.stop = threading.Event()
+        self.roll = threading.Event()
+        self.respawn_delay = RESPAWN_DELAY_SECONDS
+
+    # Listening socket shared by the workers
+    def _bind(self) -> socket.socket:
+        host = settings.HTTP_HOST or "0.0.0.0"
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, settings.HTTP_PORT or 8000))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    # Start a worker, wait until it accepts connections
+    def _spawn(self, primary: bool = False) -> Optional[multiprocessing.Process]:
+        ready = self.ctx.Event()
+        proc = self.ctx.Process(
+            target=_worker_main,
+            args=(self.sock, ready, os.getpid(), primary),
+            name="http-worker",
+        )
+        proc.start()
+
+        deadline = time.monotonic() + settings.HTTP_WORKER_READY_SECONDS
+        while not ready.wait(0.1):
+            if not proc.is_alive() or time.monotonic() > deadline or self.stop.is_set():
+                logger.error(f"SERVER: Worker {proc.pid} not ready (exit code {proc.exitcode}), stopping it")
+                self._terminate(proc)
+                return None
+
+        logger.info(f"SERVER: Worker {proc.pid} ready")
+        return proc
+
+    # Start worker 0: primary unless the previous one still runs the database jobs
+    def _spawn_first(self) -> Optional[multiprocessing.Process]:
+        primary = self.primary is None or not self.primary.is_alive()
+        proc = self._spawn(primary=primary)
+        if proc is not None and primary:
+            self.primary = proc
+        return proc
+
+    # Hand the database jobs over to worker 0 once the previous primary exited
+    def _hand_over(self) -> None:
+        first = self.procs[0] if self.procs else None
+        if first is None or first is self.primary or not first.is_alive():
+            return
+        if self.primary is not None and self.primary.is_alive():
+            return
+        os.kill(first.pid, signal.SIGUSR1)
+        self.primary = first
+        logger.info(f"SERVER: Database jobs handed over to worker {first.pid}")
+
+    # Graceful stop (SIGTERM: no new connections, in-flight requests finish)
+    def _terminate(self, proc: multiprocessing.Process, wait: bool = True) -> None:
+        if proc.is_alive():
+            proc.terminate()
+        if wait:
+            proc.join(settings.HTTP_GRACEFUL_SECONDS + 5)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+
+    # Replace the workers one at a time
+    def _rolling_restart(self) -> None:
+        start_ns = time.monotonic_ns()
+        logger.info(f"SERVER: Rolling restart of {len(self.procs)} worker(s)")
+
+        for i, old in enumerate(list(self.procs)):
+            new = self._spawn_first() if i == 0 else self._spawn()
+            if new is None:
+                # Old workers keep serving
+                logger.error("SERVER: Rolling restart abandoned")
+                return
+            self.procs[i] = new
+            self._terminate(old, wait=False)
+            self.draining.append(old)
+
+        took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+        logger.info(f"SERVER: Rolling restart completed in {took_ms:.0f} ms")
+
+    # Reap drained workers, replace the ones that died
+    def _check_workers(self) -> None:
+        for proc in list(self.draining):
+            if not proc.is_alive():
+                proc.join()
+                self.draining.remove(proc)
+        self._hand_over()
+
+        for i, proc in enumerate(self.procs):
+            if proc.is_alive():
+                continue
+            logger.error(f"SERVER: Worker {proc.pid} exited (code {proc.exitcode}), respawning")
+            new = self._spawn_first() if i == 0 else self._spawn()
+            if new is None:
+                # Back off while workers cannot start
+                self.stop.wait(self.respawn_delay)
+                self.respawn_delay = min(self.respawn_delay * 2, MAX_RESPAWN_DELAY_SECONDS)
+                return
+            self.procs[i] = new
+            self.respawn_delay = RESPAWN_DELAY_SECONDS
+
+    def run(self) -> None:
+        # One session secret for every worker (and every restart)
+        os.environ["SESSION_SECRET"] = settings.SECRET_KEY
+
+        self.sock = self._bind()
+        signal.signal(signal.SIGHUP, lambda *_: self.roll.set())
+        signal.signal(signal.SIGTERM, lambda *_: self.stop.set())
+        signal.signal(signal.SIGINT, lambda *_: self.stop.set())
+
+        logger.info(
+            f"Server running on http://{settings.HTTP_HOST}:{settings.HTTP_PORT} "
+            f"({self.workers} workers, supervisor {os.getpid()})"
+        )
+
+        try:
+            for i in range(self.workers):
+                proc = self._spawn_first() if i == 0 else self._spawn()
+                if proc is None:
+                    raise RuntimeError("HTTP worker failed to start")
+                self.procs.append(proc)
+
+            while not self.stop.wait(0.5):
+                if self.roll.is_set():
+                    self._rolling_restart()
+                    # Restarts requested meanwhile are covered by this one
+                    self.roll.clear()
+                self._check_workers()
+
+        finally:
+            logger.info("SERVER: Stopping workers")
+            for proc in self.procs + self.draining:
+                self._terminate(proc, wait=False)
+            for proc in self.procs + self.draining:
+                self._terminate(proc)
+            self.sock.close()
+
+# ------------------------------------------------------------------------------
+# Starting the supervised workers
+# ------------------------------------------------------------------------------
+def run_supervisor(workers: int) -> None:
+    Supervisor(workers).run()
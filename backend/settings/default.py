@@ -15,6 +15,21 @@ DATA_PATH = "/data"
 # ---------------------------------------------------------
 DB_FILE = "database.db"
 DB_RESET = False
+DB_SYNCHRONOUS = "NORMAL"
+DB_CACHE_SIZE_KB = 16384
+DB_MMAP_SIZE_MB = 256
+DB_BUSY_TIMEOUT_MS = 5000
+DB_READ_WORKERS = 4
+DB_GROUP_COMMIT_MS = 2
+DB_GROUP_COMMIT_MAX = 256
+DB_QUERY_STATS = False
+DB_SLOW_QUERY_MS = 100
+DB_MAINTENANCE_INTERVAL_SECONDS = 60
+DB_MAINTENANCE_STEP_MS = 5
+DB_MAINTENANCE_IDLE_SECONDS = 30
+DB_WAL_CHECKPOINT_MB = 16
+DB_ANALYZE_ROWS = 10000
+DB_VACUUM_FREE_PERCENT = 10
 
 # ---------------------------------------------------------
 # Language
@@ -41,9 +56,21 @@ TRUSTED_HOSTS="127.0.0.1,localhost,*"
 # ---------------------------------------------------------
 HTTP_HOST = "0.0.0.0"
 HTTP_PORT = 8000
+HTTP_WORKERS = 1
+HTTP_WORKER_READY_SECONDS = 60
+HTTP_GRACEFUL_SECONDS = 30
 HTTPS_ENABLED = False
 LOGIN_MAX_ATTEMPTS = 5
 LOGIN_WINDOW_SECONDS = 600
+RATE_LIMIT_BACKEND = "auto"
+RATE_LIMIT_MAX_KEYS = 10000
+RATE_LIMIT_SENSITIVE_REQUESTS = 120
+RATE_LIMIT_SENSITIVE_WINDOW_SECONDS = 60
+PASSWORD_WORKERS = 2
+PASSWORD_QUEUE_SIZE = 8
+SESSION_STORE = "cookie"
+SESSION_MAX_AGE_SECONDS = 86400
+SESSION_RENEW_PERCENT = 50
 
 # ---------------------------------------------------------
 # Admin
@@ -66,12 +93,31 @@ DHCP4_HOST_FILE="/dhcp/etc/hosts-ipv4.json"
 DHCP4_LEASES_FILE="/dhcp/lib/dhcp4.leases"
 DHCP6_HOST_FILE="/dhcp/etc/hosts-ipv6.json"
 DHCP6_LEASES_FILE="/dhcp/lib/dhcp6.leases"
+DHCP4_SUBNETS = ""
+KEA_CONTROL_URL = ""
+KEA_SUBNET4_ID = 0
+
+# ---------------------------------------------------------
+# Regeneration (DNS + DHCP)
+# ---------------------------------------------------------
+REGEN_DEBOUNCE_SECONDS = 5
+REGEN_MAX_DELAY_SECONDS = 120
 
 # ---------------------------------------------------------
 # Backup
 # ---------------------------------------------------------
 BACKUP_PATH = "backup"
 
+# ---------------------------------------------------------
+# Import / Export
+# ---------------------------------------------------------
+IMPORT_BATCH_SIZE = 1000
+
+# ---------------------------------------------------------
+# Changes journal
+# ---------------------------------------------------------
+CHANGES_RETENTION_DAYS = 30
+
 # ---------------------------------------------------------
 # APP Features
 # ---------------------------------------------------------
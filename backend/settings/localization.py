@@ -36,6 +36,14 @@ def load_language(lang: str, fallback: bool = True):
 
     return _translations[lang]
 
+def swap_language(lang: str):
+    """Replace the cache with a fresh copy of lang (other languages reload on use)."""
+    global _translations
+
+    with open(LOCALES_DIR / f"{lang}.json", encoding="utf-8") as f:
+        translations = {lang: json.load(f)}
+    _translations = translations
+
 def t(key: str, lang: str):
     translations = load_language(lang)
     return translations.get(key, key)
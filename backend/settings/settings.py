@@ -78,6 +78,21 @@ class Settings(BaseModel):
     # Database
     DB_FILE: Path = Field(default_factory=lambda: Path(os.getenv("DB_FILE", default.DB_FILE)))
     DB_RESET: bool = Field(default_factory=lambda: to_bool(os.getenv("DB_RESET"), default.DB_RESET))
+    DB_SYNCHRONOUS: str = Field(default_factory=lambda: os.getenv("DB_SYNCHRONOUS", default.DB_SYNCHRONOUS).upper())
+    DB_CACHE_SIZE_KB: int = Field(default_factory=lambda: to_int(os.getenv("DB_CACHE_SIZE_KB"), default.DB_CACHE_SIZE_KB))
+    DB_MMAP_SIZE_MB: int = Field(default_factory=lambda: to_int(os.getenv("DB_MMAP_SIZE_MB"), default.DB_MMAP_SIZE_MB))
+    DB_BUSY_TIMEOUT_MS: int = Field(default_factory=lambda: to_int(os.getenv("DB_BUSY_TIMEOUT_MS"), default.DB_BUSY_TIMEOUT_MS))
+    DB_READ_WORKERS: int = Field(default_factory=lambda: to_int(os.getenv("DB_READ_WORKERS"), default.DB_READ_WORKERS))
+    DB_GROUP_COMMIT_MS: int = Field(default_factory=lambda: to_int(os.getenv("DB_GROUP_COMMIT_MS"), default.DB_GROUP_COMMIT_MS))
+    DB_GROUP_COMMIT_MAX: int = Field(default_factory=lambda: to_int(os.getenv("DB_GROUP_COMMIT_MAX"), default.DB_GROUP_COMMIT_MAX))
+    DB_QUERY_STATS: bool = Field(default_factory=lambda: to_bool(os.getenv("DB_QUERY_STATS"), default.DB_QUERY_STATS))
+    DB_SLOW_QUERY_MS: int = Field(default_factory=lambda: to_int(os.getenv("DB_SLOW_QUERY_MS"), default.DB_SLOW_QUERY_MS))
+    DB_MAINTENANCE_INTERVAL_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("DB_MAINTENANCE_INTERVAL_SECONDS"), default.DB_MAINTENANCE_INTERVAL_SECONDS))
+    DB_MAINTENANCE_STEP_MS: int = Field(default_factory=lambda: to_int(os.getenv("DB_MAINTENANCE_STEP_MS"), default.DB_MAINTENANCE_STEP_MS))
+    DB_MAINTENANCE_IDLE_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("DB_MAINTENANCE_IDLE_SECONDS"), default.DB_MAINTENANCE_IDLE_SECONDS))
+    DB_WAL_CHECKPOINT_MB: int = Field(default_factory=lambda: to_int(os.getenv("DB_WAL_CHECKPOINT_MB"), default.DB_WAL_CHECKPOINT_MB))
+    DB_ANALYZE_ROWS: int = Field(default_factory=lambda: to_int(os.getenv("DB_ANALYZE_ROWS"), default.DB_ANALYZE_ROWS))
+    DB_VACUUM_FREE_PERCENT: int = Field(default_factory=lambda: to_int(os.getenv("DB_VACUUM_FREE_PERCENT"), default.DB_VACUUM_FREE_PERCENT))
 
     # Language
     LANGUAGE: str = Field(default_factory=lambda: os.getenv("LANGUAGE", default.LANGUAGE))
@@ -102,10 +117,22 @@ class Settings(BaseModel):
     # Web
     HTTP_HOST: str = Field(default_factory=lambda: os.getenv("HTTP_HOST", default.HTTP_HOST))
     HTTP_PORT: int = Field(default_factory=lambda: to_int(os.getenv("HTTP_PORT"), default.HTTP_PORT))
+    HTTP_WORKERS: int = Field(default_factory=lambda: to_int(os.getenv("HTTP_WORKERS"), default.HTTP_WORKERS))
+    HTTP_WORKER_READY_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("HTTP_WORKER_READY_SECONDS"), default.HTTP_WORKER_READY_SECONDS))
+    HTTP_GRACEFUL_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("HTTP_GRACEFUL_SECONDS"), default.HTTP_GRACEFUL_SECONDS))
     HTTPS_ENABLED: bool = Field(default_factory=lambda: to_bool(os.getenv("HTTPS_ENABLED"), default.HTTPS_ENABLED))
     SECRET_KEY: str = Field(default_factory=_load_secret_key)
     LOGIN_MAX_ATTEMPTS: int = Field(default_factory=lambda: to_int(os.getenv("LOGIN_MAX_ATTEMPTS"), default.LOGIN_MAX_ATTEMPTS))
     LOGIN_WINDOW_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("LOGIN_WINDOW_SECONDS"), default.LOGIN_WINDOW_SECONDS))
+    RATE_LIMIT_BACKEND: str = Field(default_factory=lambda: os.getenv("RATE_LIMIT_BACKEND", default.RATE_LIMIT_BACKEND))
+    RATE_LIMIT_MAX_KEYS: int = Field(default_factory=lambda: to_int(os.getenv("RATE_LIMIT_MAX_KEYS"), default.RATE_LIMIT_MAX_KEYS))
+    RATE_LIMIT_SENSITIVE_REQUESTS: int = Field(default_factory=lambda: to_int(os.getenv("RATE_LIMIT_SENSITIVE_REQUESTS"), default.RATE_LIMIT_SENSITIVE_REQUESTS))
+    RATE_LIMIT_SENSITIVE_WINDOW_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("RATE_LIMIT_SENSITIVE_WINDOW_SECONDS"), default.RATE_LIMIT_SENSITIVE_WINDOW_SECONDS))
+    PASSWORD_WORKERS: int = Field(default_factory=lambda: to_int(os.getenv("PASSWORD_WORKERS"), default.PASSWORD_WORKERS))
+    PASSWORD_QUEUE_SIZE: int = Field(default_factory=lambda: to_int(os.getenv("PASSWORD_QUEUE_SIZE"), default.PASSWORD_QUEUE_SIZE))
+    SESSION_STORE: str = Field(default_factory=lambda: os.getenv("SESSION_STORE", default.SESSION_STORE))
+    SESSION_MAX_AGE_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("SESSION_MAX_AGE_SECONDS"), default.SESSION_MAX_AGE_SECONDS))
+    SESSION_RENEW_PERCENT: int = Field(default_factory=lambda: to_int(os.getenv("SESSION_RENEW_PERCENT"), default.SESSION_RENEW_PERCENT))
 
     # Admin
     ADMIN_USER: str = Field(default_factory=lambda: os.getenv("ADMIN_USER", default.ADMIN_USER))
@@ -122,6 +149,13 @@ class Settings(BaseModel):
     DHCP4_LEASES_FILE: Path = Field(default_factory=lambda: Path(os.getenv("DHCP4_LEASES_FILE", default.DHCP4_LEASES_FILE)))
     DHCP6_HOST_FILE: Path = Field(default_factory=lambda: Path(os.getenv("DHCP6_HOST_FILE", default.DHCP6_HOST_FILE)))
     DHCP6_LEASES_FILE: Path = Field(default_factory=lambda: Path(os.getenv("DHCP6_LEASES_FILE", default.DHCP6_LEASES_FILE)))
+    DHCP4_SUBNETS: str = Field(default_factory=lambda: os.getenv("DHCP4_SUBNETS", default.DHCP4_SUBNETS))
+    KEA_CONTROL_URL: str = Field(default_factory=lambda: os.getenv("KEA_CONTROL_URL", default.KEA_CONTROL_URL))
+    KEA_SUBNET4_ID: int = Field(default_factory=lambda: to_int(os.getenv("KEA_SUBNET4_ID"), default.KEA_SUBNET4_ID))
+
+    # Regeneration
+    REGEN_DEBOUNCE_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("REGEN_DEBOUNCE_SECONDS"), default.REGEN_DEBOUNCE_SECONDS))
+    REGEN_MAX_DELAY_SECONDS: int = Field(default_factory=lambda: to_int(os.getenv("REGEN_MAX_DELAY_SECONDS"), default.REGEN_MAX_DELAY_SECONDS))
 
     # Backup
     BACKUP_PATH: Path = Field(default_factory=lambda: Path(os.getenv("BACKUP_PATH", default.BACKUP_PATH)))
@@ -131,6 +165,12 @@ class Settings(BaseModel):
     BACKUP_HOSTS_FILE: str = Field(default_factory=lambda: config.BACKUP_HOSTS_FILE)
     BACKUP_ALIASES_FILE: str = Field(default_factory=lambda: config.BACKUP_ALIASES_FILE)
 
+    # Import / Export
+    IMPORT_BATCH_SIZE: int = Field(default_factory=lambda: to_int(os.getenv("IMPORT_BATCH_SIZE"), default.IMPORT_BATCH_SIZE))
+
+    # Changes journal
+    CHANGES_RETENTION_DAYS: int = Field(default_factory=lambda: to_int(os.getenv("CHANGES_RETENTION_DAYS"), default.CHANGES_RETENTION_DAYS))
+
     # APP Features
     PING_WORKERS: int = Field(default_factory=lambda: to_int(os.getenv("PING_WORKERS"), default.PING_WORKERS))
 
@@ -0,0 +1,229 @@
+# backend/transfer.py
+
+# import standard modules
+import codecs
+from collections import deque
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+# Import local modules
+from backend.db.aio import run_write
+from backend.db.db import read_snapshot
+
+# Import Settings
+from backend.settings.settings import settings
+# Import Logging
+from backend.log.log import get_logger
+
+# Logger initialization
+logger = get_logger(__name__)
+
+# Supported formats (query parameter / Content-Type)
+FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+
+# Integer fields of the CSV files (0/1 flags and visibility)
+CSV_INT_FIELDS = ("ssl_enabled", "visibility")
+CSV_TRUE = ("1", "true", "yes", "on")
+
+# Errors returned by an import (the count is always complete)
+MAX_ERRORS = 1000
+
+# Bytes buffered before an export chunk is sent
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# ---------------------------------------------------------
+# Format of an upload (explicit, or from its Content-Type)
+# ---------------------------------------------------------
+def resolve_format(fmt: Optional[str], content_type: Optional[str] = None) -> str:
+    if fmt:
+        fmt = fmt.strip().lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt} (expected {', '.join(FORMATS)})")
+        return fmt
+
+    media = (content_type or "").split(";")[0].strip().lower()
+    if media in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    return "csv"
+
+# ---------------------------------------------------------
+# Internal: text lines of a byte stream (incremental UTF-8 decoding)
+# ---------------------------------------------------------
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in stream:
+        buffer += decoder.decode(chunk)
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+# ---------------------------------------------------------
+# Internal: csv.reader source fed one complete record at a time
+# ---------------------------------------------------------
+class _RecordFeed:
+    def __init__(self):
+        self.records = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.records:
+            raise StopIteration
+        return self.records.popleft()
+
+# ---------------------------------------------------------
+# Internal: CSV row to record ("" = no value, 0/1 flags)
+# ---------------------------------------------------------
+def _csv_record(header: List[str], row: List[str]) -> Dict[str, Any]:
+    record: Dict[str, Any] = {}
+    for key, value in zip(header, row):
+        value = value.strip()
+        if key in CSV_INT_FIELDS:
+            if value.lstrip("-").isdigit():
+                record[key] = int(value)
+            else:
+                record[key] = int(value.lower() in CSV_TRUE)
+        else:
+            record[key] = value or None
+    return record
+
+# ---------------------------------------------------------
+# Parse an uploaded CSV (header row with the field names)
+# ---------------------------------------------------------
+async def iter_csv(stream: AsyncIterator[bytes]) -> AsyncIterator[Union[Dict[str, Any], ValueError]]:
+    feed = _RecordFeed()
+    reader = csv.reader(feed)
+    header: Optional[List[str]] = None
+    pending = ""
+
+    async for line in _iter_lines(stream):
+        # A quoted field may span lines: wait for the closing quote
+        pending += line
+        if pending.count('"') % 2:
+            continue
+        feed.records.append(pending)
+        pending = ""
+
+        try:
+            row = next(reader)
+        except csv.Error as err:
+            yield ValueError(f"Invalid CSV row: {err}")
+            continue
+        if not any(field.strip() for field in row):
+            continue
+
+        if header is None:
+            header = [field.strip().lower() for field in row]
+            continue
+        yield _csv_record(header, row)
+
+    if pending.strip():
+        yield ValueError("Invalid CSV row: unterminated quoted field")
+
+# ---------------------------------------------------------
+# Parse an uploaded NDJSON (one object per line)
+# ---------------------------------------------------------
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Union[Dict[str, Any], ValueError]]:
+    async for line in _iter_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as err:
+            yield ValueError(f"Invalid JSON line: {err}")
+            continue
+        if not isinstance(record, dict):
+            yield ValueError("Invalid JSON line: object expected")
+            continue
+        yield record
+
+# ---------------------------------------------------------
+# Import a parsed upload in batches (one transaction per batch)
+# ---------------------------------------------------------
+async def import_records(
+    records: AsyncIterator[Union[Dict[str, Any], ValueError]],
+    write: Callable[..., Dict[str, Any]],
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+
+    # Initialization
+    batch_size = max(1, settings.IMPORT_BATCH_SIZE)
+    batch: List[Dict[str, Any]] = []
+    numbers: List[int] = []
+    errors: List[Dict[str, Any]] = []
+    result = {"rows": 0, "written": 0, "failed": 0, "batches": 0}
+
+    def add_error(error: Dict[str, Any]) -> None:
+        result["failed"] += 1
+        if len(errors) < MAX_ERRORS:
+            errors.append(error)
+
+    async def flush() -> None:
+        # Invalid rows are reported and skipped, the rest of the batch is written
+        outcome = await run_write(write, batch, skip_invalid=True, dry_run=dry_run)
+        result["written"] += outcome["count"]
+        result["batches"] += 1
+        for err in outcome["errors"]:
+            add_error({**err, "row": numbers[err["row"] - 1]})
+        batch.clear()
+        numbers.clear()
+
+    async for record in records:
+        result["rows"] += 1
+        if isinstance(record, ValueError):
+            add_error({"row": result["rows"], "error": str(record)})
+            continue
+
+        batch.append(record)
+        numbers.append(result["rows"])
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return {
+        **result,
+        "dry_run": dry_run,
+        "errors": errors,
+        "errors_truncated": result["failed"] > len(errors),
+    }
+
+# ---------------------------------------------------------
+# Stream an export from one DB snapshot (constant memory)
+# ---------------------------------------------------------
+def export_rows(iter_rows: Callable[..., Iterator[NamedTuple]], columns: Sequence[str], fmt: str) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    with read_snapshot() as snap:
+        if fmt == "csv":
+            writer.writerow(columns)
+        for row in iter_rows(conn=snap):
+            if fmt == "csv":
+                values = [getattr(row, c) for c in columns]
+                writer.writerow(["" if v is None else v for v in values])
+            else:
+                buffer.write(json.dumps({c: getattr(row, c) for c in columns}, ensure_ascii=False))
+                buffer.write("\n")
+
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
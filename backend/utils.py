@@ -1,6 +1,12 @@
 # backend/db/utils.py
 
 # Import standard modules
+from contextlib import contextmanager
+import hashlib
+import ipaddress
+import os
+from pathlib import Path
+import secrets
 import subprocess
 
 # -----------------------------
@@ -40,6 +46,134 @@ def to_bool(v: str, default: bool | None = None) -> bool | None:
             return False
     return default
 
+# -----------------------------
+# convert IPv4 string to int (returns None if conversion fails)
+# -----------------------------
+def ipv4_to_int(v: str | None) -> int | None:
+    if not v:
+        return None
+    try:
+        return int(ipaddress.IPv4Address(v.strip()))
+    except ValueError:
+        return None
+
+# -----------------------------
+# convert IPv6 string to a sortable key (32 hex digits, None if conversion fails)
+# -----------------------------
+def ipv6_to_key(v: str | None) -> str | None:
+    if not v:
+        return None
+    try:
+        return f"{int(ipaddress.IPv6Address(v.strip())):032x}"
+    except ValueError:
+        return None
+
+# -----------------------------
+# open a temp file next to path (to be renamed over it)
+# -----------------------------
+def open_temp(path: Path, encoding: str = "utf-8"):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+
+    # O_EXCL + mode 0666 honours the umask like a plain open(path, "w")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    return tmp, os.fdopen(fd, "w", encoding=encoding)
+
+# -----------------------------
+# atomic file write (temp file in the same folder + rename)
+# -----------------------------
+@contextmanager
+def atomic_write(path: Path, encoding: str = "utf-8"):
+    tmp, f = open_temp(path, encoding=encoding)
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+# -----------------------------
+# sha256 of a file, read in chunks (None if it can not be read)
+# -----------------------------
+def file_sha256(path: Path, chunk_size: int = 64 * 1024) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+# -----------------------------
+# staged text file (temp file next to the target, hashed while written)
+# -----------------------------
+class StagedFile:
+    """
+    Writes a text file into a temp file next to its target, hashing the
+    content on the way. close() returns the sha256; commit() renames the
+    temp file over the target, discard() drops it.
+    """
+
+    def __init__(self, path: Path, kind: str = "text", encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.kind = kind
+        self.count = 0
+        self.sha256 = None
+        # None: decided by comparing with the live file
+        self.changed = None
+        self._hash = hashlib.sha256()
+        self.tmp, self._f = open_temp(self.path, encoding=encoding)
+
+    def write(self, text: str):
+        self._f.write(text)
+        self._hash.update(text.encode("utf-8"))
+
+    def close(self) -> str:
+        if not self._f.closed:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._f.close()
+            self.sha256 = self._hash.hexdigest()
+        return self.sha256
+
+    def commit(self):
+        os.replace(self.tmp, self.path)
+
+    def discard(self):
+        if not self._f.closed:
+            self._f.close()
+        self.tmp.unlink(missing_ok=True)
+
+# -----------------------------
+# staged removal of an output (same commit/discard steps as StagedFile)
+# -----------------------------
+class StagedRemoval:
+    """
+    Deletes path on commit(); the apply pipeline keeps the live file as
+    previous generation first, so a rollback brings it back.
+    """
+
+    def __init__(self, path: Path, kind: str = "removed"):
+        self.path = Path(path)
+        self.kind = kind
+        self.count = 0
+        self.sha256 = None
+        self.changed = True
+
+    def close(self) -> None:
+        return None
+
+    def commit(self):
+        self.path.unlink(missing_ok=True)
+
+    def discard(self):
+        pass
+
 # -----------------------------
 # check if host is active (ping)
 # -----------------------------
@@ -0,0 +1,75 @@
+# bench/apply_memory.py
+"""
+tracemalloc peak of apply_outputs() with N hosts and N/10 aliases: a
+first write (no output on disk) and an apply with unchanged outputs,
+where every live file is hashed to compare it with its staged copy.
+Kea is not contacted (KEA_CONTROL_URL unset).
+
+    python -m bench.apply_memory [hosts ...]
+"""
+
+# import standard modules
+import hashlib
+import shutil
+import sys
+import tracemalloc
+from pathlib import Path
+
+from bench.common import host_rows, measure, prepare
+
+# ---------------------------------------------------------
+# Internal: tracemalloc peak (MiB) of a call
+# ---------------------------------------------------------
+def _peak(func) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+def main(sizes) -> int:
+    root = prepare("apply-memory")
+
+    from backend.apply import apply_outputs
+    from backend.db.aliases import add_aliases, reset_aliases_db
+    from backend.db.hosts import add_hosts, reset_hosts_db
+    from backend.utils import file_sha256
+
+    def first_write():
+        for sub in ("dns", "dhcp"):
+            shutil.rmtree(root / sub, ignore_errors=True)
+        return apply_outputs()
+
+    results = []
+    for count in sizes:
+        reset_aliases_db()
+        reset_hosts_db()
+        hosts = host_rows(count)
+        add_hosts(hosts)
+        add_aliases([{"name": f"alias-{i}", "target": h["name"]} for i, h in enumerate(hosts[:count // 10], start=1)])
+        del hosts
+
+        # measure() runs twice: the second run of first_write starts from an empty tree again
+        written, write_ms, write_peak = measure(first_write)
+        unchanged, same_ms, same_peak = measure(apply_outputs)
+        results.append(bool(written["changed"]) and not unchanged["changed"])
+
+        largest = max((p for p in root.rglob("*") if p.is_file() and p.parent.name in ("dns", "dhcp")), key=lambda p: p.stat().st_size)
+        whole = _peak(lambda: hashlib.sha256(Path(largest).read_bytes()).hexdigest())
+        chunked = _peak(lambda: file_sha256(largest))
+        results.append(file_sha256(largest) == hashlib.sha256(largest.read_bytes()).hexdigest())
+
+        print(f"{count} hosts:")
+        print(f"  apply, first write : {write_ms:7.0f} ms | peak {write_peak:6.1f} MiB")
+        print(f"  apply, unchanged   : {same_ms:7.0f} ms | peak {same_peak:6.1f} MiB")
+        print(f"  hash {largest.name} ({largest.stat().st_size / 1024 / 1024:.1f} MiB): whole file {whole:5.1f} MiB | chunked {chunked:5.2f} MiB")
+
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main([int(a) for a in sys.argv[1:]] or [10_000, 50_000, 100_000]))
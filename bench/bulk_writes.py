@@ -0,0 +1,58 @@
+# bench/bulk_writes.py
+"""
+Batched writes at 10k rows: one add_host()/add_alias() call (and
+transaction) per row against add_hosts()/add_aliases() (one
+transaction for the batch). DB_SYNCHRONOUS=FULL in the environment
+shows the cost of one fsync per commit.
+
+    python -m bench.bulk_writes [rows]
+"""
+
+# import standard modules
+import sys
+import time
+
+from bench.common import host_rows, prepare
+
+# ---------------------------------------------------------
+# Internal: wall time (ms) of a call
+# ---------------------------------------------------------
+def _timed(func) -> float:
+    start_ns = time.monotonic_ns()
+    func()
+    return (time.monotonic_ns() - start_ns) / 1_000_000
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+def main(count: int) -> int:
+    prepare("bulk-writes")
+
+    from backend.db.aliases import add_alias, add_aliases, reset_aliases_db
+    from backend.db.db import get_read_db
+    from backend.db.hosts import add_host, add_hosts, reset_hosts_db
+    from backend.settings.settings import settings
+
+    hosts = host_rows(count)
+    aliases = [{"name": f"alias-{i}", "target": h["name"]} for i, h in enumerate(hosts, start=1)]
+
+    def rows(table):
+        return get_read_db().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    print(f"{count} rows, synchronous={settings.DB_SYNCHRONOUS}")
+    results = []
+    for table, one, batch, reset, data in (
+        ("hosts", add_host, add_hosts, reset_hosts_db, hosts),
+        ("aliases", add_alias, add_aliases, reset_aliases_db, aliases),
+    ):
+        loop_ms = _timed(lambda: [one(row) for row in data])
+        results.append(rows(table) == count)
+        reset()
+        batch_ms = _timed(lambda: batch(data))
+        results.append(rows(table) == count)
+        print(f"  {table:8s}: row by row {loop_ms:7.0f} ms | batch {batch_ms:7.0f} ms ({loop_ms / batch_ms:.1f}x)")
+
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
@@ -0,0 +1,73 @@
+# bench/common.py
+
+# import standard modules
+import atexit
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# ---------------------------------------------------------
+# Throwaway data directory and database (call before importing backend)
+# ---------------------------------------------------------
+def prepare(name: str) -> Path:
+    """
+    Points DATA_PATH and every output file into a temp directory, then
+    bootstraps an empty database. Settings are read at import time, so
+    the benchmarks import backend modules only after this call.
+    """
+    root = Path(tempfile.mkdtemp(prefix=f"bench-{name}-"))
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    os.environ.update({
+        "DATA_PATH": str(root / "data"),
+        "DB_RESET": "true",
+        "DEV": "true",
+        "LOG_LEVEL": "WARNING",
+        "DNS_HOST_FILE": str(root / "dns" / "hosts.inc"),
+        "DNS_ALIAS_FILE": str(root / "dns" / "aliases.inc"),
+        "DNS_REVERSE_FILE": str(root / "dns" / "reverse.inc"),
+        "DHCP4_HOST_FILE": str(root / "dhcp" / "hosts-ipv4.json"),
+        "DHCP6_HOST_FILE": str(root / "dhcp" / "hosts-ipv6.json"),
+        "DHCP4_LEASES_FILE": str(root / "dhcp" / "dhcp4.leases"),
+    })
+
+    from backend.bootstrap import bootstrap
+    bootstrap()
+    return root
+
+# ---------------------------------------------------------
+# Host rows (every 3rd with an IPv6 address, every 11th without MAC)
+# ---------------------------------------------------------
+def host_rows(count: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(1, count + 1):
+        rows.append({
+            "name": f"host-{i}",
+            "ipv4": f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}",
+            "ipv6": f"fd00::{i >> 16:x}:{i & 0xffff:x}" if i % 3 == 0 else None,
+            "mac": f"aa:00:00:{i >> 16:02x}:{(i >> 8) & 255:02x}:{i & 255:02x}" if i % 11 else None,
+        })
+    return rows
+
+# ---------------------------------------------------------
+# Wall time (ms) and tracemalloc peak (MiB) of a call
+# ---------------------------------------------------------
+def measure(func: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """
+    Runs func twice: timed without tracing (tracemalloc slows allocations
+    down several times), then traced for the peak.
+    """
+    start_ns = time.monotonic_ns()
+    result = func()
+    took_ms = (time.monotonic_ns() - start_ns) / 1_000_000
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, took_ms, peak / 1024 / 1024
@@ -0,0 +1,106 @@
+# bench/db_readers.py
+"""
+Read throughput with 1..N threads: one connection shared by every thread
+(the previous get_db() model) against the per-thread readers of
+get_read_db(). Also checks isolation: a reader must not see the rows of
+a write transaction still open.
+
+Scaling needs more than one CPU: SQLite releases the GIL while it
+steps a statement, so readers only run in parallel on separate cores.
+
+    python -m bench.db_readers [hosts] [seconds per run]
+"""
+
+# import standard modules
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from bench.common import host_rows, prepare
+
+QUERY = "SELECT COUNT(*) FROM hosts WHERE name LIKE ?"
+THREADS = (1, 2, 4, 8)
+
+# ---------------------------------------------------------
+# Queries per second of n threads, each asking get_conn() for its connection
+# ---------------------------------------------------------
+def throughput(threads: int, get_conn, seconds: float) -> float:
+    counts = [0] * threads
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def worker(k):
+        conn = get_conn()
+        start.wait()
+        while not stop.is_set():
+            conn.execute(QUERY, (f"%{k}7%",)).fetchone()
+            counts[k] += 1
+
+    workers = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    time.sleep(seconds)
+    stop.set()
+    for w in workers:
+        w.join()
+    return sum(counts) / seconds
+
+# ---------------------------------------------------------
+# Rows a reader sees while a write transaction is open
+# ---------------------------------------------------------
+def uncommitted_seen(get_reader, begin, rollback) -> int:
+    seen = []
+    begin()
+    try:
+        reader = threading.Thread(target=lambda: seen.append(
+            get_reader().execute("SELECT COUNT(*) FROM hosts WHERE name = 'uncommitted'").fetchone()[0]
+        ))
+        reader.start()
+        reader.join()
+    finally:
+        rollback()
+    return seen[0]
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+def main(count: int, seconds: float) -> int:
+    prepare("db-readers")
+
+    from backend.db.db import get_db, get_read_db
+    from backend.db.hosts import add_hosts
+    from backend.settings.settings import settings
+
+    add_hosts(host_rows(count))
+    shared = sqlite3.connect(settings.DB_FILE, check_same_thread=False)
+
+    print(f"{count} hosts, {os.cpu_count()} CPU(s), {seconds:.1f} s per run")
+    for threads in THREADS:
+        old = throughput(threads, lambda: shared, seconds)
+        new = throughput(threads, get_read_db, seconds)
+        print(f"  threads={threads}: shared connection {old:8.0f} q/s | per-thread readers {new:8.0f} q/s")
+
+    # Old model: the open transaction of the shared connection leaks to other threads
+    leaked = uncommitted_seen(
+        lambda: shared,
+        lambda: shared.execute("INSERT INTO hosts (name) VALUES ('uncommitted')"),
+        shared.rollback,
+    )
+
+    writer = get_db()
+    isolated = uncommitted_seen(
+        get_read_db,
+        lambda: (writer.execute("BEGIN IMMEDIATE"), writer.execute("INSERT INTO hosts (name) VALUES ('uncommitted')")),
+        lambda: writer.execute("ROLLBACK"),
+    )
+    print(f"  uncommitted row seen by another thread: shared {leaked} | per-thread readers {isolated}")
+    return 0 if isolated == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 2.0,
+    ))
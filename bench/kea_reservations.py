@@ -0,0 +1,79 @@
+# bench/kea_reservations.py
+"""
+Kea reservation include files at 50k hosts: the previous writer (full
+list, json.dumps(indent=4) sliced) against ReservationWriter streaming
+from the DB cursor. Checks the output is byte-identical, empty list
+included.
+
+    python -m bench.kea_reservations [hosts]
+"""
+
+# import standard modules
+import json
+import sys
+
+from bench.common import host_rows, measure, prepare
+
+# ---------------------------------------------------------
+# Previous writer: whole list in memory, outer braces sliced off
+# ---------------------------------------------------------
+def legacy_fragments(hosts):
+    kea4_hosts = []
+    kea6_hosts = []
+    for h in hosts:
+        if h.get("ipv4") and h.get("mac"):
+            kea4_hosts.append({"hw-address": h.get("mac"), "ip-address": h.get("ipv4"), "hostname": h.get("name")})
+        if h.get("ipv6") and h.get("mac"):
+            kea6_hosts.append({"duid": h.get("mac"), "ip-addresses": h.get("ipv6"), "hostname": h.get("name")})
+
+    fragments = []
+    for reservations in (kea4_hosts, kea6_hosts):
+        full = json.dumps({"reservations": reservations}, indent=4, ensure_ascii=False)
+        fragments.append(full.strip()[1:-1].strip() + "\n")
+    return fragments
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+def main(count: int) -> int:
+    root = prepare("kea-reservations")
+
+    from backend.db.hosts import add_hosts, get_hosts, iter_reservations, reset_hosts_db
+    from backend.dhcp import ReservationWriter, kea4_entries, kea6_entries
+
+    def streamed():
+        writers = []
+        for name, ip_field, entries in (("v4.json", "ipv4", kea4_entries), ("v6.json", "ipv6", kea6_entries)):
+            writer = ReservationWriter(root / name)
+            for entry in entries(iter_reservations(ip_field)):
+                writer.add(entry)
+            writer.close()
+            writer.commit()
+            writers.append(writer)
+        return writers
+
+    def read(writers):
+        return [w.path.read_text(encoding="utf-8") for w in writers]
+
+    # Non-ASCII names: ensure_ascii=False must be matched too
+    rows = host_rows(count)
+    for row in rows[::97]:
+        row["name"] += "-hôst"
+    add_hosts(rows)
+    del rows
+
+    old, old_ms, old_peak = measure(lambda: legacy_fragments(get_hosts()))
+    writers, new_ms, new_peak = measure(streamed)
+    identical = old == read(writers)
+
+    reset_hosts_db()
+    identical_empty = legacy_fragments(get_hosts()) == read(streamed())
+
+    print(f"{count} hosts: {writers[0].count} v4 reservations, {writers[1].count} v6 reservations")
+    print(f"  legacy json.dumps : {old_ms:8.0f} ms  peak {old_peak:8.1f} MiB")
+    print(f"  ReservationWriter : {new_ms:8.0f} ms  peak {new_peak:8.1f} MiB")
+    print(f"  byte-identical    : {identical} (empty lists: {identical_empty})")
+    return 0 if identical and identical_empty else 1
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
@@ -0,0 +1,48 @@
+# tests/conftest.py
+
+# import standard modules
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings are read when backend is first imported: point them to a throwaway tree
+_ROOT = Path(tempfile.mkdtemp(prefix="netmgr-tests-"))
+atexit.register(shutil.rmtree, _ROOT, ignore_errors=True)
+os.environ.update({
+    "DATA_PATH": str(_ROOT / "data"),
+    "DB_RESET": "true",
+    "DEV": "true",
+    "LOG_LEVEL": "WARNING",
+    "DNS_HOST_FILE": str(_ROOT / "dns" / "hosts.inc"),
+    "DNS_ALIAS_FILE": str(_ROOT / "dns" / "aliases.inc"),
+    "DNS_REVERSE_FILE": str(_ROOT / "dns" / "reverse.inc"),
+    "DHCP4_HOST_FILE": str(_ROOT / "dhcp" / "hosts-ipv4.json"),
+    "DHCP6_HOST_FILE": str(_ROOT / "dhcp" / "hosts-ipv6.json"),
+    "DHCP4_LEASES_FILE": str(_ROOT / "dhcp" / "dhcp4.leases"),
+    "KEA_CONTROL_URL": "",
+})
+
+# ---------------------------------------------------------
+# Database of the test session (created once)
+# ---------------------------------------------------------
+@pytest.fixture(scope="session")
+def database():
+    from backend.bootstrap import bootstrap
+    from backend.db.db import close_db
+
+    bootstrap()
+    yield
+    close_db()
+
+# ---------------------------------------------------------
+# Short directory for UNIX sockets (sun_path is limited to 108 bytes)
+# ---------------------------------------------------------
+@pytest.fixture
+def socket_dir():
+    path = Path(tempfile.mkdtemp(prefix="kea-", dir="/tmp"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
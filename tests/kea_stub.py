@@ -0,0 +1,216 @@
+# tests/kea_stub.py
+
+# import standard modules
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+# Kea result codes (same values as backend.kea)
+SUCCESS = 0
+ERROR = 1
+UNSUPPORTED = 2
+EMPTY = 3
+
+# ---------------------------------------------------------
+# In-memory Kea DHCPv4 server answering the host commands
+# ---------------------------------------------------------
+class KeaStub:
+    """
+    Keeps the reservations of the running server per (subnet-id,
+    hw-address) and answers reservation-add/del/update and config-reload
+    the way kea-dhcp4 with the host_cmds hook does. files maps a subnet-id
+    to the include file config-reload loads; fail forces result 1 for
+    the listed commands; supports_update=False answers
+    reservation-update like a Kea older than 2.5.
+    """
+
+    def __init__(self):
+        self.reservations: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self.files: Dict[int, Path] = {}
+        self.commands: List[Dict[str, Any]] = []
+        self.fail: Set[str] = set()
+        self.supports_update = True
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return [m["command"] for m in self.commands]
+
+    def held(self, subnet_id: int) -> Dict[str, Dict[str, Any]]:
+        return {hw: r for (sid, hw), r in self.reservations.items() if sid == subnet_id}
+
+    # Load the include files (config-reload, or the initial configuration)
+    def load(self) -> None:
+        self.reservations.clear()
+        for subnet_id, path in self.files.items():
+            fragment = Path(path).read_text(encoding="utf-8")
+            for r in json.loads("{" + fragment + "}")["reservations"]:
+                self.reservations[(subnet_id, r["hw-address"])] = {"subnet-id": subnet_id, **r}
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.commands.append(message)
+            command = message.get("command")
+            args = message.get("arguments") or {}
+            if command in self.fail:
+                return {"result": ERROR, "text": f"{command} failed"}
+
+            if command == "config-reload":
+                try:
+                    self.load()
+                except (OSError, ValueError) as err:
+                    return {"result": ERROR, "text": str(err)}
+                return {"result": SUCCESS, "text": "Configuration successful."}
+
+            if command in ("reservation-add", "reservation-update"):
+                r = dict(args["reservation"])
+                key = (r["subnet-id"], r["hw-address"])
+                if command == "reservation-update":
+                    if not self.supports_update:
+                        return {"result": UNSUPPORTED, "text": "'reservation-update' command not supported."}
+                    if key not in self.reservations:
+                        return {"result": ERROR, "text": "Host not updated (not found)."}
+                elif key in self.reservations:
+                    return {"result": ERROR, "text": "Host already exists."}
+                self.reservations[key] = r
+                return {"result": SUCCESS, "text": "Host updated." if command == "reservation-update" else "Host added."}
+
+            if command == "reservation-del":
+                key = (args["subnet-id"], args["identifier"])
+                if self.reservations.pop(key, None) is None:
+                    return {"result": EMPTY, "text": "Host not deleted (not found)."}
+                return {"result": SUCCESS, "text": "Host deleted."}
+
+            return {"result": UNSUPPORTED, "text": f"'{command}' command not supported."}
+
+# ---------------------------------------------------------
+# Control socket of kea-dhcp4 (UNIX stream socket, answers not delimited)
+# ---------------------------------------------------------
+class UnixKeaStub(KeaStub):
+    """
+    Like Kea, closes the connection after each answer; keep_alive=True
+    keeps it open for the next command instead. split sends every answer
+    in that many pieces, so the client has to frame it without EOF.
+    """
+
+    def __init__(self, path: Path, keep_alive: bool = False, split: int = 1):
+        super().__init__()
+        self.path = Path(path)
+        self.keep_alive = keep_alive
+        self.split = split
+        self._open: List[socket.socket] = []
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(self.path))
+        self._server.listen(8)
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"unix://{self.path}"
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            self._open.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        decoder = json.JSONDecoder()
+        buffer = ""
+        try:
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    return
+                buffer += chunk.decode("utf-8")
+                try:
+                    message, end = decoder.raw_decode(buffer.lstrip())
+                except ValueError:
+                    continue
+                buffer = buffer.lstrip()[end:]
+
+                answer = json.dumps(self.dispatch(message)).encode("utf-8")
+                size = -(-len(answer) // self.split)
+                for i in range(0, len(answer), size):
+                    conn.sendall(answer[i:i + size])
+                    if self.split > 1:
+                        time.sleep(0.01)
+                if not self.keep_alive:
+                    return
+        except OSError:
+            return
+        finally:
+            conn.close()
+
+    # Close the open connections server-side (idle timeout, restart)
+    def disconnect(self) -> None:
+        for conn in self._open:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._open.clear()
+
+    def close(self) -> None:
+        self.disconnect()
+        self._server.close()
+        self.path.unlink(missing_ok=True)
+
+# ---------------------------------------------------------
+# Kea control agent (HTTP, answers wrapped in a list per service)
+# ---------------------------------------------------------
+class HttpKeaStub(KeaStub):
+
+    def __init__(self):
+        super().__init__()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_POST(self):
+                message = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if message.get("service") != ["dhcp4"]:
+                    answers = [{"result": ERROR, "text": "missing service"}]
+                else:
+                    answers = [stub.dispatch(message)]
+                body = json.dumps(answers).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+# ---------------------------------------------------------
+# Reservations held for a subnet, without the subnet-id (as in the include files)
+# ---------------------------------------------------------
+def held_entries(stub: KeaStub, subnet_id: int) -> Dict[str, Dict[str, Any]]:
+    return {hw: {k: v for k, v in r.items() if k != "subnet-id"} for hw, r in stub.held(subnet_id).items()}
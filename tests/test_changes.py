@@ -0,0 +1,92 @@
+# tests/test_changes.py
+
+# import standard modules
+import re
+import sqlite3
+
+from backend.db.changes import compact_changes, get_changes, migrate_changes_iso_timestamps
+from backend.db.db import transaction
+
+ISO = re.compile(r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$")
+
+OLD_JOURNAL = """
+    CREATE TABLE changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+def add(name, ipv4):
+    from backend.db.db import get_read_db
+    from backend.db.hosts import add_host
+
+    add_host({"name": name, "ipv4": ipv4})
+    return get_read_db().execute("SELECT id FROM hosts WHERE name = ?", (name,)).fetchone()[0]
+
+# ---------------------------------------------------------
+# Timestamps use the ISO format of the rest of the API
+# ---------------------------------------------------------
+def test_changed_at_is_iso(database):
+    from backend.db.hosts import delete_host
+
+    since = get_changes(None)["last_seq"]
+    host_id = add("changes-iso", "10.20.0.1")
+    delete_host(host_id)
+
+    changes = get_changes(since)["changes"]
+    assert [c["op"] for c in changes] == ["insert", "delete"]
+    assert all(ISO.match(c["changed_at"]) for c in changes)
+
+# ---------------------------------------------------------
+# A journal created with CURRENT_TIMESTAMP is rebuilt with its sequence
+# ---------------------------------------------------------
+def test_migration_rebuilds_old_journal():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(OLD_JOURNAL)
+    conn.execute("INSERT INTO changes (table_name, row_id, op, changed_at) VALUES ('hosts', 1, 'insert', '2026-01-02 03:04:05')")
+    conn.execute("INSERT INTO changes (table_name, row_id, op) VALUES ('hosts', 2, 'insert')")
+    conn.execute("DELETE FROM changes WHERE seq = 2")
+
+    migrate_changes_iso_timestamps(conn.cursor())
+
+    assert conn.execute("SELECT seq, changed_at FROM changes").fetchall() == [(1, "2026-01-02T03:04:05Z")]
+    assert conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone() == (2,)
+    conn.execute("INSERT INTO changes (table_name, row_id, op) VALUES ('hosts', 3, 'insert')")
+    seq, changed_at = conn.execute("SELECT seq, changed_at FROM changes WHERE row_id = 3").fetchone()
+    assert seq == 3 and ISO.match(changed_at)
+
+    # Already ISO: nothing to do
+    migrate_changes_iso_timestamps(conn.cursor())
+    assert conn.execute("SELECT COUNT(*) FROM changes").fetchone() == (2,)
+
+# ---------------------------------------------------------
+# Retention compares against ISO timestamps
+# ---------------------------------------------------------
+def test_compaction_expires_old_entries(database):
+    from backend.db.hosts import delete_host
+
+    old_id = add("changes-old", "10.20.0.2")
+    new_id = add("changes-new", "10.20.0.3")
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE changes SET changed_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now', '-3 days') WHERE table_name = 'hosts' AND row_id = ?",
+            (old_id,),
+        )
+        # Earlier today: kept by a one-day retention
+        conn.execute(
+            "UPDATE changes SET changed_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now', '-1 hours') WHERE table_name = 'hosts' AND row_id = ?",
+            (new_id,),
+        )
+
+    result = compact_changes(retention_days=1)
+    assert result["expired"] >= 1
+
+    rows = get_changes(result["floor"])["changes"]
+    assert old_id not in [c["id"] for c in rows if c["table"] == "hosts"]
+    assert new_id in [c["id"] for c in rows if c["table"] == "hosts"]
+
+    delete_host(old_id)
+    delete_host(new_id)
@@ -0,0 +1,126 @@
+# tests/test_dhcp.py
+
+# import standard modules
+from pathlib import Path
+
+import pytest
+
+from backend.db.hosts import ReservationRecord
+
+ROWS = [
+    ReservationRecord("a", "10.0.0.1", "aa:00:00:00:00:01"),
+    ReservationRecord("b", "10.0.1.1", "aa:00:00:00:00:02"),
+    ReservationRecord("c", "10.9.0.1", "aa:00:00:00:00:03"),
+]
+
+@pytest.fixture
+def subnets(database):
+    from backend.db.settings import get_config, update_config
+
+    update_config("DHCP4_SUBNETS", "1:10.0.0.0/24,2:10.0.1.0/24")
+    base = Path(get_config("DHCP4_HOST_FILE"))
+    yield base
+    update_config("DHCP4_SUBNETS", "")
+    for path in base.parent.glob("*"):
+        path.unlink()
+
+def temp_files(base):
+    return sorted(p.name for p in base.parent.glob(".*.tmp"))
+
+def commit(stage):
+    for f in stage["files"]:
+        if f.changed is None or f.changed:
+            f.commit()
+        else:
+            f.discard()
+
+# ---------------------------------------------------------
+# Staging failures leave no temp file behind
+# ---------------------------------------------------------
+def test_stage_discards_created_writers_when_a_writer_fails(subnets, monkeypatch):
+    from backend import dhcp
+
+    created = []
+
+    class FailingWriter(dhcp.ReservationWriter):
+        def __init__(self, path):
+            if len(created) == 2:
+                raise OSError("disk full")
+            super().__init__(path)
+            created.append(self)
+
+    monkeypatch.setattr(dhcp, "ReservationWriter", FailingWriter)
+    with pytest.raises(OSError):
+        dhcp.dhcp4_stage(iter(ROWS))
+
+    assert len(created) == 2
+    assert temp_files(subnets) == []
+
+def test_stage_discards_the_manifest_when_it_fails(subnets, monkeypatch):
+    from backend import dhcp
+
+    class FailingManifest(dhcp.StagedFile):
+        def close(self):
+            raise OSError("disk full")
+
+    monkeypatch.setattr(dhcp, "StagedFile", FailingManifest)
+    with pytest.raises(OSError):
+        dhcp.dhcp4_stage(iter(ROWS))
+
+    assert temp_files(subnets) == []
+
+# ---------------------------------------------------------
+# Shards of a removed subnet
+# ---------------------------------------------------------
+def test_shard_of_a_removed_subnet_is_deleted(subnets):
+    from backend import dhcp
+    from backend.db.settings import update_config
+
+    commit(dhcp.dhcp4_stage(iter(ROWS)))
+    shard2 = dhcp.shard_path(subnets, 2)
+    assert shard2.is_file()
+
+    update_config("DHCP4_SUBNETS", "1:10.0.0.0/24")
+    stage = dhcp.dhcp4_stage(iter(ROWS))
+    assert [f.path for f in stage["removed"]] == [shard2]
+    commit(stage)
+
+    assert not shard2.exists()
+    assert shard2.name not in dhcp.read_manifest_digests(subnets)
+    # Its reservation moved to the base file
+    assert [r["hw-address"] for r in dhcp.read_reservations(subnets)] == ["aa:00:00:00:00:02", "aa:00:00:00:00:03"]
+
+def test_rollback_restores_a_removed_shard(subnets):
+    from backend import dhcp
+    from backend.apply import apply_outputs, rollback_outputs
+    from backend.db.hosts import add_hosts, reset_hosts_db
+    from backend.db.settings import update_config
+
+    add_hosts([{"name": r.name, "ipv4": r.ip, "mac": r.mac} for r in ROWS])
+    try:
+        apply_outputs(["dhcp"])
+        shard2 = dhcp.shard_path(subnets, 2)
+        before = shard2.read_bytes()
+
+        update_config("DHCP4_SUBNETS", "1:10.0.0.0/24")
+        result = apply_outputs(["dhcp"])
+        assert result["dhcp"]["removed_v4"] == [str(shard2)]
+        assert not shard2.exists()
+
+        rollback_outputs(["dhcp"])
+        assert shard2.read_bytes() == before
+        assert shard2.name in dhcp.read_manifest_digests(subnets)
+    finally:
+        reset_hosts_db()
+
+def test_files_outside_the_manifest_are_left_alone(subnets):
+    from backend import dhcp
+
+    other = subnets.with_name("kea-dhcp4.conf")
+    other.write_text("{}")
+    commit(dhcp.dhcp4_stage(iter(ROWS)))
+
+    stage = dhcp.dhcp4_stage(iter(ROWS))
+    assert stage["removed"] == []
+    commit(stage)
+    assert other.exists()
@@ -0,0 +1,304 @@
+# tests/test_kea.py
+
+# import standard modules
+import pytest
+
+from backend.kea import (
+    KeaControlClient,
+    KeaControlError,
+    close_clients,
+    diff_reservations,
+    push_reservation_delta,
+    read_reservations,
+    reservation_digests,
+)
+from tests.kea_stub import HttpKeaStub, UnixKeaStub, held_entries
+
+def entry(hw, ip, hostname):
+    return {"hw-address": hw, "ip-address": ip, "hostname": hostname}
+
+HELD = [
+    entry("aa:00:00:00:00:01", "10.0.0.1", "one"),
+    entry("aa:00:00:00:00:02", "10.0.0.2", "two"),
+    entry("aa:00:00:00:00:03", "10.0.0.3", "three"),
+]
+WANTED = [
+    entry("aa:00:00:00:00:01", "10.0.0.1", "one"),
+    entry("aa:00:00:00:00:02", "10.0.0.20", "two"),
+    entry("aa:00:00:00:00:04", "10.0.0.4", "four"),
+]
+
+@pytest.fixture
+def unix_stub(socket_dir):
+    stub = UnixKeaStub(socket_dir / "kea4.sock")
+    yield stub
+    stub.close()
+
+@pytest.fixture
+def http_stub():
+    stub = HttpKeaStub()
+    yield stub
+    stub.close()
+
+def seed(stub, entries, subnet_id=1):
+    for r in entries:
+        stub.reservations[(subnet_id, r["hw-address"])] = {"subnet-id": subnet_id, **r}
+
+# ---------------------------------------------------------
+# Diff engine
+# ---------------------------------------------------------
+def test_diff_reservations():
+    previous = reservation_digests(HELD)
+    delta = diff_reservations(previous, iter(WANTED + [{"hostname": "no identifier"}]))
+
+    assert delta["add"] == [WANTED[2]]
+    assert delta["update"] == [WANTED[1]]
+    assert delta["delete"] == [{"hw-address": "aa:00:00:00:00:03"}]
+    # previous is consumed
+    assert previous == {}
+
+def test_diff_reservations_unchanged():
+    delta = diff_reservations(reservation_digests(HELD), HELD)
+    assert delta == {"add": [], "delete": [], "update": []}
+
+def test_diff_ignores_fields_kea_does_not_compare():
+    changed = [dict(r, **{"client-classes": ["x"]}) for r in HELD]
+    assert diff_reservations(reservation_digests(HELD), changed)["update"] == []
+
+# ---------------------------------------------------------
+# Control channel: UNIX socket
+# ---------------------------------------------------------
+def test_unix_round_trip_reconnects_after_each_answer(unix_stub):
+    client = KeaControlClient(unix_stub.url)
+    for _ in range(3):
+        assert client.command("config-reload")["result"] == 0
+
+    # Kea closes the socket after every answer
+    assert unix_stub.connections == 3
+    assert unix_stub.names == ["config-reload"] * 3
+    # No service on the direct socket
+    assert "service" not in unix_stub.commands[0]
+
+def test_unix_reused_connection_closed_by_server_is_retried(socket_dir):
+    stub = UnixKeaStub(socket_dir / "kea4.sock", keep_alive=True)
+    try:
+        client = KeaControlClient(stub.url)
+        client.command("config-reload")
+        client.command("config-reload")
+        assert stub.connections == 1
+
+        stub.disconnect()
+        assert client.command("config-reload")["result"] == 0
+        assert stub.connections == 2
+        assert stub.names == ["config-reload"] * 3
+    finally:
+        stub.close()
+
+def test_unix_fresh_connection_failure_is_not_retried(socket_dir):
+    client = KeaControlClient(f"unix://{socket_dir / 'missing.sock'}")
+    with pytest.raises(KeaControlError):
+        client.command("config-reload")
+
+def test_unix_answer_split_across_reads(socket_dir):
+    # No EOF after the answer: it is framed by raw_decode alone
+    stub = UnixKeaStub(socket_dir / "kea4.sock", keep_alive=True, split=4)
+    try:
+        client = KeaControlClient(stub.url)
+        answer = client.command("reservation-del", {"subnet-id": 1, "identifier-type": "hw-address", "identifier": "aa"})
+        assert answer == {"result": 3, "text": "Host not deleted (not found)."}
+        assert client.command("config-reload")["result"] == 0
+        assert stub.connections == 1
+    finally:
+        stub.close()
+
+# ---------------------------------------------------------
+# Control channel: HTTP control agent
+# ---------------------------------------------------------
+def test_http_round_trip_keeps_the_connection(http_stub):
+    client = KeaControlClient(http_stub.url)
+    for _ in range(3):
+        # The answer list of the agent is unwrapped
+        assert client.command("config-reload") == {"result": 0, "text": "Configuration successful."}
+
+    assert http_stub.connections == 1
+    assert http_stub.commands[0]["service"] == ["dhcp4"]
+
+def test_unsupported_url():
+    with pytest.raises(ValueError):
+        KeaControlClient("ftp://kea")
+
+# ---------------------------------------------------------
+# Delta push
+# ---------------------------------------------------------
+@pytest.mark.parametrize("stub_fixture", ["unix_stub", "http_stub"])
+def test_push_reservation_delta(request, stub_fixture):
+    stub = request.getfixturevalue(stub_fixture)
+    seed(stub, HELD)
+    delta = diff_reservations(reservation_digests(HELD), WANTED)
+
+    result = push_reservation_delta(KeaControlClient(stub.url), delta, subnet_id=1)
+
+    assert result["status"] == "success"
+    assert (result["added"], result["updated"], result["deleted"]) == (1, 1, 1)
+    # Deletions first: an address may move to a new host
+    assert stub.names == ["reservation-del", "reservation-update", "reservation-add"]
+    assert stub.commands[0]["arguments"]["operation-target"] == "memory"
+    assert held_entries(stub, 1) == {r["hw-address"]: r for r in WANTED}
+
+def test_push_falls_back_to_del_add_without_reservation_update(unix_stub):
+    unix_stub.supports_update = False
+    seed(unix_stub, HELD)
+    wanted = [entry(r["hw-address"], r["ip-address"], r["hostname"] + "-renamed") for r in HELD[:2]] + HELD[2:]
+    delta = diff_reservations(reservation_digests(HELD), wanted)
+
+    result = push_reservation_delta(KeaControlClient(unix_stub.url), delta, subnet_id=1)
+
+    assert result["status"] == "success"
+    assert result["updated"] == 2
+    # reservation-update is tried once, then every update is a del + add
+    assert unix_stub.names == [
+        "reservation-update",
+        "reservation-del", "reservation-add",
+        "reservation-del", "reservation-add",
+    ]
+    assert held_entries(unix_stub, 1) == {r["hw-address"]: r for r in wanted}
+
+def test_push_fallback_stops_when_del_fails(unix_stub):
+    unix_stub.supports_update = False
+    unix_stub.fail.add("reservation-del")
+    seed(unix_stub, HELD)
+    delta = diff_reservations(reservation_digests(HELD), [entry("aa:00:00:00:00:01", "10.0.0.9", "one")] + HELD[1:])
+
+    result = push_reservation_delta(KeaControlClient(unix_stub.url), delta, subnet_id=1)
+
+    assert result["status"] == "failure"
+    assert result["updated"] == 0
+    assert result["errors"] == ["update aa:00:00:00:00:01 (del): reservation-del failed"]
+    assert "reservation-add" not in unix_stub.names
+
+def test_push_reports_failed_commands(unix_stub):
+    seed(unix_stub, HELD[:1])
+    # Kea already holds the address: reservation-add fails
+    delta = {"add": HELD[:1], "delete": [], "update": []}
+
+    result = push_reservation_delta(KeaControlClient(unix_stub.url), delta, subnet_id=1)
+
+    assert result["status"] == "failure"
+    assert result["added"] == 0
+    assert result["errors"] == ["add aa:00:00:00:00:01: Host already exists."]
+
+# ---------------------------------------------------------
+# kea_sync: delta when Kea holds the previous content, config-reload otherwise
+# ---------------------------------------------------------
+@pytest.fixture
+def live(database, unix_stub, tmp_path):
+    from backend.db.settings import update_config
+
+    update_config("KEA_CONTROL_URL", unix_stub.url)
+    yield unix_stub, tmp_path / "hosts-ipv4.json"
+    update_config("KEA_CONTROL_URL", "")
+    close_clients()
+
+def write_shard(path, entries):
+    from backend.dhcp import ReservationWriter
+
+    writer = ReservationWriter(path)
+    for r in entries:
+        writer.add(r)
+    writer.close()
+    writer.commit()
+    return writer.sha256
+
+def apply_shard(base, entries, subnet_id=1):
+    """Same steps as dhcp4_stage/dhcp4_push: previous content, commit, sync."""
+    from backend.dhcp import kea_previous, kea_sync, read_kea_state
+
+    old_digest = read_kea_state(base).get(base.name)
+    previous = kea_previous(base, old_digest, read_kea_state(base)) if base.is_file() else None
+    digest = write_shard(base, entries)
+    return kea_sync(base, [{
+        "path": base,
+        "subnet_id": subnet_id,
+        "sha256": digest,
+        "previous": previous,
+        "current": lambda: read_reservations(base),
+    }])[base.name]
+
+def test_kea_sync_reloads_without_sync_state(live):
+    from backend.dhcp import read_kea_state
+
+    stub, base = live
+    stub.files[1] = base
+
+    result = apply_shard(base, HELD)
+
+    assert stub.names == ["config-reload"]
+    assert result["status"] == "success"
+    assert held_entries(stub, 1) == {r["hw-address"]: r for r in HELD}
+    assert read_kea_state(base)[base.name] is not None
+
+def test_kea_sync_pushes_the_delta_when_in_sync(live):
+    stub, base = live
+    stub.files[1] = base
+    apply_shard(base, HELD)
+    stub.commands.clear()
+
+    result = apply_shard(base, WANTED)
+
+    assert stub.names == ["reservation-del", "reservation-update", "reservation-add"]
+    assert result["status"] == "success"
+    assert held_entries(stub, 1) == {r["hw-address"]: r for r in WANTED}
+
+    # Nothing changed since: Kea is left alone
+    stub.commands.clear()
+    assert apply_shard(base, WANTED)["status"] == "unchanged"
+    assert stub.names == []
+
+def test_kea_sync_reloads_when_the_push_fails(live):
+    from backend.dhcp import read_kea_state
+
+    stub, base = live
+    stub.files[1] = base
+    apply_shard(base, HELD)
+    stub.commands.clear()
+    stub.fail.add("reservation-add")
+
+    result = apply_shard(base, WANTED)
+
+    assert stub.names == ["reservation-del", "reservation-update", "reservation-add", "config-reload"]
+    assert result["status"] == "success"
+    assert result["push"]["status"] == "failure"
+    # The reload loaded the whole file: Kea holds the new content
+    assert held_entries(stub, 1) == {r["hw-address"]: r for r in WANTED}
+    assert read_kea_state(base)[base.name] is not None
+
+def test_kea_sync_retries_after_a_failed_reload(live):
+    from backend.dhcp import read_kea_state
+
+    stub, base = live
+    stub.files[1] = base
+    apply_shard(base, HELD)
+    stub.commands.clear()
+    stub.fail.update({"reservation-add", "config-reload"})
+
+    result = apply_shard(base, WANTED)
+
+    assert result["status"] == "failure"
+    # Kea holds neither version: no delta can be trusted at the next apply
+    assert read_kea_state(base)[base.name] is None
+
+    stub.fail.clear()
+    stub.commands.clear()
+    result = apply_shard(base, WANTED)
+
+    assert stub.names == ["config-reload"]
+    assert result["status"] == "success"
+    assert held_entries(stub, 1) == {r["hw-address"]: r for r in WANTED}
+
+def test_kea_sync_disabled_without_url(database, tmp_path):
+    from backend.dhcp import kea_sync
+
+    base = tmp_path / "hosts-ipv4.json"
+    digest = write_shard(base, HELD)
+    result = kea_sync(base, [{"path": base, "subnet_id": 1, "sha256": digest, "previous": None, "current": lambda: iter(())}])
+    assert result == {base.name: {"status": "disabled"}}
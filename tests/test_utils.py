@@ -0,0 +1,19 @@
+# tests/test_utils.py
+
+# import standard modules
+import hashlib
+
+from backend.utils import file_sha256
+
+# ---------------------------------------------------------
+# Chunked hash matches the hash of the whole file
+# ---------------------------------------------------------
+def test_file_sha256_in_chunks(tmp_path):
+    path = tmp_path / "data.bin"
+    data = bytes(range(256)) * 1000
+    path.write_bytes(data)
+
+    expected = hashlib.sha256(data).hexdigest()
+    assert file_sha256(path) == expected
+    assert file_sha256(path, chunk_size=1000) == expected
+    assert file_sha256(tmp_path / "missing") is None